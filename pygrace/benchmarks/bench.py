@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import platform
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+from pygrace import __version__
+from pygrace.backend import PlotBackend, PlotState, new_headless_figure, render_hardcopy
+from pygrace.data import Dataset, load_datasets
+from pygrace.ring import RingDataset
+
+QUICK_POINTS = [1_000, 10_000, 100_000]
+FULL_POINTS = [1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+QUICK_DATASETS = [1, 100]
+FULL_DATASETS = [1, 100, 1_000, 10_000]
+# Each dataset in the many-sets cases is this long, so the cost measured is per set, not per point.
+POINTS_PER_SET = 100
+DEFAULT_THRESHOLD = 0.25
+# Differences below this are timer and scheduler noise, whatever the ratio.
+DEFAULT_MIN_SECONDS = 0.005
+
+
+@dataclass
+class Case:
+    name: str
+    setup: Callable[[], Any]
+    run: Callable[[Any], Any]
+
+
+def _columns(points: int, ncols: int = 2) -> list[list[float]]:
+    x = [i / points for i in range(points)]
+    columns = [x]
+    for col in range(1, ncols):
+        columns.append([math.sin(6.0 * v + col) + 0.1 * col for v in x])
+    return columns
+
+
+def write_table(path: Path, columns: list[list[float]], sep: str = " ") -> Path:
+    with path.open("w", encoding="utf-8") as handle:
+        handle.write("# synthetic benchmark data\n")
+        for row in zip(*columns):
+            handle.write(sep.join(f"{value:.9g}" for value in row) + "\n")
+    return path
+
+
+def make_datasets(count: int, points: int) -> list[Dataset]:
+    x, y = _columns(points)
+    return [Dataset(name=f"set{idx}", x=x, y=[v + idx for v in y]) for idx in range(count)]
+
+
+# New points per live frame in the ring cases.
+RING_FRAME_POINTS = 1_000
+
+
+def make_ring(points: int) -> RingDataset:
+    # Full from the start, so every measured frame evicts as many points as it adds.
+    x, y = _columns(points)
+    ring = RingDataset(name="ring", x=x, y=y, capacity=points)
+    ring.append(x[0], y[0])
+    return ring
+
+
+def _ring_frame(ring: RingDataset) -> None:
+    # One monitoring frame: append a batch of new points, then render the whole window.
+    step = 1.0 / ring.capacity
+    last = float(ring.x[-1])
+    x = [last + step * (i + 1) for i in range(RING_FRAME_POINTS)]
+    ring.append(x, [math.sin(6.0 * v) for v in x])
+    _render([ring])
+
+
+ZOOMED_WORLD = [0.5, 0.51, -2.0, 2.0]
+
+
+def _state(world: list[float] | None = None) -> PlotState:
+    return PlotState(title="bench", xlabel="x", ylabel="y", world=world, autoscale=world is None)
+
+
+def _render(datasets: list[Dataset], world: list[float] | None = None) -> None:
+    fig = new_headless_figure()
+    try:
+        PlotBackend(datasets, _state(world), None).render(fig.add_subplot())
+    finally:
+        fig.clear()
+
+
+def _summarized(datasets: list[Dataset]) -> list[Dataset]:
+    # What a GUI re-render sees once the post-draw job has cached every set's stats.
+    for ds in datasets:
+        ds.stats()
+    return datasets
+
+
+def _resample_variables(points: int) -> dict[str, Any]:
+    # A second set at half the sampling rate, so the expression has to resample it.
+    x0, y0 = _columns(points)
+    x1, y1 = _columns(max(2, points // 2))
+    return {"x0": x0, "y0": y0, "x1": x1, "y1": y1}
+
+
+def _align(datasets: list[Dataset]) -> None:
+    backend = PlotBackend(datasets, _state(), None)
+    selections = [(ds, backend.extrema_for_dataset(ds)[0]) for ds in datasets]
+    backend.align_extrema(selections)
+
+
+def build_cases(points: list[int], datasets: list[int], workdir: Path) -> list[Case]:
+    cases: list[Case] = []
+    for n in points:
+        def whitespace(n=n) -> Path:
+            return write_table(workdir / f"ws_{n}.dat", _columns(n))
+
+        def csv_file(n=n) -> Path:
+            return write_table(workdir / f"csv_{n}.csv", _columns(n), sep=",")
+
+        def bxy_file(n=n) -> Path:
+            return write_table(workdir / f"bxy_{n}.dat", _columns(n, 4))
+
+        cases += [
+            Case(f"load_datasets/whitespace/{n}", whitespace, lambda path: load_datasets([path])),
+            Case(f"load_datasets/csv/{n}", csv_file, lambda path: load_datasets([path])),
+            Case(f"load_datasets/bxy/{n}", bxy_file, lambda path: load_datasets([path], ["1:3:4"])),
+            Case(
+                f"safe_eval/{n}",
+                lambda n=n: dict(zip(("x0", "y0"), _columns(n))),
+                lambda variables: PlotBackend.safe_eval("sin(x0) * 2 + y0 / 3", variables),
+            ),
+            Case(
+                f"safe_eval/interp/{n}",
+                lambda n=n: _resample_variables(n),
+                lambda variables: PlotBackend.safe_eval("y0 - interp(x0, x1, y1)", variables),
+            ),
+            Case(
+                f"apply_transform/{n}",
+                lambda n=n: PlotBackend(make_datasets(1, n), _state(), None),
+                lambda backend: backend.apply_transform("y0 = y0 * 2 + x0"),
+            ),
+            *[
+                Case(
+                    f"apply_operation/{op_id}/{n}",
+                    lambda n=n: PlotBackend(make_datasets(1, n), _state(), None),
+                    lambda backend, op_id=op_id: backend.apply_operation(0, op_id),
+                )
+                for op_id in ("running_average", "derivative", "integral")
+            ],
+            Case(
+                f"find_local_extrema/{n}",
+                lambda n=n: make_datasets(1, n)[0],
+                PlotBackend.find_local_extrema,
+            ),
+            Case(f"align_extrema/{n}", lambda n=n: make_datasets(2, n), _align),
+            Case(f"render/{n}", lambda n=n: make_datasets(1, n), _render),
+            Case(f"render/zoomed/{n}", lambda n=n: make_datasets(1, n), lambda sets: _render(sets, ZOOMED_WORLD)),
+            Case(f"render/warm_stats/{n}", lambda n=n: _summarized(make_datasets(1, n)), _render),
+            Case(f"ring/frame/{n}", lambda n=n: make_ring(n), _ring_frame),
+            Case(
+                f"render_hardcopy/{n}",
+                lambda n=n: make_datasets(1, n),
+                lambda sets, n=n: render_hardcopy(sets, workdir / f"out_{n}.png", "bench", "x", "y", None, True, None),
+            ),
+            Case(
+                f"render_hardcopy/zoomed/{n}",
+                lambda n=n: make_datasets(1, n),
+                lambda sets, n=n: render_hardcopy(
+                    sets, workdir / f"zoomed_{n}.png", "bench", "x", "y", ZOOMED_WORLD, False, None
+                ),
+            ),
+        ]
+    for count in datasets:
+        def many_columns(count=count) -> Path:
+            return write_table(workdir / f"many_{count}.dat", _columns(POINTS_PER_SET, count + 1))
+
+        cases += [
+            Case(f"load_datasets/sets/{count}", many_columns, lambda path: load_datasets([path])),
+            Case(f"align_extrema/sets/{count}", lambda count=count: make_datasets(count, POINTS_PER_SET), _align),
+            Case(f"render/sets/{count}", lambda count=count: make_datasets(count, POINTS_PER_SET), _render),
+            Case(
+                f"render/warm_stats/sets/{count}",
+                lambda count=count: _summarized(make_datasets(count, POINTS_PER_SET)),
+                _render,
+            ),
+        ]
+    return cases
+
+
+def time_case(case: Case, repeat: int) -> dict[str, Any]:
+    runs = []
+    for _ in range(repeat):
+        # Setup runs every time because several cases mutate their input.
+        arg = case.setup()
+        start = time.perf_counter()
+        case.run(arg)
+        runs.append(time.perf_counter() - start)
+    return {"seconds": min(runs), "runs": runs}
+
+
+def run_cases(cases: list[Case], repeat: int, pattern: str | None = None, log=sys.stderr) -> dict[str, Any]:
+    # Pay matplotlib's import and font cache once, outside every timed case.
+    _render(make_datasets(1, 10))
+    results: dict[str, Any] = {}
+    for case in cases:
+        if pattern and pattern not in case.name:
+            continue
+        results[case.name] = time_case(case, repeat)
+        log.write(f"{case.name:<40}{results[case.name]['seconds'] * 1000:>12.2f} ms\n")
+    return {"meta": run_metadata(repeat), "results": results}
+
+
+def run_metadata(repeat: int) -> dict[str, Any]:
+    return {
+        "pygrace": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def compare(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+    min_seconds: float = DEFAULT_MIN_SECONDS,
+) -> list[tuple[str, float, float]]:
+    regressions = []
+    for name, entry in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            continue
+        now, before = entry["seconds"], base["seconds"]
+        if now > before * (1.0 + threshold) and now - before > min_seconds:
+            regressions.append((name, before, now))
+    return regressions
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Time pygrace data, backend and render hot paths")
+    parser.add_argument("--full", action="store_true", help="Run up to 1e7 points and 10k datasets")
+    parser.add_argument("--points", type=int, nargs="+", default=None, help="Override the point counts")
+    parser.add_argument("--datasets", type=int, nargs="+", default=None, help="Override the dataset counts")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case; the fastest is reported")
+    parser.add_argument("-k", dest="pattern", default=None, help="Only run cases whose name contains this")
+    add_report_arguments(parser)
+    return parser
+
+
+def add_report_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--output", default=None, help="Write results as JSON")
+    parser.add_argument("--baseline", default=None, help="Compare against a stored results JSON")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Allowed slowdown as a fraction of the baseline (default: 0.25)",
+    )
+    parser.add_argument(
+        "--min-seconds",
+        type=float,
+        default=DEFAULT_MIN_SECONDS,
+        help="Ignore slowdowns smaller than this many seconds (default: 0.005)",
+    )
+
+
+def report(current: dict[str, Any], args: argparse.Namespace) -> int:
+    if args.output:
+        Path(args.output).write_text(json.dumps(current, indent=1) + "\n", encoding="utf-8")
+
+    if not args.baseline:
+        return 0
+    baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+    regressions = compare(current, baseline, args.threshold, args.min_seconds)
+    for name, before, now in regressions:
+        ratio = f"{now / before:.2f}x" if before > 0 else "new cost"
+        sys.stderr.write(f"REGRESSION {name}: {before * 1000:.2f} ms -> {now * 1000:.2f} ms ({ratio})\n")
+    return 1 if regressions else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    points = args.points or (FULL_POINTS if args.full else QUICK_POINTS)
+    datasets = args.datasets or (FULL_DATASETS if args.full else QUICK_DATASETS)
+
+    with tempfile.TemporaryDirectory(prefix="pygrace-bench-") as tmp:
+        current = run_cases(build_cases(points, datasets, Path(tmp)), max(1, args.repeat), args.pattern)
+
+    return report(current, args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
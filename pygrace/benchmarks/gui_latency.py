@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from bench import (  # noqa: E402
+    FULL_DATASETS,
+    POINTS_PER_SET,
+    QUICK_DATASETS,
+    _columns,
+    add_report_arguments,
+    make_datasets,
+    report,
+    run_metadata,
+    write_table,
+)
+
+from pygrace.data import load_datasets  # noqa: E402
+from pygrace.gui import GuiSession, build_gui  # noqa: E402
+
+QUICK_WINDOW_POINTS = [10_000, 100_000]
+FULL_WINDOW_POINTS = [10_000, 100_000, 1_000_000, 10_000_000]
+QUICK_HOVER_POINTS = [100_000]
+FULL_HOVER_POINTS = [100_000, 1_000_000, 10_000_000]
+HOVER_MOVES = 60
+DRAW_TIMEOUT = 120.0
+
+
+def open_session(datasets) -> GuiSession:
+    return build_gui(datasets, "latency", "x", "y", None, True, None)
+
+
+def spin_until(done: Callable[[], bool], timeout: float = DRAW_TIMEOUT) -> None:
+    # A nested event loop rather than a processEvents() busy-loop: it sleeps between events, and some PySide
+    # builds leak a reference to None on every processEvents() call until the interpreter aborts.
+    from PySide6 import QtCore
+
+    if done():
+        return
+    loop = QtCore.QEventLoop()
+    deadline = time.perf_counter() + timeout
+    timed_out: list[bool] = []
+
+    def check() -> None:
+        if done():
+            loop.quit()
+        elif time.perf_counter() > deadline:
+            timed_out.append(True)
+            loop.quit()
+
+    timer = QtCore.QTimer()
+    timer.setInterval(1)
+    timer.timeout.connect(check)
+    timer.start()
+    loop.exec()
+    timer.stop()
+    if timed_out:
+        raise TimeoutError("GUI did not settle")
+
+
+def wait_for_draw(session: GuiSession, draws_before: int, timeout: float = DRAW_TIMEOUT) -> float:
+    # Qt delivers the deferred draw_idle from its event loop; the draw_event handler stamps the time.
+    spin_until(lambda: len(session.draw_times) > draws_before, timeout)
+    return session.draw_times[-1]
+
+
+def measure(session: GuiSession, action: Callable[[], Any]) -> float:
+    draws_before = len(session.draw_times)
+    start = time.perf_counter()
+    action()
+    return wait_for_draw(session, draws_before) - start
+
+
+def interactions(session: GuiSession) -> dict[str, Callable[[int], Any]]:
+    from PySide6 import QtCore
+
+    # Dialogs and the controls dock are built on first use; open them all before timing anything.
+    for panel in session.panels.values():
+        panel.get()
+    widgets = session.widgets
+    checked, unchecked = QtCore.Qt.CheckState.Checked, QtCore.Qt.CheckState.Unchecked
+    model = widgets["dataset_model"]
+    widgets["dataset_list"].setCurrentIndex(widgets["dataset_list"].model().index(0, 0))
+
+    # Each action alternates between two values so every run is a real change that triggers a redraw.
+    def tick_size(run: int) -> None:
+        widgets["xtick_slider"].setValue(8 + run % 2)
+
+    def title_size(run: int) -> None:
+        widgets["title_size_slider"].setValue(20 + run % 2)
+
+    def toggle_dataset(run: int) -> None:
+        index = model.index(0)
+        state = unchecked if index.data(QtCore.Qt.ItemDataRole.CheckStateRole) == checked else checked
+        model.setData(index, state, QtCore.Qt.ItemDataRole.CheckStateRole)
+
+    def rename_dataset(run: int) -> None:
+        widgets["name_edit"].setText(f"renamed {run}")
+
+    def apply_transform(run: int) -> None:
+        widgets["transform_edit"].setText(f"y0 = y0 + {run % 2}")
+        widgets["transform_button"].click()
+
+    return {
+        "tick_size_slider": tick_size,
+        "title_size_slider": title_size,
+        "toggle_dataset": toggle_dataset,
+        "rename_dataset": rename_dataset,
+        "apply_transform": apply_transform,
+    }
+
+
+def run_interactions(sets: int, points: int, repeat: int, log=sys.stderr) -> dict[str, Any]:
+    session = open_session(make_datasets(sets, points))
+    try:
+        session.window.show()
+        wait_for_draw(session, 0)
+        results: dict[str, Any] = {}
+        for name, action in interactions(session).items():
+            # The first run pays one-off costs (font and text layout caches) and is dropped.
+            runs = [measure(session, lambda run=run: action(run)) for run in range(repeat + 1)][1:]
+            key = f"gui/{name}/{sets}x{points}"
+            results[key] = {"seconds": statistics.median(runs), "runs": runs}
+            log.write(f"{key:<48}{results[key]['seconds'] * 1000:>12.2f} ms\n")
+        return results
+    finally:
+        session.close()
+
+
+def time_to_first_window(points: int, workdir: Path, log=sys.stderr) -> dict[str, Any]:
+    path = write_table(workdir / f"window_{points}.dat", _columns(points))
+    start = time.perf_counter()
+    session = open_session(load_datasets([path]))
+    try:
+        session.window.show()
+        seconds = wait_for_draw(session, 0) - start
+    finally:
+        session.close()
+    key = f"gui/first_window/{points}"
+    log.write(f"{key:<48}{seconds * 1000:>12.2f} ms\n")
+    return {key: {"seconds": seconds, "runs": [seconds]}}
+
+
+def time_to_first_plot(sets: int, log=sys.stderr) -> dict[str, Any]:
+    # Measured inside build_gui from its first line to the first canvas draw; secondary UI comes after.
+    session = open_session(make_datasets(sets, POINTS_PER_SET))
+    try:
+        session.window.show()
+        wait_for_draw(session, 0)
+        seconds = session.first_plot_seconds
+    finally:
+        session.close()
+    key = f"gui/first_plot/sets/{sets}"
+    log.write(f"{key:<48}{seconds * 1000:>12.2f} ms\n")
+    return {key: {"seconds": seconds, "runs": [seconds]}}
+
+
+def time_hover(points: int, moves: int = HOVER_MOVES, log=sys.stderr) -> dict[str, Any]:
+    from matplotlib.backend_bases import MouseEvent
+
+    session = open_session(make_datasets(2, points))
+    try:
+        session.window.show()
+        wait_for_draw(session, 0)
+        # Cursor indexes are built by a background job after the first draw; hovering starts after that.
+        spin_until(lambda: not session.jobs.busy)
+        ax, canvas = session.ax, session.canvas
+        runs = []
+        for move in range(moves):
+            # Sweep across the axes along the first set (x = i / points), so every move finds a point and blits.
+            px = ax.bbox.x0 + (move + 0.5) / moves * ax.bbox.width
+            x = ax.transData.inverted().transform((px, 0.0))[0]
+            idx = max(0, min(points - 1, round(x * points)))
+            py = ax.transData.transform((x, session.backend.datasets[0].y[idx]))[1]
+            event = MouseEvent("motion_notify_event", canvas, px, py)
+            start = time.perf_counter()
+            canvas.callbacks.process("motion_notify_event", event)
+            runs.append(time.perf_counter() - start)
+    finally:
+        session.close()
+    key = f"gui/hover/{points}"
+    seconds = statistics.median(runs)
+    log.write(f"{key:<48}{seconds * 1000:>12.2f} ms\n")
+    return {key: {"seconds": seconds, "runs": runs}}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Time scripted pygrace GUI interactions under offscreen Qt")
+    parser.add_argument("--full", action="store_true", help="Measure first-window time up to 1e7 points")
+    parser.add_argument("--sets", type=int, default=10, help="Datasets in the interaction session")
+    parser.add_argument("--points", type=int, default=10_000, help="Points per dataset in the interaction session")
+    parser.add_argument("--window-points", type=int, nargs="+", default=None, help="Input sizes for first-window time")
+    parser.add_argument("--plot-sets", type=int, nargs="+", default=None, help="Dataset counts for first-plot time")
+    parser.add_argument("--hover-points", type=int, nargs="+", default=None, help="Points per set for hover time")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per interaction; the median is reported")
+    add_report_arguments(parser)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    window_points = args.window_points or (FULL_WINDOW_POINTS if args.full else QUICK_WINDOW_POINTS)
+    plot_sets = args.plot_sets or (FULL_DATASETS if args.full else QUICK_DATASETS)
+    hover_points = args.hover_points or (FULL_HOVER_POINTS if args.full else QUICK_HOVER_POINTS)
+    repeat = max(1, args.repeat)
+
+    results = run_interactions(args.sets, args.points, repeat)
+    with tempfile.TemporaryDirectory(prefix="pygrace-gui-bench-") as tmp:
+        for points in window_points:
+            results.update(time_to_first_window(points, Path(tmp)))
+    for sets in plot_sets:
+        results.update(time_to_first_plot(sets))
+    for points in hover_points:
+        results.update(time_hover(points))
+
+    return report({"meta": run_metadata(repeat), "results": results}, args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
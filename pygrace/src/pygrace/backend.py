@@ -1,18 +1,21 @@
 from __future__ import annotations
 
 import ast
+import bisect
+import io
 import math
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, field, replace
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO, Sequence
 
-import matplotlib
-from matplotlib import ticker
-
-from .data import Dataset
+from .data import DEFAULT_COLORS, Dataset, DatasetStats, SharedColumn, coerce_datasets, dataset_stats
+from .profiling import column_nbytes, note_dataset, span, tracking_memory
 from .plugins import LINEAR_REGRESSION_PLUGIN_ID, PLUGIN_DEFINITIONS, PLUGIN_LIST, Y_EQUALS_X_PLUGIN_ID
 
 
+IMAGE_FORMATS = ("png", "svg", "pdf", "eps")
+
+
 @dataclass
 class PlotState:
     title: str | None
@@ -30,6 +33,32 @@ class PlotState:
     x_minor_step: float | None = None
     y_minor_step: float | None = None
     minor_ticks: bool = False
+    raster_threshold: int | None = None
+    density_threshold: int | None = None
+    density_cmap: str | None = None
+
+
+@dataclass
+class TransformResult:
+    axis: str
+    index: int
+    values: list[float]
+    # The sets the result was computed from (those the expression reads, plus the target, or set 0 that a new
+    # target is copied from) with their versions then; a newer version of any of them means the result is stale.
+    sources: list[tuple[Dataset, int]] = field(default_factory=list)
+    # The target did not exist yet, so it must still not exist when the result is committed.
+    new_target: bool = False
+
+
+@dataclass
+class OperationResult:
+    op_id: str
+    index: int
+    x: Sequence[float]
+    y: Sequence[float]
+    # The set and its version the result was computed from; a newer version means the result is stale.
+    source: Dataset
+    version: int
 
 
 class Vec:
@@ -39,7 +68,7 @@ class Vec:
     def _binary(self, other, op):
         if isinstance(other, Vec):
             if len(self.values) != len(other.values):
-                raise ValueError("Vector length mismatch")
+                raise ValueError("Vector length mismatch; resample one side with interp(x, xp, yp)")
             return Vec([op(a, b) for a, b in zip(self.values, other.values)])
         return Vec([op(a, float(other)) for a in self.values])
 
@@ -101,6 +130,22 @@ def _vec_max(*args):
     return max(*args)
 
 
+def _vec_interp(x, xp, fp):
+    # interp(x0, x1, y1): y1, sampled at x1, evaluated at every x0, so sets with different x can be combined.
+    from .transforms import cached_interpolation_map
+
+    if not all(isinstance(arg, Vec) for arg in (x, xp, fp)):
+        raise ValueError("interp() takes three vectors: x, xp, yp")
+    if len(xp.values) != len(fp.values):
+        raise ValueError("interp() needs xp and yp of the same length")
+    return Vec(cached_interpolation_map(x.values, xp.values).apply(fp.values).tolist())
+
+
+def _copy_column(column: Sequence[float]) -> Sequence[float]:
+    # Slicing an array gives a view, which a ring or live buffer would overwrite on its next append.
+    return column.copy() if hasattr(column, "copy") else list(column)
+
+
 class PlotBackend:
     def __init__(
         self,
@@ -112,8 +157,24 @@ class PlotBackend:
         self.state = state
         self.legend_labels = legend_labels
         self.visible: list[bool] = [True for _ in datasets]
-        self.base_y_by_id: dict[int, list[float]] = {id(ds): ds.y[:] for ds in datasets}
+        # Unaligned y per set, with the version it was taken at. align_extrema moves the version on with its own
+        # change; any other change (a transform, replaced columns) makes it stale. Live sets are never aligned.
+        self.base_y_by_id: dict[int, tuple[int, Sequence[float]]] = {id(ds): (ds.version, ds.y) for ds in datasets}
         self.active_plugins: dict[str, dict[str, Any]] = {}
+        self.plugin_prepared: dict[str, Any] = {}
+        # x-range the last render clipped sorted sets to, or None if every point was drawn.
+        self.clipped_to: tuple[float, float] | None = None
+
+    @classmethod
+    def from_data(
+        cls,
+        items: Sequence[Any],
+        state: PlotState | None = None,
+        legend_labels: list[str] | None = None,
+    ) -> PlotBackend:
+        if state is None:
+            state = PlotState(title=None, xlabel=None, ylabel=None, world=None, autoscale=True)
+        return cls(coerce_datasets(items), state, legend_labels)
 
     def ensure_visibility_length(self) -> None:
         while len(self.visible) < len(self.datasets):
@@ -124,6 +185,17 @@ class PlotBackend:
         if 0 <= idx < len(self.visible):
             self.visible[idx] = visible
 
+    def base_y(self, ds: Dataset) -> Sequence[float]:
+        entry = self.base_y_by_id.get(id(ds))
+        if entry is None or entry[0] != ds.version:
+            entry = (ds.version, ds.y)
+            self.base_y_by_id[id(ds)] = entry
+        return entry[1]
+
+    def visible_datasets(self) -> list[Dataset]:
+        self.ensure_visibility_length()
+        return [ds for ds, visible in zip(self.datasets, self.visible) if visible]
+
     def rename_dataset(self, idx: int, name: str) -> None:
         if 0 <= idx < len(self.datasets):
             self.datasets[idx].name = name
@@ -134,42 +206,192 @@ class PlotBackend:
             return self.legend_labels[idx]
         return ds.name
 
-    def plot_datasets(self, ax) -> None:
+    def should_rasterize(self, ds: Dataset) -> bool:
+        threshold = self.state.raster_threshold
+        return threshold is not None and len(ds.x) > threshold
+
+    def should_draw_density(self, ds: Dataset) -> bool:
+        # Meant for scatter-style sets, but past the threshold no set reads well as individual artists.
+        threshold = self.state.density_threshold
+        return threshold is not None and len(ds.x) > threshold
+
+    def plot_density(self, ax, ds: Dataset, label: str):
+        from matplotlib.lines import Line2D
+
+        from .density import DensityImage
+
+        DensityImage(ax, ds.x, ds.y, ds.line_color, self.state.density_cmap)
+        # The image has no legend entry of its own; a proxy with the set's style stands in for it.
+        return Line2D(
+            [],
+            [],
+            linestyle=ds.line_style,
+            linewidth=ds.line_width,
+            marker=ds.marker,
+            markersize=ds.marker_size,
+            color=ds.line_color,
+            label=label,
+        )
+
+    def clip_range(self) -> tuple[float, float] | None:
+        if self.state.world is None:
+            return None
+        xmin, xmax = self.state.world[:2]
+        return min(xmin, xmax), max(xmin, xmax)
+
+    def clip_covers(self, xmin: float, xmax: float) -> bool:
+        # False when the last render left out points of a sorted set that would now be on screen.
+        clipped = self.clipped_to
+        return clipped is None or (clipped[0] <= xmin and xmax <= clipped[1])
+
+    @staticmethod
+    def clip_dataset(ds: Dataset, x_range: tuple[float, float] | None) -> Dataset:
+        # Sorted x only: the points inside x_range plus one either side, so lines still run to the axes edge.
+        if x_range is None or not ds.x_monotonic():
+            return ds
+        n = len(ds.x)
+        lo = max(0, bisect.bisect_left(ds.x, x_range[0]) - 1)
+        hi = min(n, bisect.bisect_right(ds.x, x_range[1]) + 1)
+        if lo == 0 and hi == n:
+            return ds
+        window = slice(lo, hi)
+        return replace(
+            ds,
+            x=ds.x[window],
+            y=ds.y[window],
+            dx=None if ds.dx is None else ds.dx[window],
+            dy=None if ds.dy is None else ds.dy[window],
+            envelope=None if ds.envelope is None else (ds.envelope[0][window], ds.envelope[1][window]),
+        )
+
+    def plot_datasets(self, ax, x_range: tuple[float, float] | None = None) -> None:
+        with span("plot_datasets"):
+            self._plot_datasets(ax, x_range or self.clip_range())
+
+    def _plot_datasets(self, ax, x_range: tuple[float, float] | None) -> None:
         handles = []
         labels = []
         self.ensure_visibility_length()
+        self.clipped_to = None
         for idx, ds in enumerate(self.datasets):
             if idx < len(self.visible) and not self.visible[idx]:
                 continue
             label = self.legend_label_for(idx)
-            marker_face = ds.marker_face_color if ds.marker_fill else "none"
-            (handle,) = ax.plot(
+            shown = self.clip_dataset(ds, x_range)
+            with span("plot_dataset", dataset=ds.name) as record:
+                handles.append(self._plot_dataset(ax, shown, label))
+            labels.append(label)
+            info: dict[str, Any] = {}
+            if shown is not ds:
+                info["visible_points"] = len(shown.x)
+                self.clipped_to = x_range
+            if self.should_draw_density(shown):
+                info["density"] = True
+            else:
+                info["rasterized"] = self.should_rasterize(shown)
+            if tracking_memory():
+                memory = self.dataset_memory(ds)
+                info["data_bytes"] = memory["data_bytes"]
+                info["snapshot_bytes"] = memory["snapshot_bytes"]
+                info["artist_bytes"] = record.get("retained_bytes", 0)
+            note_dataset(ds.name, len(ds.x), stage="plot", **info)
+        if handles:
+            ax.legend(handles=handles, labels=labels)
+
+    def _plot_dataset(self, ax, ds: Dataset, label: str):
+        if self.should_draw_density(ds):
+            return self.plot_density(ax, ds, label)
+        marker_face = ds.marker_face_color if ds.marker_fill else "none"
+        # Dense sets become a bitmap inside vector output; axes and text stay vector.
+        rasterized = self.should_rasterize(ds)
+        (handle,) = ax.plot(
+            ds.x,
+            ds.y,
+            label=label,
+            linewidth=ds.line_width,
+            linestyle=ds.line_style,
+            color=ds.line_color,
+            marker=ds.marker,
+            markersize=ds.marker_size,
+            markerfacecolor=marker_face,
+            markeredgecolor=ds.marker_edge_color,
+            rasterized=rasterized,
+        )
+        if ds.dx is not None or ds.dy is not None:
+            container = ax.errorbar(
                 ds.x,
                 ds.y,
-                label=label,
-                linewidth=ds.line_width,
-                linestyle=ds.line_style,
+                xerr=ds.dx,
+                yerr=ds.dy,
+                fmt="none",
+                ecolor=ds.line_color,
+                elinewidth=max(1.0, ds.line_width * 0.75),
+                capsize=3.0,
+            )
+            if rasterized:
+                for artist in container.get_children():
+                    artist.set_rasterized(True)
+        if ds.envelope is not None:
+            lower, upper = ds.envelope
+            ax.fill_between(
+                ds.x,
+                lower,
+                upper,
                 color=ds.line_color,
-                marker=ds.marker,
-                markersize=ds.marker_size,
-                markerfacecolor=marker_face,
-                markeredgecolor=ds.marker_edge_color,
+                alpha=0.25,
+                linewidth=0,
+                rasterized=rasterized,
             )
-            if ds.dx is not None or ds.dy is not None:
-                ax.errorbar(
-                    ds.x,
-                    ds.y,
-                    xerr=ds.dx,
-                    yerr=ds.dy,
-                    fmt="none",
-                    ecolor=ds.line_color,
-                    elinewidth=max(1.0, ds.line_width * 0.75),
-                    capsize=3.0,
-                )
-            handles.append(handle)
-            labels.append(label)
-        if handles:
-            ax.legend(handles=handles, labels=labels)
+        return handle
+
+    def dataset_memory(self, ds: Dataset, counted: set[int] | None = None) -> dict[str, Any]:
+        # A shared x column is counted once, against the first set in `counted` that uses it.
+        columns = [ds.y, ds.dx, ds.dy]
+        if counted is None or id(ds.x) not in counted:
+            columns.append(ds.x)
+            if counted is not None and isinstance(ds.x, SharedColumn):
+                counted.add(id(ds.x))
+        data_bytes = sum(column_nbytes(column) for column in columns)
+        if ds.envelope is not None:
+            data_bytes += sum(column_nbytes(column) for column in ds.envelope)
+        # The extrema/transform baseline only costs memory once it stops being the live y column.
+        base_y = self.base_y(ds)
+        return {
+            "name": ds.name,
+            "points": len(ds.x),
+            "data_bytes": data_bytes,
+            "snapshot_bytes": 0 if base_y is ds.y else column_nbytes(base_y),
+        }
+
+    def memory_report(self) -> list[dict[str, Any]]:
+        counted: set[int] = set()
+        return [self.dataset_memory(ds, counted) for ds in self.datasets]
+
+    def stats_report(self) -> list[dict[str, Any]]:
+        return [{"name": ds.name, **asdict(ds.stats())} for ds in self.datasets]
+
+    def stale_stats(self, datasets: list[Dataset] | None = None) -> list[tuple[Dataset, int, Dataset]]:
+        # Snapshots sharing the current columns, so the stats can be summarized off the UI thread.
+        datasets = self.visible_datasets() if datasets is None else datasets
+        return [(ds, ds.version, replace(ds)) for ds in datasets if ds.cached_stats() is None]
+
+    @staticmethod
+    def summarize(requests: list[tuple[Dataset, int, Dataset]]) -> list[tuple[Dataset, int, DatasetStats]]:
+        return [(ds, version, dataset_stats(snapshot)) for ds, version, snapshot in requests]
+
+    def data_limits(self) -> tuple[float, float, float, float] | None:
+        # Union of the cached per-set stats: O(datasets) once each set has been summarized at its version.
+        bounds = [math.inf, -math.inf, math.inf, -math.inf]
+        for ds in self.visible_datasets():
+            stats = ds.stats()
+            if stats.count:
+                bounds = [
+                    min(bounds[0], stats.xmin),
+                    max(bounds[1], stats.xmax),
+                    min(bounds[2], stats.ymin),
+                    max(bounds[3], stats.ymax),
+                ]
+        return None if bounds[0] > bounds[1] else (bounds[0], bounds[1], bounds[2], bounds[3])
 
     def available_plugins(self) -> list[tuple[str, str]]:
         return [(p.plugin_id, p.name) for p in PLUGIN_LIST]
@@ -180,25 +402,53 @@ class PlotBackend:
             return None
         return dict(config)
 
-    def enable_plugin(self, plugin_id: str, **config: Any) -> None:
+    def plugin_config(self, plugin_id: str, **config: Any) -> dict[str, Any]:
         plugin = PLUGIN_DEFINITIONS.get(plugin_id)
         if plugin is None:
             raise ValueError(f"Unknown plugin: {plugin_id}")
         merged = dict(plugin.default_config)
         merged.update(config)
-        self.active_plugins[plugin_id] = merged
+        return merged
+
+    def prepare_plugin(self, plugin_id: str, config: dict[str, Any]) -> Any:
+        # Read-only, so it can run off the UI thread; the result is handed back through enable_plugin.
+        plugin = PLUGIN_DEFINITIONS[plugin_id]
+        if plugin.prepare is None:
+            return None
+        return plugin.prepare(config, self)
+
+    def enable_plugin(self, plugin_id: str, *, prepared: Any = None, **config: Any) -> None:
+        self.active_plugins[plugin_id] = self.plugin_config(plugin_id, **config)
+        if prepared is None:
+            self.plugin_prepared.pop(plugin_id, None)
+        else:
+            self.plugin_prepared[plugin_id] = prepared
 
     def disable_plugin(self, plugin_id: str) -> None:
         self.active_plugins.pop(plugin_id, None)
+        self.plugin_prepared.pop(plugin_id, None)
 
     def render_plugins(self, ax) -> None:
+        with span("render_plugins"):
+            self._render_plugins(ax)
+
+    def _render_plugins(self, ax) -> None:
         for plugin_id, config in self.active_plugins.items():
             plugin = PLUGIN_DEFINITIONS.get(plugin_id)
             if plugin is None:
                 continue
+            prepared = self.plugin_prepared.get(plugin_id)
+            if prepared is not None:
+                config = {**config, "prepared": prepared}
             plugin.render(ax, config, self)
 
     def apply_axes_state(self, ax) -> None:
+        with span("apply_axes_state"):
+            self._apply_axes_state(ax)
+
+    def _apply_axes_state(self, ax) -> None:
+        from matplotlib import ticker
+
         state = self.state
         if state.title is not None:
             ax.set_title(state.title)
@@ -237,14 +487,56 @@ class PlotBackend:
             ax.set_xlim(xmin, xmax)
             ax.set_ylim(ymin, ymax)
         elif state.autoscale:
+            self.autoscale(ax)
+
+    def autoscale(self, ax) -> None:
+        # Data limits come from the dataset stats instead of relim(), which re-walks every artist's points.
+        # Summarizing a set costs more than one relim() pass, so a render never waits for stats; until every
+        # shown set has them at its current version (see stale_stats), relim() it is.
+        warm = all(ds.cached_stats() is not None for ds in self.visible_datasets())
+        limits = self.data_limits() if warm else None
+        if limits is None:
             ax.relim()
-            ax.autoscale()
-
-    def render(self, ax) -> None:
-        ax.clear()
-        self.plot_datasets(ax)
-        self.apply_axes_state(ax)
-        self.render_plugins(ax)
+        else:
+            xmin, xmax, ymin, ymax = limits
+            ax.dataLim.update_from_data_xy([(xmin, ymin), (xmax, ymax)], ignore=True)
+            ax.ignore_existing_data_limits = False
+        ax.autoscale()
+
+    def render(self, ax, x_range: tuple[float, float] | None = None) -> None:
+        with span("render"):
+            ax.clear()
+            self.plot_datasets(ax, x_range)
+            self.apply_axes_state(ax)
+            self.render_plugins(ax)
+
+    def refine_envelopes(self, xmin: float, xmax: float) -> bool:
+        if not any(ds.envelope is not None for ds in self.datasets):
+            return False
+        from .envelope import refine_envelopes
+
+        return refine_envelopes(self.datasets, xmin, xmax)
+
+    def render_to(self, target: str | Path | BinaryIO, fmt: str | None = None, dpi: float = 150) -> None:
+        if fmt is not None:
+            fmt = fmt.lower()
+            if fmt not in IMAGE_FORMATS:
+                raise ValueError(f"Unsupported image format: {fmt}")
+        fig = new_headless_figure()
+        try:
+            ax = fig.add_subplot()
+            self.render(ax)
+            with span("tight_layout"):
+                fig.tight_layout()
+            with span("savefig", format=fmt or "auto"):
+                fig.savefig(target, format=fmt, dpi=dpi)
+        finally:
+            fig.clear()
+
+    def render_bytes(self, fmt: str = "png", dpi: float = 150) -> bytes:
+        buffer = io.BytesIO()
+        self.render_to(buffer, fmt=fmt, dpi=dpi)
+        return buffer.getvalue()
 
     @staticmethod
     def find_local_extrema(ds: Dataset) -> list[tuple[str, int, float, float]]:
@@ -262,9 +554,14 @@ class PlotBackend:
         return extrema
 
     def extrema_for_dataset(self, ds: Dataset) -> list[tuple[str, int, float, float]]:
-        self.base_y_by_id.setdefault(id(ds), ds.y[:])
-        extrema = self.find_local_extrema(ds)
-        if not extrema and ds.y:
+        self.base_y(ds)
+        return self.dataset_extrema(ds)
+
+    @classmethod
+    def dataset_extrema(cls, ds: Dataset) -> list[tuple[str, int, float, float]]:
+        # Local extrema, or the global min/max for monotonic sets; read-only, so safe off the UI thread.
+        extrema = cls.find_local_extrema(ds)
+        if not extrema and len(ds.y):
             ymin = min(range(len(ds.y)), key=lambda i: ds.y[i])
             ymax = max(range(len(ds.y)), key=lambda i: ds.y[i])
             extrema = [
@@ -274,16 +571,25 @@ class PlotBackend:
         return extrema
 
     def align_extrema(self, selections: list[tuple[Dataset, tuple[str, int, float, float]]]) -> None:
+        with span("align_extrema"):
+            self._align_extrema(selections)
+
+    def _align_extrema(self, selections: list[tuple[Dataset, tuple[str, int, float, float]]]) -> None:
         if not selections:
             return
+        live = [ds.name for ds, _entry in selections if ds.live]
+        if live:
+            raise ValueError(f"cannot align live sets, the next update would undo it: {', '.join(live)}")
         target_y = sum(sel[1][3] for sel in selections) / len(selections)
         for ds, entry in selections:
-            _, idx, _, yval = entry
-            if idx < 0 or idx >= len(ds.y):
+            idx = entry[1]
+            base_y = self.base_y(ds)
+            if idx < 0 or idx >= len(base_y):
                 continue
-            delta = target_y - yval
-            base_y = self.base_y_by_id.get(id(ds), ds.y)
+            # Shift from the unaligned baseline, so entries read off an already aligned set still land on target.
+            delta = target_y - base_y[idx]
             ds.y = [y + delta for y in base_y]
+            self.base_y_by_id[id(ds)] = (ds.version, base_y)
 
     def set_dataset_appearance(
         self,
@@ -324,6 +630,7 @@ class PlotBackend:
             "sin": _vec_func(math.sin),
             "cos": _vec_func(math.cos),
             "tan": _vec_func(math.tan),
+            "interp": _vec_interp,
             **vec_vars,
         }
 
@@ -346,6 +653,11 @@ class PlotBackend:
         raise ValueError("Expression did not evaluate to a vector")
 
     def apply_transform(self, text: str) -> int:
+        with span("transform", expression=text):
+            return self.commit_transform(self.evaluate_transform(text))
+
+    def evaluate_transform(self, text: str) -> TransformResult:
+        # Only reads the current columns, so it can run off the UI thread while the plot stays usable.
         if "=" not in text:
             raise ValueError("Missing '='")
         lhs, rhs = [part.strip() for part in text.split("=", 1)]
@@ -357,40 +669,124 @@ class PlotBackend:
         except ValueError as exc:
             raise ValueError("Left side index must be an integer") from exc
 
+        datasets = list(self.datasets)
+        # Versions are read before the columns, so a column replaced in between is caught at commit.
+        versions = [ds.version for ds in datasets]
         variables: dict[str, list[float]] = {}
-        for idx, ds in enumerate(self.datasets):
+        for idx, ds in enumerate(datasets):
             variables[f"x{idx}"] = ds.x
             variables[f"y{idx}"] = ds.y
         if not variables:
             raise ValueError("No datasets loaded")
 
         result = self.safe_eval(rhs, variables)
+        if any(result is column for column in variables.values()):
+            # A bare `x1 = y0` would otherwise hand the target the source's column, or a view of its buffer.
+            result = _copy_column(result)
         if target_index < 0:
             raise ValueError("Index must be >= 0")
+        new_target = target_index >= len(datasets)
+        read = {
+            int(node.id[1:])
+            for node in ast.walk(ast.parse(rhs, mode="eval"))
+            if isinstance(node, ast.Name) and node.id in variables
+        }
+        read.add(0 if new_target else target_index)
+        sources = [(datasets[idx], versions[idx]) for idx in sorted(read)]
+        return TransformResult(target_axis, target_index, result, sources, new_target)
 
+    def commit_transform(self, result: TransformResult) -> int:
+        target_axis, target_index = result.axis, result.index
         created = False
+        stale = [ds.name for ds, version in result.sources if ds.version != version]
+        if result.new_target != (target_index >= len(self.datasets)):
+            stale.append(f"set{target_index}")
+        elif not result.new_target and all(ds is not self.datasets[target_index] for ds, _ in result.sources):
+            stale.append(f"set{target_index}")
+        if stale:
+            raise ValueError(f"{', '.join(stale)} changed while the transform was running")
         if target_index < len(self.datasets):
             target = self.datasets[target_index]
+            if target.live:
+                raise ValueError(
+                    f"{target.name} is live and the next update would undo the transform; write to a new set"
+                )
         else:
             base = self.datasets[0]
-            target = Dataset(name=f"set{target_index}", x=base.x[:], y=base.y[:])
-            self.datasets.append(target)
+            # A shared x column cannot change under the new set, so it is shared rather than copied.
+            x = base.x if isinstance(base.x, SharedColumn) else _copy_column(base.x)
+            target = Dataset(name=f"set{target_index}", x=x, y=_copy_column(base.y))
             created = True
 
         if target_axis == "x":
-            if len(result) != len(target.x):
+            if len(result.values) != len(target.x):
                 raise ValueError("Result length does not match target x length")
-            target.x = result
+            target.x = result.values
         else:
-            if len(result) != len(target.y):
+            if len(result.values) != len(target.y):
                 raise ValueError("Result length does not match target y length")
-            target.y = result
+            target.y = result.values
 
-        self.base_y_by_id[id(target)] = target.y[:]
         if created:
+            self.datasets.append(target)
             self.visible.append(True)
         return target_index
 
+    def apply_operation(self, idx: int, op_id: str, **params: Any) -> int:
+        with span("operation", operation=op_id):
+            return self.commit_operation(self.evaluate_operation(idx, op_id, **params))
+
+    def evaluate_operation(self, idx: int, op_id: str, **params: Any) -> OperationResult:
+        # Like evaluate_transform, only reads the columns, so it can run off the UI thread.
+        from .transforms import OPERATIONS
+
+        operation = OPERATIONS.get(op_id)
+        if operation is None:
+            raise ValueError(f"Unknown operation: {op_id}")
+        if not 0 <= idx < len(self.datasets):
+            raise ValueError(f"No set {idx}")
+        ds = self.datasets[idx]
+        onto = params.get("onto")
+        if isinstance(onto, int):
+            # Interpolating onto another set's x is spelled with that set's index.
+            if not 0 <= onto < len(self.datasets):
+                raise ValueError(f"No set {onto}")
+            params["onto"] = self.datasets[onto].x
+        version = ds.version
+        try:
+            x, y = operation.kernel(ds.x, ds.y, **params)
+        except TypeError as exc:
+            raise ValueError(f"{op_id}: {exc}") from exc
+        return OperationResult(op_id, idx, x, y, ds, version)
+
+    def commit_operation(self, result: OperationResult) -> int:
+        # The result always becomes a new set, leaving its source untouched, as Grace's transformations do.
+        source = result.source
+        if result.version != source.version:
+            raise ValueError(f"set {result.index} changed while the operation was running")
+        color = DEFAULT_COLORS[len(self.datasets) % len(DEFAULT_COLORS)]
+        created = Dataset(
+            name=f"{result.op_id}({source.name})",
+            x=result.x,
+            y=result.y,
+            line_color=color,
+            marker_face_color=color,
+            marker_edge_color=color,
+        )
+        self.ensure_visibility_length()
+        self.datasets.append(created)
+        self.visible.append(True)
+        return len(self.datasets) - 1
+
+
+def new_headless_figure():
+    # Bypass pyplot's global figure manager so each render owns its figure and can run on any thread.
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    return fig
 
 
 def render_hardcopy(
@@ -403,10 +799,6 @@ def render_hardcopy(
     autoscale: bool,
     legend_labels: list[str] | None,
 ) -> None:
-    matplotlib.use("Agg")
-    import matplotlib.pyplot as plt
-
-    fig, ax = plt.subplots()
     backend = PlotBackend(
         datasets=datasets,
         state=PlotState(
@@ -418,7 +810,4 @@ def render_hardcopy(
         ),
         legend_labels=legend_labels,
     )
-    backend.plot_datasets(ax)
-    backend.apply_axes_state(ax)
-    fig.tight_layout()
-    fig.savefig(output_path, dpi=150)
+    backend.render_to(output_path)
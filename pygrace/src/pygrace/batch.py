@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import json
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable
+
+from .hardcopy import (
+    HardcopyJob,
+    JobResult,
+    is_up_to_date,
+    job_fingerprint,
+    load_hash_index,
+    map_bxy_specs,
+    normalize_device,
+    parse_legend,
+    record_fingerprint,
+    run_job,
+    save_hash_index,
+)
+
+
+def _as_list(value: Any) -> list[Any]:
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    return [value]
+
+
+def _optional_int(entry: dict[str, Any], key: str) -> int | None:
+    value = entry.get(key)
+    if value is None:
+        return None
+    # bool is an int, but "raster_threshold": true is a mistake, not 1.
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise ValueError(f"{key} must be an integer")
+    try:
+        return int(value)
+    except ValueError as exc:
+        raise ValueError(f"{key} must be an integer") from exc
+
+
+def job_from_mapping(entry: dict[str, Any]) -> HardcopyJob:
+    if not isinstance(entry, dict):
+        raise ValueError("job must be a table of settings")
+    files = [Path(str(p)) for p in _as_list(entry.get("files"))]
+    if not files:
+        raise ValueError("job has no input files")
+    printfile = entry.get("printfile", entry.get("output"))
+    if not printfile:
+        raise ValueError("job requires printfile")
+
+    legend = entry.get("legend")
+    if isinstance(legend, (list, tuple)):
+        legend_labels = [str(label) for label in legend] or None
+    elif legend is None or isinstance(legend, str):
+        legend_labels = parse_legend(legend)
+    else:
+        raise ValueError("legend must be a string or a list of labels")
+    device = entry.get("device")
+    if device is not None and not isinstance(device, str):
+        raise ValueError("device must be a string")
+
+    world = entry.get("world")
+    if world is not None:
+        if not isinstance(world, (list, tuple)) or len(world) != 4:
+            raise ValueError("world must have 4 values: xmin, xmax, ymin, ymax")
+        try:
+            world = [float(v) for v in world]
+        except (TypeError, ValueError) as exc:
+            raise ValueError("world values must be numbers") from exc
+
+    operations = []
+    for operation in _as_list(entry.get("operations")):
+        if not isinstance(operation, dict) or not isinstance(operation.get("op"), str):
+            raise ValueError('each operation must be an object with an "op" name')
+        operations.append(dict(operation, set=_optional_int(operation, "set") or 0))
+    if operations and entry.get("out_of_core"):
+        raise ValueError("operations need the full data and cannot be combined with out_of_core")
+
+    return HardcopyJob(
+        files=files,
+        printfile=Path(str(printfile)),
+        bxy_specs=map_bxy_specs(files, [str(s) for s in _as_list(entry.get("bxy"))]),
+        title=entry.get("title"),
+        xlabel=entry.get("xlabel"),
+        ylabel=entry.get("ylabel"),
+        legend_labels=legend_labels,
+        world=world,
+        autoscale=bool(entry.get("autoscale", False)),
+        device=normalize_device(device, Path(str(printfile))),
+        raster_threshold=_optional_int(entry, "raster_threshold"),
+        density_threshold=_optional_int(entry, "density_threshold"),
+        out_of_core=bool(entry.get("out_of_core", False)),
+        envelope_bins=_optional_int(entry, "envelope_bins"),
+        incremental=bool(entry.get("incremental", False)),
+        operations=operations,
+    )
+
+
+def _read_entries(path: Path) -> list[dict[str, Any]]:
+    text = path.read_text(encoding="utf-8")
+    if path.suffix.lower() == ".toml":
+        try:
+            import tomllib
+        except ImportError as exc:
+            raise ValueError("TOML manifests require Python 3.11 or newer") from exc
+        entries = tomllib.loads(text).get("job", [])
+        if not isinstance(entries, list):
+            raise ValueError("TOML manifest must use [[job]] tables")
+        return entries
+
+    entries = []
+    for lineno, line in enumerate(text.splitlines(), start=1):
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        try:
+            entry = json.loads(stripped)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"{path}:{lineno}: invalid JSON: {exc.msg}") from exc
+        if not isinstance(entry, dict):
+            raise ValueError(f"{path}:{lineno}: job must be a JSON object")
+        entries.append(entry)
+    return entries
+
+
+def load_manifest(path: Path) -> list[HardcopyJob]:
+    jobs: list[HardcopyJob] = []
+    for idx, entry in enumerate(_read_entries(path)):
+        try:
+            jobs.append(job_from_mapping(entry))
+        except ValueError as exc:
+            raise ValueError(f"{path}: job {idx}: {exc}") from exc
+    return jobs
+
+
+def run_batch(
+    jobs: list[HardcopyJob],
+    workers: int = 1,
+    on_result: Callable[[JobResult], None] | None = None,
+    hash_index: Path | None = None,
+) -> list[JobResult]:
+    results: list[JobResult] = []
+    index = load_hash_index(hash_index) if hash_index is not None else None
+    fingerprints: dict[int, str] = {}
+
+    def record(result: JobResult) -> None:
+        # Fingerprints are recorded in this process so a shared index is never written concurrently.
+        if result.ok and result.index in fingerprints:
+            record_fingerprint(jobs[result.index], fingerprints[result.index], index)
+        results.append(result)
+        if on_result is not None:
+            on_result(result)
+
+    pending: list[tuple[int, HardcopyJob]] = []
+    for idx, job in enumerate(jobs):
+        if job.incremental:
+            fingerprint = job_fingerprint(job)
+            if is_up_to_date(job, fingerprint, index):
+                record(JobResult(idx, job.printfile, True, 0.0, skipped=True))
+                continue
+            fingerprints[idx] = fingerprint
+        pending.append((idx, job))
+
+    try:
+        if workers <= 1 or len(pending) <= 1:
+            for idx, job in pending:
+                record(run_job(idx, job))
+        else:
+            # Worker processes are reused across jobs, so matplotlib is imported once per worker.
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(run_job, idx, job) for idx, job in pending]
+                for future in as_completed(futures):
+                    record(future.result())
+    finally:
+        if hash_index is not None and index is not None:
+            save_hash_index(hash_index, index)
+
+    results.sort(key=lambda result: result.index)
+    return results
+
+
+def format_result(result: JobResult) -> str:
+    status = "skipped" if result.skipped else "ok" if result.ok else "FAILED"
+    line = f"{result.index}\t{status}\t{result.seconds:.3f}s\t{result.printfile}"
+    if result.error:
+        line += f"\t{result.error}"
+    return line
@@ -1,9 +1,25 @@
 import argparse
+import io
 import sys
 from pathlib import Path
 
-from .data import load_datasets
-from .gui import launch_gui, render_hardcopy
+from . import profiling
+from .data import STDIN_PATH, input_name, is_stream, load_datasets
+from .hardcopy import (
+    JobResult,
+    is_up_to_date,
+    job_fingerprint,
+    job_from_args,
+    load_hash_index,
+    map_bxy_specs,
+    parse_legend,
+    record_fingerprint,
+    render_job,
+    save_hash_index,
+)
+
+# Heavy or path-specific modules (gui, batch, service, matplotlib) are imported inside the branch
+# that needs them so -version, argument errors and -bxy validation stay fast.
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -22,6 +38,23 @@ def build_parser() -> argparse.ArgumentParser:
         default=[],
         help="Column mapping per file: x:y, x:y:dy, or x:y:dx:dy (1-based indices)",
     )
+    parser.add_argument("-pipe", dest="pipe", action="store_true", help="Read data from stdin (same as a '-' file)")
+    parser.add_argument(
+        "-npipe",
+        dest="npipes",
+        action="append",
+        default=[],
+        metavar="PATH",
+        help="Read data from a named pipe; the GUI keeps appending rows as they arrive",
+    )
+    parser.add_argument(
+        "-ringsize",
+        dest="ring_size",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Keep only the newest N points of stdin and pipe inputs; -npipe sets become fixed-size ring buffers",
+    )
     parser.add_argument("-title", dest="title", default=None, help="Plot title")
     parser.add_argument("-xlabel", dest="xlabel", default=None, help="X axis label")
     parser.add_argument("-ylabel", dest="ylabel", default=None, help="Y axis label")
@@ -42,7 +75,106 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument("-autoscale", dest="autoscale", action="store_true", help="Autoscale axes")
     parser.add_argument("-hardcopy", dest="hardcopy", action="store_true", help="Render without GUI")
     parser.add_argument("-printfile", dest="printfile", default=None, help="Output file for hardcopy")
-    parser.add_argument("-device", dest="device", default=None, help="Output device (PNG supported)")
+    parser.add_argument(
+        "-device",
+        dest="device",
+        default=None,
+        help="Output device: PNG, PDF, SVG or EPS (default: from the printfile suffix, else PNG)",
+    )
+    parser.add_argument(
+        "-rasterthreshold",
+        dest="raster_threshold",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Rasterize datasets with more than N points in vector output (default: 50000, 0 disables)",
+    )
+    parser.add_argument(
+        "-density",
+        dest="density_threshold",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Draw datasets with more than N points, lines included, as a density image",
+    )
+    parser.add_argument(
+        "-outofcore",
+        dest="out_of_core",
+        action="store_true",
+        help="Stream files once and plot a fixed-resolution min/max/mean envelope",
+    )
+    parser.add_argument(
+        "-envelopebins",
+        dest="envelope_bins",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Envelope resolution for -outofcore (default: 2048 bins)",
+    )
+    parser.add_argument(
+        "-profile",
+        dest="profile",
+        action="store_true",
+        help="Time each pipeline stage and print a table to stderr",
+    )
+    parser.add_argument(
+        "-profilejson",
+        dest="profile_json",
+        default=None,
+        metavar="PATH",
+        help="Like -profile, but write stage timings and point counts as JSON",
+    )
+    parser.add_argument(
+        "-memreport",
+        dest="memreport",
+        action="store_true",
+        help="Trace allocations and print peak bytes per stage and retained bytes per dataset",
+    )
+    parser.add_argument(
+        "-incremental",
+        dest="incremental",
+        action="store_true",
+        help="Skip hardcopy rendering when inputs, options and version are unchanged",
+    )
+    parser.add_argument(
+        "-hashindex",
+        dest="hash_index",
+        default=None,
+        metavar="PATH",
+        help="Keep -incremental hashes in one JSON index instead of next to each -printfile",
+    )
+    parser.add_argument(
+        "-batch",
+        dest="batch",
+        default=None,
+        metavar="MANIFEST",
+        help="Render every hardcopy job in a JSON-lines or TOML manifest",
+    )
+    parser.add_argument(
+        "-workers",
+        dest="workers",
+        type=int,
+        default=1,
+        help="Worker processes for -batch and -serve (default: 1)",
+    )
+    parser.add_argument(
+        "-serve",
+        dest="serve",
+        action="store_true",
+        help="Run a local render service that keeps warm hardcopy workers",
+    )
+    parser.add_argument(
+        "-socket",
+        dest="socket",
+        default=None,
+        help="Render service socket path (default: $PYGRACE_SOCKET or a per-user runtime path)",
+    )
+    parser.add_argument(
+        "-noserver",
+        dest="noserver",
+        action="store_true",
+        help="Render -hardcopy locally even when a render service is running",
+    )
     parser.add_argument("-version", action="version", version="pygrace 0.1.0")
     return parser
 
@@ -64,43 +196,86 @@ def main(argv: list[str] | None = None) -> int:
             "Warning: unsupported options ignored: " + " ".join(unknown) + "\n"
         )
 
+    if not (args.profile or args.profile_json or args.memreport):
+        return run(args, argv)
+
+    profiler = profiling.enable(profiling.Profiler(memory=args.memreport))
+    try:
+        return run(args, argv)
+    finally:
+        profiling.disable()
+        if args.profile:
+            sys.stderr.write(profiler.format_table() + "\n")
+        if args.memreport:
+            sys.stderr.write(profiler.format_memory_table() + "\n")
+        if args.profile_json:
+            profiler.write_json(args.profile_json)
+
+
+def run(args: argparse.Namespace, argv: list[str]) -> int:
+    if args.serve:
+        from .service import run_service
+
+        try:
+            socket_path = resolve_socket_path(args.socket)
+        except ValueError as exc:
+            sys.stderr.write(f"Error: {exc}\n")
+            return 2
+        run_service(socket_path, max(1, args.workers))
+        return 0
+
+    if args.batch:
+        hash_index = Path(args.hash_index) if args.hash_index else None
+        return run_batch_manifest(Path(args.batch), args.workers, args.incremental, hash_index)
+
     data_files = [Path(p) for p in args.files] + [Path(p) for p in args.nxy_files]
-    if len(args.bxy_specs) > len(data_files):
-        sys.stderr.write("Error: more -bxy specs than data files\n")
+    if args.pipe:
+        data_files.append(Path(STDIN_PATH))
+    if args.ring_size is not None and args.ring_size <= 0:
+        sys.stderr.write("Error: -ringsize must be positive\n")
+        return 2
+    not_pipes = [path for path in args.npipes if not Path(path).is_fifo()]
+    if not_pipes:
+        sys.stderr.write(f"Error: -npipe needs a named pipe (mkfifo), not {', '.join(not_pipes)}\n")
+        return 2
+    streams = [input_name(path) for path in data_files if is_stream(path)] + [str(path) for path in args.npipes]
+    if args.out_of_core and streams:
+        # The envelope is built by re-reading byte ranges of its inputs, which a pipe cannot offer.
+        sys.stderr.write(f"Error: -outofcore needs regular files, not {', '.join(streams)}\n")
         return 2
-    bxy_by_file = [None for _ in data_files]
-    for idx, spec in enumerate(args.bxy_specs):
-        bxy_by_file[idx] = spec
-
     try:
-        datasets = load_datasets(data_files, bxy_specs=bxy_by_file)
+        bxy_by_file = map_bxy_specs(data_files, args.bxy_specs)
     except ValueError as exc:
         sys.stderr.write(f"Error: {exc}\n")
         return 2
 
-    legend_labels = None
-    if args.legend:
-        legend_labels = [label.strip() for label in args.legend.split(",") if label.strip()]
+    legend_labels = parse_legend(args.legend)
 
     if args.hardcopy:
         if not args.printfile:
             sys.stderr.write("Error: -hardcopy requires -printfile\n")
             return 2
-        device = (args.device or "PNG").upper()
-        if device != "PNG":
-            sys.stderr.write("Error: only PNG device is supported\n")
+        try:
+            return run_hardcopy(args, argv)
+        except ValueError as exc:
+            sys.stderr.write(f"Error: {exc}\n")
             return 2
-        render_hardcopy(
-            datasets=datasets,
-            output_path=Path(args.printfile),
-            title=args.title,
-            xlabel=args.xlabel,
-            ylabel=args.ylabel,
-            world=args.world,
-            autoscale=args.autoscale or args.world is None,
-            legend_labels=legend_labels,
-        )
-        return 0
+
+    try:
+        if args.out_of_core:
+            from .envelope import DEFAULT_ENVELOPE_BINS, load_envelope_datasets
+
+            bins = args.envelope_bins or DEFAULT_ENVELOPE_BINS
+            datasets = load_envelope_datasets(data_files, bxy_specs=bxy_by_file, bins=bins)
+        else:
+            with profiling.span("load_datasets"):
+                datasets = load_datasets(data_files, bxy_specs=bxy_by_file, ring_size=args.ring_size)
+    except ValueError as exc:
+        sys.stderr.write(f"Error: {exc}\n")
+        return 2
+
+    # The Qt/matplotlib GUI stack is only imported once we know the GUI is needed.
+    from .gui import launch_gui
 
     launch_gui(
         datasets=datasets,
@@ -110,9 +285,102 @@ def main(argv: list[str] | None = None) -> int:
         world=args.world,
         autoscale=args.autoscale or args.world is None,
         legend_labels=legend_labels,
+        density_threshold=args.density_threshold,
+        pipes=[Path(p) for p in args.npipes],
+        ring_size=args.ring_size,
     )
     return 0
 
 
+def run_hardcopy(args: argparse.Namespace, argv: list[str]) -> int:
+    job = job_from_args(args)
+    hash_index = Path(args.hash_index) if args.hash_index else None
+    index = load_hash_index(hash_index) if hash_index is not None else None
+    fingerprint = job_fingerprint(job) if job.incremental else None
+    if fingerprint is not None and is_up_to_date(job, fingerprint, index):
+        return 0
+
+    rc = None
+    socket_path = resolve_socket_path(args.socket)
+    # Profiling measures this process, and piped input can only be read here, so both render locally.
+    local = args.profile or args.profile_json or args.memreport or any(is_stream(path) for path in job.files)
+    if not args.noserver and not local and socket_path.is_socket():
+        rc = forward_hardcopy(socket_path, argv, job.printfile)
+    if rc is None:
+        render_job(job)
+        rc = 0
+
+    if rc == 0 and fingerprint is not None:
+        record_fingerprint(job, fingerprint, index)
+        if hash_index is not None and index is not None:
+            save_hash_index(hash_index, index)
+    return rc
+
+
+def resolve_socket_path(value: str | None) -> Path:
+    if value:
+        return Path(value)
+    from .service import default_socket_path
+
+    return default_socket_path()
+
+
+def forward_hardcopy(socket_path: Path, argv: list[str], printfile: Path) -> int | None:
+    from .service import ServiceError, ServiceUnavailable, request_render
+
+    image = io.BytesIO()
+    try:
+        request_render(socket_path, argv, image)
+    except ServiceUnavailable:
+        # Stale socket or service gone: fall back to rendering in this process.
+        return None
+    except ServiceError as exc:
+        sys.stderr.write(f"Error: {exc}\n")
+        return 2
+    # The printfile is only touched once the whole image has arrived, so a failed render leaves no partial file.
+    try:
+        printfile.write_bytes(image.getvalue())
+    except OSError as exc:
+        sys.stderr.write(f"Error: cannot write {printfile}: {exc}\n")
+        return 2
+    return 0
+
+
+def run_batch_manifest(
+    manifest: Path,
+    workers: int,
+    incremental: bool = False,
+    hash_index: Path | None = None,
+) -> int:
+    from .batch import format_result, load_manifest, run_batch
+
+    try:
+        jobs = load_manifest(manifest)
+    except (OSError, ValueError) as exc:
+        sys.stderr.write(f"Error: {exc}\n")
+        return 2
+    if incremental:
+        for job in jobs:
+            job.incremental = True
+
+    def report(result: JobResult) -> None:
+        sys.stdout.write(format_result(result) + "\n")
+        sys.stdout.flush()
+
+    try:
+        results = run_batch(jobs, workers=max(1, workers), on_result=report, hash_index=hash_index)
+    except (OSError, ValueError) as exc:
+        sys.stderr.write(f"Error: {exc}\n")
+        return 2
+    failed = sum(1 for result in results if not result.ok)
+    skipped = sum(1 for result in results if result.skipped)
+    total = sum(result.seconds for result in results)
+    sys.stderr.write(
+        f"{len(results) - failed - skipped}/{len(results)} jobs rendered, {skipped} up to date, "
+        f"in {total:.3f}s of render time\n"
+    )
+    return 1 if failed else 0
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
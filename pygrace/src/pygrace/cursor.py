@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import math
+from typing import Any, Callable, Sequence
+
+import numpy as np
+
+from .data import Dataset
+
+# Points further than this many pixels from the mouse are never reported.
+HOVER_RADIUS = 20.0
+# A query converts at most this many candidates to display space; when the x-window under the mouse holds
+# more (a zoomed-out view of millions of points), the ones nearest in x are kept.
+MAX_CANDIDATES = 1 << 16
+
+
+class PointIndex:
+    # Points ordered by x, so a query touches only the slice under the mouse rather than every point.
+    def __init__(self, x: Sequence[float], y: Sequence[float]) -> None:
+        xs = np.asarray(x, dtype=np.float64)
+        ys = np.asarray(y, dtype=np.float64)
+        n = min(len(xs), len(ys))
+        xs = xs[:n]
+        ys = ys[:n]
+        # NaN compares false, so any NaN x also takes the argsort path, which puts NaNs last.
+        if n > 1 and not bool((xs[1:] >= xs[:-1]).all()):
+            self.order: np.ndarray | None = np.argsort(xs, kind="stable")
+            xs = xs[self.order]
+            ys = ys[self.order]
+        else:
+            self.order = None
+        self.x = xs
+        self.y = ys
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    def nearest(
+        self,
+        point: tuple[float, float],
+        xmin: float,
+        xmax: float,
+        to_display: Callable[[np.ndarray], np.ndarray],
+    ) -> tuple[int, float] | None:
+        # Candidates are the points with xmin <= x <= xmax; distance is measured after to_display, so log
+        # axes and unequal x/y scales are handled by the caller's transform.
+        lo = int(np.searchsorted(self.x, xmin, side="left"))
+        hi = int(np.searchsorted(self.x, xmax, side="right"))
+        if hi <= lo:
+            return None
+        if hi - lo > MAX_CANDIDATES:
+            mid = int(np.searchsorted(self.x, 0.5 * (xmin + xmax)))
+            lo = max(lo, mid - MAX_CANDIDATES // 2)
+            hi = min(hi, lo + MAX_CANDIDATES)
+        shown = to_display(np.column_stack((self.x[lo:hi], self.y[lo:hi])))
+        dist = np.hypot(shown[:, 0] - point[0], shown[:, 1] - point[1])
+        dist[~np.isfinite(dist)] = np.inf
+        best = int(np.argmin(dist))
+        if not math.isfinite(dist[best]):
+            return None
+        pos = lo + best
+        return (int(self.order[pos]) if self.order is not None else pos), float(dist[best])
+
+
+class HoverCursor:
+    # Crosshair and nearest-point marker drawn by blitting: a mouse move restores the background cached at
+    # the last full draw and redraws only these artists, so the data is never re-rendered while hovering.
+    def __init__(
+        self,
+        canvas,
+        ax,
+        datasets: Callable[[], list[Dataset]],
+        on_readout: Callable[[str], None],
+        radius: float = HOVER_RADIUS,
+    ) -> None:
+        self.canvas = canvas
+        self.ax = ax
+        self.datasets = datasets
+        self.on_readout = on_readout
+        self.radius = radius
+        self.enabled = True
+        self._indexes: dict[int, tuple[int, PointIndex]] = {}
+        self._background: Any = None
+        self._artists: list[Any] = []
+        canvas.mpl_connect("draw_event", self._on_draw)
+        canvas.mpl_connect("motion_notify_event", self._on_move)
+        canvas.mpl_connect("axes_leave_event", lambda _event: self.hide())
+
+    def index_for(self, ds: Dataset) -> PointIndex:
+        # Columns are replaced, never mutated, so the dataset version says when to rebuild.
+        cached = self._indexes.get(id(ds))
+        if cached is None or cached[0] != ds.version:
+            cached = (ds.version, PointIndex(ds.x, ds.y))
+            self._indexes[id(ds)] = cached
+        return cached[1]
+
+    def stale_requests(self) -> list[tuple[Dataset, int, Any, Any]]:
+        requests = []
+        for ds in self.datasets():
+            cached = self._indexes.get(id(ds))
+            if cached is None or cached[0] != ds.version:
+                requests.append((ds, ds.version, ds.x, ds.y))
+        return requests
+
+    @staticmethod
+    def build_indexes(requests: list[tuple[Dataset, int, Any, Any]]) -> list[tuple[Dataset, int, PointIndex]]:
+        # Safe off the UI thread: works only on the columns captured in each request.
+        return [(ds, version, PointIndex(x, y)) for ds, version, x, y in requests]
+
+    def store(self, built: list[tuple[Dataset, int, PointIndex]]) -> None:
+        for ds, version, index in built:
+            if ds.version == version:
+                self._indexes[id(ds)] = (version, index)
+
+    def find(self, px: float, py: float) -> tuple[Dataset, int, float, float] | None:
+        to_data = self.ax.transData.inverted()
+        (x0, _), (x1, _) = to_data.transform([(px - self.radius, py), (px + self.radius, py)])
+        xmin, xmax = min(x0, x1), max(x0, x1)
+        best: tuple[float, Dataset, int] | None = None
+        for ds in self.datasets():
+            hit = self.index_for(ds).nearest((px, py), xmin, xmax, self.ax.transData.transform)
+            if hit is not None and hit[1] <= self.radius and (best is None or hit[1] < best[0]):
+                best = (hit[1], ds, hit[0])
+        if best is None:
+            return None
+        _, ds, idx = best
+        return ds, idx, float(ds.x[idx]), float(ds.y[idx])
+
+    def set_enabled(self, enabled: bool) -> None:
+        self.enabled = enabled
+        if not enabled:
+            self.hide()
+
+    def hide(self) -> None:
+        if self._artists and any(artist.get_visible() for artist in self._artists):
+            for artist in self._artists:
+                artist.set_visible(False)
+            self._blit()
+        self.on_readout("")
+
+    def _ensure_artists(self) -> None:
+        # render() clears the axes, which detaches the overlay; build it again on the next draw.
+        if self._artists and self._artists[0].axes is self.ax:
+            return
+        from matplotlib.lines import Line2D
+
+        style = {"color": "0.4", "linewidth": 0.8, "linestyle": "--", "animated": True, "visible": False}
+        vline = Line2D([0, 0], [0, 1], transform=self.ax.get_xaxis_transform(), **style)
+        hline = Line2D([0, 1], [0, 0], transform=self.ax.get_yaxis_transform(), **style)
+        marker = Line2D(
+            [0], [0], marker="o", markersize=8, markerfacecolor="none", markeredgecolor="red",
+            linestyle="None", animated=True, visible=False,
+        )
+        # add_artist keeps the overlay out of autoscaling and the legend.
+        self._artists = [self.ax.add_artist(artist) for artist in (vline, hline, marker)]
+
+    def _on_draw(self, _event) -> None:
+        self._ensure_artists()
+        self._background = self.canvas.copy_from_bbox(self.ax.bbox)
+
+    def _on_move(self, event) -> None:
+        if not self.enabled or event.inaxes is not self.ax or self._background is None:
+            return
+        found = self.find(event.x, event.y)
+        if found is None:
+            self.hide()
+            return
+        ds, idx, x, y = found
+        vline, hline, marker = self._artists
+        vline.set_xdata([x, x])
+        hline.set_ydata([y, y])
+        marker.set_data([x], [y])
+        for artist in self._artists:
+            artist.set_visible(True)
+        self._blit()
+        self.on_readout(f"{ds.name} [{idx}]  x={x:.6g}  y={y:.6g}")
+
+    def _blit(self) -> None:
+        if self._background is None:
+            return
+        self.canvas.restore_region(self._background)
+        for artist in self._artists:
+            self.ax.draw_artist(artist)
+        self.canvas.blit(self.ax.bbox)
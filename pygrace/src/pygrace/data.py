@@ -1,8 +1,17 @@
 from __future__ import annotations
 
 import csv
-from dataclasses import dataclass
+import math
+import operator
+import sys
+from collections import deque
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from itertools import islice
 from pathlib import Path
+from typing import Any, BinaryIO, Iterator, Sequence
+
+from .profiling import note_dataset, span
 
 
 @dataclass
@@ -20,6 +29,154 @@ class Dataset:
     marker_face_color: str = "black"
     marker_edge_color: str = "black"
     marker_fill: bool = False
+    # Optional (lower, upper) band drawn as a shaded area around the line, e.g. a min/max envelope.
+    envelope: tuple[Sequence[float], Sequence[float]] | None = None
+    # Fed by a pipe or ring buffer that rewrites the columns on every update, so transforms and alignment
+    # applied to the set itself would be undone; they are refused.
+    live: bool = field(default=False, compare=False)
+    # Bumped whenever a data column is replaced; caches derived from the columns compare against it.
+    version: int = field(default=0, compare=False, repr=False)
+    _x_monotonic: tuple[int, bool] | None = field(default=None, init=False, compare=False, repr=False)
+    _stats: tuple[int, DatasetStats] | None = field(default=None, init=False, compare=False, repr=False)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if name in DATA_COLUMNS:
+            object.__setattr__(self, "version", getattr(self, "version", 0) + 1)
+
+    def x_monotonic(self) -> bool:
+        # Non-decreasing x, checked once per version of the columns.
+        cached = self._x_monotonic
+        if cached is None or cached[0] != self.version:
+            x = self.x
+            cached = (self.version, x.non_decreasing() if isinstance(x, SharedColumn) else is_non_decreasing(x))
+            object.__setattr__(self, "_x_monotonic", cached)
+        return cached[1]
+
+    def stats(self) -> DatasetStats:
+        stats = self.cached_stats()
+        if stats is None:
+            stats = dataset_stats(self)
+            self.store_stats(self.version, stats)
+        return stats
+
+    def cached_stats(self) -> DatasetStats | None:
+        cached = self._stats
+        return cached[1] if cached is not None and cached[0] == self.version else None
+
+    def store_stats(self, version: int, stats: DatasetStats) -> None:
+        # Stats summarized elsewhere from the columns at `version` are kept only if nothing replaced them since.
+        if version == self.version:
+            object.__setattr__(self, "_stats", (version, stats))
+
+
+@dataclass(frozen=True)
+class DatasetStats:
+    # Bounds include error bars and the envelope band; mean and std are of y. Points with a non-finite x or y
+    # are left out of everything, as matplotlib leaves them out of the plot.
+    count: int
+    xmin: float
+    xmax: float
+    ymin: float
+    ymax: float
+    mean: float
+    std: float
+
+
+# Columns are summarized this many points at a time, so temporaries stay bounded for any dataset size.
+STATS_CHUNK = 1 << 20
+
+
+def _widen(bounds: list[float], lo: int, values) -> None:
+    import numpy as np
+
+    values = values[np.isfinite(values)]
+    if len(values):
+        bounds[lo] = min(bounds[lo], float(values.min()))
+        bounds[lo + 1] = max(bounds[lo + 1], float(values.max()))
+
+
+def dataset_stats(ds: Dataset, chunk: int = STATS_CHUNK) -> DatasetStats:
+    import numpy as np
+
+    n = min(len(ds.x), len(ds.y))
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+    bounds = [math.inf, -math.inf, math.inf, -math.inf]
+    for start in range(0, n, chunk):
+        window = slice(start, min(n, start + chunk))
+
+        def column(values):
+            return np.asarray(values[window], dtype=np.float64)
+
+        cx = column(ds.x)
+        cy = column(ds.y)
+        finite = np.isfinite(cx) & np.isfinite(cy)
+        if not finite.all():
+            cx = cx[finite]
+            cy = cy[finite]
+        if not len(cy):
+            continue
+        if ds.dx is None:
+            _widen(bounds, 0, cx)
+        else:
+            err = column(ds.dx)[finite]
+            _widen(bounds, 0, np.concatenate((cx - err, cx + err)))
+        if ds.dy is None:
+            _widen(bounds, 2, cy)
+        else:
+            err = column(ds.dy)[finite]
+            _widen(bounds, 2, np.concatenate((cy - err, cy + err)))
+        if ds.envelope is not None:
+            _widen(bounds, 2, np.concatenate([column(band)[finite] for band in ds.envelope]))
+        # Chunks are merged with the pairwise update of Chan et al., which stays accurate for long columns.
+        chunk_mean = float(cy.mean())
+        chunk_m2 = float(((cy - chunk_mean) ** 2).sum())
+        total = count + len(cy)
+        delta = chunk_mean - mean
+        mean += delta * len(cy) / total
+        m2 += chunk_m2 + delta * delta * count * len(cy) / total
+        count = total
+    if not count:
+        return DatasetStats(0, math.nan, math.nan, math.nan, math.nan, math.nan, math.nan)
+    return DatasetStats(count, *bounds, mean, math.sqrt(m2 / count))
+
+
+DATA_COLUMNS = frozenset({"x", "y", "dx", "dy", "envelope"})
+
+
+def is_non_decreasing(values: Sequence[float]) -> bool:
+    # NaN compares false, so a column containing NaN never counts as sorted.
+    if hasattr(values, "dtype"):
+        return bool((values[1:] >= values[:-1]).all())
+    return all(map(operator.le, values, islice(values, 1, None)))
+
+
+class SharedColumn(list):
+    # The x column shared by all sets loaded from one multi-column file. It cannot be changed in place, since
+    # that would change every set; a set that needs different x gets a new column, leaving the others alone.
+    __slots__ = ("_non_decreasing",)
+
+    def __init__(self, values: Iterator[float] | Sequence[float] = ()) -> None:
+        super().__init__(values)
+        self._non_decreasing: bool | None = None
+
+    def _read_only(self, *args: Any, **kwargs: Any) -> Any:
+        raise TypeError("shared x column is read-only; assign a new column instead")
+
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Pickle would otherwise rebuild the list through extend().
+        return SharedColumn, (list(self),)
+
+    def non_decreasing(self) -> bool:
+        # Checked once for all the sets sharing the column.
+        if self._non_decreasing is None:
+            self._non_decreasing = is_non_decreasing(self)
+        return self._non_decreasing
 
 
 DEFAULT_COLORS = [
@@ -35,6 +192,37 @@ DEFAULT_COLORS = [
 ]
 
 
+def coerce_datasets(items: Sequence[Any]) -> list[Dataset]:
+    # Accept ready-made Datasets or column groups (x, y[, dy] or x, y, dx, dy) without copying the columns.
+    datasets: list[Dataset] = []
+    for idx, item in enumerate(items):
+        if isinstance(item, Dataset):
+            datasets.append(item)
+            continue
+        columns = list(item)
+        if len(columns) not in {2, 3, 4}:
+            raise ValueError("array data must be (x, y), (x, y, dy) or (x, y, dx, dy)")
+        x, y = columns[0], columns[1]
+        dx = columns[2] if len(columns) == 4 else None
+        dy = columns[-1] if len(columns) in {3, 4} else None
+        if len(x) != len(y):
+            raise ValueError("x and y must have the same length")
+        color = DEFAULT_COLORS[idx % len(DEFAULT_COLORS)]
+        datasets.append(
+            Dataset(
+                name=f"set{idx}",
+                x=x,
+                y=y,
+                dx=dx,
+                dy=dy,
+                line_color=color,
+                marker_face_color=color,
+                marker_edge_color=color,
+            )
+        )
+    return datasets
+
+
 def _parse_xy_lines(lines: list[str]) -> tuple[list[float], list[float]]:
     # Backward-compatible helper used by tests and older call paths.
     x: list[float] = []
@@ -128,18 +316,74 @@ def _extract_columns(rows: list[list[float]], indices: tuple[int, int, int | Non
     return x, y, dx, dy
 
 
-def load_datasets(paths: list[Path], bxy_specs: list[str | None] | None = None) -> list[Dataset]:
+STDIN_PATH = "-"
+# Bytes asked of a stream per read. A read returns whatever a pipe already holds, so a slow writer is never
+# waited on for a full chunk.
+STREAM_CHUNK = 1 << 16
+
+
+def is_stream(path: Path) -> bool:
+    # stdin ("-") or a named pipe: readable once, front to back, with no size or mtime to go by.
+    return str(path) == STDIN_PATH or path.is_fifo()
+
+
+def input_name(path: Path) -> str:
+    return "stdin" if str(path) == STDIN_PATH else path.name
+
+
+def open_stream(path: Path):
+    # stdin is borrowed, not owned: leaving the with-block must not close it.
+    return nullcontext(sys.stdin.buffer) if str(path) == STDIN_PATH else path.open("rb")
+
+
+def read_line_chunks(stream: BinaryIO, size: int = STREAM_CHUNK) -> Iterator[list[str]]:
+    # Complete lines as each read delivers them; a line cut by a read is held back until its end arrives.
+    tail = b""
+    while True:
+        block = stream.read1(size)
+        if not block:
+            break
+        data = tail + block
+        cut = data.rfind(b"\n") + 1
+        tail = data[cut:]
+        if cut:
+            yield data[:cut].decode("utf-8", errors="ignore").splitlines()
+    if tail:
+        yield tail.decode("utf-8", errors="ignore").splitlines()
+
+
+def read_stream_rows(path: Path, keep_last: int | None = None) -> list[list[float]]:
+    # Parsed chunk by chunk as the data arrives, so the raw text is never held in memory or spooled to disk.
+    # With keep_last, older rows are dropped as newer ones arrive and memory stays bounded however long it runs.
+    rows: deque[list[float]] = deque(maxlen=keep_last)
+    with open_stream(path) as stream:
+        for lines in read_line_chunks(stream):
+            rows.extend(_parse_numeric_rows(lines))
+    return list(rows)
+
+
+def load_datasets(
+    paths: list[Path],
+    bxy_specs: list[str | None] | None = None,
+    ring_size: int | None = None,
+) -> list[Dataset]:
     datasets: list[Dataset] = []
     color_idx = 0
 
     normalized_specs = bxy_specs or []
 
     for file_idx, path in enumerate(paths):
-        if not path.exists():
+        name = input_name(path)
+        if is_stream(path):
+            with span("read", file=name):
+                rows = read_stream_rows(path, ring_size)
+        elif not path.exists():
             continue
-
-        lines = path.read_text(encoding="utf-8", errors="ignore").splitlines()
-        rows = _parse_numeric_rows(lines)
+        else:
+            with span("read", file=name):
+                lines = path.read_text(encoding="utf-8", errors="ignore").splitlines()
+            with span("_parse_numeric_rows", file=name):
+                rows = _parse_numeric_rows(lines)
         if not rows:
             continue
 
@@ -147,14 +391,15 @@ def load_datasets(paths: list[Path], bxy_specs: list[str | None] | None = None)
 
         if spec:
             indices = _parse_bxy_spec(spec)
-            x, y, dx, dy = _extract_columns(rows, indices)
+            with span("_extract_columns", file=name):
+                x, y, dx, dy = _extract_columns(rows, indices)
             if not x:
                 continue
             color = DEFAULT_COLORS[color_idx % len(DEFAULT_COLORS)]
             color_idx += 1
             datasets.append(
                 Dataset(
-                    name=path.name,
+                    name=name,
                     x=x,
                     y=y,
                     dx=dx,
@@ -171,16 +416,18 @@ def load_datasets(paths: list[Path], bxy_specs: list[str | None] | None = None)
             continue
 
         # Default behavior for multi-column files: first column is X, each remaining column is a Y set.
+        # Every row has at least min_cols values, so all the sets have the same x and share one column.
+        x: SharedColumn | None = None
         for y_idx in range(1, min_cols):
-            x, y, _dx, _dy = _extract_columns(rows, (0, y_idx, None, None))
-            if not x:
-                continue
+            with span("_extract_columns", file=name):
+                if x is None:
+                    x = SharedColumn(row[0] for row in rows)
+                y = [row[y_idx] for row in rows]
             color = DEFAULT_COLORS[color_idx % len(DEFAULT_COLORS)]
             color_idx += 1
-            name = path.name if y_idx == 1 else f"{path.name}:col{y_idx + 1}"
             datasets.append(
                 Dataset(
-                    name=name,
+                    name=name if y_idx == 1 else f"{name}:col{y_idx + 1}",
                     x=x,
                     y=y,
                     line_color=color,
@@ -189,4 +436,6 @@ def load_datasets(paths: list[Path], bxy_specs: list[str | None] | None = None)
                 )
             )
 
+    for ds in datasets:
+        note_dataset(ds.name, len(ds.x), stage="load")
     return datasets
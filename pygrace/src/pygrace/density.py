@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from typing import Any, Sequence
+
+import numpy as np
+
+# Points are binned this many at a time, so temporaries stay bounded for any dataset size.
+DENSITY_CHUNK = 1 << 20
+MAX_DENSITY_PIXELS = 2048
+
+
+def _chunks(values: Sequence[float], chunk: int):
+    for start in range(0, len(values), chunk):
+        yield np.asarray(values[start : start + chunk], dtype=np.float64)
+
+
+def data_extent(x: Sequence[float], y: Sequence[float], chunk: int = DENSITY_CHUNK) -> list[float] | None:
+    bounds = [np.inf, -np.inf, np.inf, -np.inf]
+    for cx, cy in zip(_chunks(x, chunk), _chunks(y, chunk)):
+        finite = np.isfinite(cx) & np.isfinite(cy)
+        if not finite.any():
+            continue
+        cx = cx[finite]
+        cy = cy[finite]
+        bounds = [
+            min(bounds[0], float(cx.min())),
+            max(bounds[1], float(cx.max())),
+            min(bounds[2], float(cy.min())),
+            max(bounds[3], float(cy.max())),
+        ]
+    if not np.isfinite(bounds).all():
+        return None
+    for lo in (0, 2):
+        if bounds[lo] == bounds[lo + 1]:
+            bounds[lo] -= 0.5
+            bounds[lo + 1] += 0.5
+    return bounds
+
+
+def density_grid(
+    x: Sequence[float],
+    y: Sequence[float],
+    extent: Sequence[float],
+    shape: tuple[int, int],
+    chunk: int = DENSITY_CHUNK,
+) -> np.ndarray:
+    xmin, xmax, ymin, ymax = extent
+    ny, nx = shape
+    counts = np.zeros(nx * ny, dtype=np.int64)
+    if xmax == xmin or ymax == ymin:
+        return counts.reshape(ny, nx)
+    xscale = nx / (xmax - xmin)
+    yscale = ny / (ymax - ymin)
+    for cx, cy in zip(_chunks(x, chunk), _chunks(y, chunk)):
+        fx = (cx - xmin) * xscale
+        fy = (cy - ymin) * yscale
+        # The upper edge is inclusive so points sitting exactly on xmax/ymax land in the last bin.
+        inside = (fx >= 0) & (fx <= nx) & (fy >= 0) & (fy <= ny)
+        ix = np.minimum(fx[inside].astype(np.intp), nx - 1)
+        iy = np.minimum(fy[inside].astype(np.intp), ny - 1)
+        flat = iy * nx + ix
+        counts += np.bincount(flat, minlength=nx * ny)
+    return counts.reshape(ny, nx)
+
+
+def _axes_pixel_shape(ax) -> tuple[int, int]:
+    bbox = ax.get_window_extent()
+    nx = int(min(MAX_DENSITY_PIXELS, max(1, round(bbox.width))))
+    ny = int(min(MAX_DENSITY_PIXELS, max(1, round(bbox.height))))
+    return ny, nx
+
+
+def _density_cmap(color: str, cmap: str | None):
+    from matplotlib.colors import LinearSegmentedColormap, to_rgba
+
+    if cmap:
+        return cmap
+    return LinearSegmentedColormap.from_list(f"density-{color}", [to_rgba(color, 0.25), to_rgba(color, 1.0)])
+
+
+def _peak(grid: np.ma.MaskedArray) -> int:
+    return max(1, int(grid.max())) if grid.count() else 1
+
+
+class DensityImage:
+    # Re-bins onto the current view whenever the axes limits change, so zooming stays pixel-exact.
+    def __init__(self, ax, x: Sequence[float], y: Sequence[float], color: str, cmap: str | None = None) -> None:
+        from matplotlib.colors import LogNorm
+
+        self.ax = ax
+        self.x = x
+        self.y = y
+        self._key: tuple[Any, ...] | None = None
+        self._updating = False
+        extent = data_extent(x, y) or [0.0, 1.0, 0.0, 1.0]
+        grid = self._grid(extent)
+        self.image = ax.imshow(
+            grid,
+            extent=extent,
+            origin="lower",
+            aspect="auto",
+            interpolation="nearest",
+            cmap=_density_cmap(color, cmap),
+            norm=LogNorm(vmin=1, vmax=_peak(grid)),
+            zorder=2,
+        )
+        ax.callbacks.connect("xlim_changed", lambda _ax: self.update())
+        ax.callbacks.connect("ylim_changed", lambda _ax: self.update())
+
+    def _grid(self, extent: Sequence[float]) -> np.ma.MaskedArray:
+        shape = _axes_pixel_shape(self.ax)
+        self._key = (tuple(extent), shape)
+        return np.ma.masked_equal(density_grid(self.x, self.y, extent, shape), 0)
+
+    def update(self) -> None:
+        if self._updating:
+            return
+        x0, x1 = sorted(self.ax.get_xlim())
+        y0, y1 = sorted(self.ax.get_ylim())
+        extent = [x0, x1, y0, y1]
+        if self._key == (tuple(extent), _axes_pixel_shape(self.ax)):
+            return
+        self._updating = True
+        try:
+            grid = self._grid(extent)
+            self.image.set_data(grid)
+            self.image.set_extent(extent)
+            self.image.norm.vmax = _peak(grid)
+        finally:
+            self._updating = False
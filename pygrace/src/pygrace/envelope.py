@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import bisect
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+
+from .data import DEFAULT_COLORS, Dataset, _parse_bxy_spec, _parse_numeric_rows, input_name, is_stream
+
+DEFAULT_ENVELOPE_BINS = 2048
+CHUNK_LINES = 65536
+# Upper bound on (x, byte offset) entries kept for zooming; halved whenever it fills up.
+INDEX_LIMIT = 4096
+
+
+class _EnvelopeAccumulator:
+    # Fixed number of row-ordered bins; when they fill up, neighbours merge and each bin covers twice the rows.
+    def __init__(self, bins: int, ncols: int) -> None:
+        self.bins = max(2, bins + bins % 2)
+        bins = self.bins
+        self.stride = 1
+        self.rows = 0
+        self.count = np.zeros(bins, dtype=np.int64)
+        self.xsum = np.zeros(bins)
+        self.ymin = np.full((ncols, bins), np.inf)
+        self.ymax = np.full((ncols, bins), -np.inf)
+        self.ysum = np.zeros((ncols, bins))
+
+    def _merge(self) -> None:
+        half = self.bins // 2
+
+        def pairs(values: np.ndarray, reduce) -> np.ndarray:
+            merged = reduce(values[..., 0::2], values[..., 1::2])
+            padded = np.empty_like(values)
+            padded[..., :half] = merged
+            return padded
+
+        self.count = pairs(self.count, np.add)
+        self.count[half:] = 0
+        self.xsum = pairs(self.xsum, np.add)
+        self.xsum[half:] = 0.0
+        self.ysum = pairs(self.ysum, np.add)
+        self.ysum[:, half:] = 0.0
+        self.ymin = pairs(self.ymin, np.minimum)
+        self.ymin[:, half:] = np.inf
+        self.ymax = pairs(self.ymax, np.maximum)
+        self.ymax[:, half:] = -np.inf
+        self.stride *= 2
+
+    def add(self, x: np.ndarray, y: np.ndarray) -> None:
+        n = len(x)
+        if n == 0:
+            return
+        while (self.rows + n - 1) // self.stride >= self.bins:
+            self._merge()
+        bin_ids = (self.rows + np.arange(n)) // self.stride
+        starts = np.flatnonzero(np.r_[True, bin_ids[1:] != bin_ids[:-1]])
+        targets = bin_ids[starts]
+        self.count[targets] += np.diff(np.r_[starts, n])
+        self.xsum[targets] += np.add.reduceat(x, starts)
+        self.ysum[:, targets] += np.add.reduceat(y, starts, axis=1)
+        self.ymin[:, targets] = np.minimum(self.ymin[:, targets], np.minimum.reduceat(y, starts, axis=1))
+        self.ymax[:, targets] = np.maximum(self.ymax[:, targets], np.maximum.reduceat(y, starts, axis=1))
+        self.rows += n
+
+    def result(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        used = self.count > 0
+        count = self.count[used]
+        return (
+            self.xsum[used] / count,
+            self.ymin[:, used],
+            self.ymax[:, used],
+            self.ysum[:, used] / count,
+        )
+
+
+@dataclass
+class EnvelopeSource:
+    path: Path
+    x_col: int
+    y_cols: list[int]
+    bins: int = DEFAULT_ENVELOPE_BINS
+    index_x: list[float] = field(default_factory=list)
+    index_offsets: list[int] = field(default_factory=list)
+    monotonic: bool = True
+    rows: int = 0
+    window: tuple[float, float] | None = None
+
+    def _chunks(self, start: int = 0, stop: int | None = None) -> Iterator[tuple[int, np.ndarray]]:
+        ncols = max([self.x_col, *self.y_cols]) + 1
+        with self.path.open("rb") as handle:
+            handle.seek(start)
+            offset = start
+            while stop is None or offset < stop:
+                chunk_offset = offset
+                lines: list[str] = []
+                for raw in handle:
+                    offset += len(raw)
+                    lines.append(raw.decode("utf-8", errors="ignore"))
+                    if len(lines) >= CHUNK_LINES or (stop is not None and offset >= stop):
+                        break
+                if not lines:
+                    return
+                rows = [row[:ncols] for row in _parse_numeric_rows(lines) if len(row) >= ncols]
+                if rows:
+                    yield chunk_offset, np.asarray(rows, dtype=np.float64)
+
+    def _columns(self, table: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        return table[:, self.x_col], table[:, self.y_cols].T
+
+    def scan(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        acc = _EnvelopeAccumulator(self.bins, len(self.y_cols))
+        self.index_x.clear()
+        self.index_offsets.clear()
+        self.monotonic = True
+        last_x = -np.inf
+        for offset, table in self._chunks():
+            x, y = self._columns(table)
+            if self.monotonic and (x[0] < last_x or np.any(np.diff(x) < 0)):
+                self.monotonic = False
+            last_x = x[-1]
+            self.index_x.append(float(x[0]))
+            self.index_offsets.append(offset)
+            if len(self.index_x) > INDEX_LIMIT:
+                del self.index_x[1::2]
+                del self.index_offsets[1::2]
+            acc.add(x, y)
+        self.rows = acc.rows
+        self.window = None
+        return acc.result()
+
+    def byte_range(self, xmin: float, xmax: float) -> tuple[int, int | None]:
+        if not self.monotonic or not self.index_x:
+            return 0, None
+        # Start at the last indexed chunk that begins before xmin, stop at the first one that begins past xmax.
+        lo = max(0, bisect.bisect_left(self.index_x, xmin) - 1)
+        hi = bisect.bisect_right(self.index_x, xmax)
+        stop = self.index_offsets[hi] if hi < len(self.index_offsets) else None
+        return self.index_offsets[lo], stop
+
+    def read_window(self, xmin: float, xmax: float) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        acc = _EnvelopeAccumulator(self.bins, len(self.y_cols))
+        start, stop = self.byte_range(xmin, xmax)
+        for _offset, table in self._chunks(start, stop):
+            x, y = self._columns(table)
+            inside = (x >= xmin) & (x <= xmax)
+            if inside.any():
+                acc.add(x[inside], y[:, inside])
+        self.window = (xmin, xmax)
+        return acc.result()
+
+
+@dataclass
+class EnvelopeDataset(Dataset):
+    source: EnvelopeSource | None = None
+    column: int = 0
+
+    def update_envelope(self, x: np.ndarray, ymin: np.ndarray, ymax: np.ndarray, ymean: np.ndarray) -> None:
+        self.x = x
+        self.y = ymean[self.column]
+        self.envelope = (ymin[self.column], ymax[self.column])
+
+
+def _source_columns(path: Path, spec: str | None) -> tuple[int, list[int]] | None:
+    if spec:
+        x_idx, y_idx, _dx, _dy = _parse_bxy_spec(spec)
+        return x_idx, [y_idx]
+    # Like load_datasets: the first column is X and every other column of the first data row is a Y set.
+    with path.open("rb") as handle:
+        for raw in handle:
+            rows = _parse_numeric_rows([raw.decode("utf-8", errors="ignore")])
+            if rows:
+                return 0, list(range(1, len(rows[0])))
+    return None
+
+
+def load_envelope_datasets(
+    paths: list[Path],
+    bxy_specs: list[str | None] | None = None,
+    bins: int = DEFAULT_ENVELOPE_BINS,
+) -> list[Dataset]:
+    datasets: list[Dataset] = []
+    color_idx = 0
+    normalized_specs = bxy_specs or []
+
+    for file_idx, path in enumerate(paths):
+        if is_stream(path):
+            raise ValueError(f"-outofcore re-reads its inputs and cannot take {input_name(path)}")
+        if not path.exists():
+            continue
+        spec = normalized_specs[file_idx] if file_idx < len(normalized_specs) else None
+        columns = _source_columns(path, spec)
+        if columns is None or not columns[1]:
+            continue
+        x_col, y_cols = columns
+        source = EnvelopeSource(path=path, x_col=x_col, y_cols=y_cols, bins=bins)
+        envelope = source.scan()
+        if source.rows == 0:
+            continue
+        for column, y_idx in enumerate(y_cols):
+            color = DEFAULT_COLORS[color_idx % len(DEFAULT_COLORS)]
+            color_idx += 1
+            name = path.name if spec or y_idx == 1 else f"{path.name}:col{y_idx + 1}"
+            ds = EnvelopeDataset(
+                name=name,
+                x=[],
+                y=[],
+                line_color=color,
+                marker_face_color=color,
+                marker_edge_color=color,
+                source=source,
+                column=column,
+            )
+            ds.update_envelope(*envelope)
+            datasets.append(ds)
+
+    return datasets
+
+
+def refine_envelopes(datasets: list[Dataset], xmin: float, xmax: float) -> bool:
+    # Re-read each source once for the new window; sources already showing that window are skipped.
+    by_source: dict[int, list[EnvelopeDataset]] = {}
+    sources: dict[int, EnvelopeSource] = {}
+    for ds in datasets:
+        if isinstance(ds, EnvelopeDataset) and ds.source is not None:
+            by_source.setdefault(id(ds.source), []).append(ds)
+            sources[id(ds.source)] = ds.source
+
+    changed = False
+    for key, source in sources.items():
+        if source.window == (xmin, xmax):
+            continue
+        envelope = source.read_window(xmin, xmax)
+        if len(envelope[0]) == 0:
+            continue
+        for ds in by_source[key]:
+            ds.update_envelope(*envelope)
+        changed = True
+    return changed
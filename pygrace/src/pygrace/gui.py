@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 import sys
-
-import matplotlib
+import time
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
 
 from .backend import (
     LINEAR_REGRESSION_PLUGIN_ID,
@@ -13,6 +16,112 @@ from .backend import (
 )
 from .data import Dataset
 
+# Rows that arrived on -npipe pipes are appended and drawn at most this often.
+PIPE_POLL_MS = 200
+
+
+class BackgroundJobs:
+    # One slot per kind of work. Submitting again supersedes the pending job: it is cancelled if it has
+    # not started and its result is discarded if it has. Results are applied from poll() on the UI thread.
+    def __init__(self, executor: Executor, on_busy: Callable[[bool], None]) -> None:
+        self.executor = executor
+        self.on_busy = on_busy
+        self._pending: dict[str, tuple[Future, Callable[[Any], None], Callable[[Exception], None] | None]] = {}
+
+    @property
+    def busy(self) -> bool:
+        return bool(self._pending)
+
+    def submit(
+        self,
+        kind: str,
+        work: Callable[[], Any],
+        apply: Callable[[Any], None],
+        fail: Callable[[Exception], None] | None = None,
+    ) -> None:
+        self.cancel(kind)
+        self._pending[kind] = (self.executor.submit(work), apply, fail)
+        self.on_busy(True)
+
+    def pending(self, kind: str) -> bool:
+        return kind in self._pending
+
+    def cancel(self, kind: str) -> None:
+        previous = self._pending.pop(kind, None)
+        if previous is not None:
+            previous[0].cancel()
+        self.on_busy(self.busy)
+
+    def poll(self) -> None:
+        for kind, (future, apply, fail) in list(self._pending.items()):
+            # An earlier apply in this pass may already have superseded this job.
+            if not future.done() or self._pending.get(kind, (None,))[0] is not future:
+                continue
+            del self._pending[kind]
+            try:
+                result = future.result()
+            except Exception as exc:  # noqa: BLE001
+                if fail is None:
+                    raise
+                fail(exc)
+            else:
+                apply(result)
+        self.on_busy(self.busy)
+
+
+class LazyPanel:
+    # Dialogs and side panels are built on first use, so the first plot never waits for secondary UI.
+    def __init__(self, build: Callable[[], Any]) -> None:
+        self._build = build
+        self.widget: Any = None
+
+    @property
+    def built(self) -> bool:
+        return self.widget is not None
+
+    def get(self) -> Any:
+        if self.widget is None:
+            self.widget = self._build()
+        return self.widget
+
+
+@dataclass
+class GuiSession:
+    # Handles to the live window and the widgets scripted interactions drive; see benchmarks/gui_latency.py.
+    # Widgets of a panel appear in `widgets` once the panel is built.
+    app: Any
+    window: Any
+    fig: Any
+    ax: Any
+    canvas: Any
+    backend: PlotBackend
+    widgets: dict[str, Any] = field(default_factory=dict)
+    draw_times: list[float] = field(default_factory=list)
+    jobs: BackgroundJobs | None = None
+    panels: dict[str, LazyPanel] = field(default_factory=dict)
+    first_plot_seconds: float | None = None
+    cursor: Any = None
+    pipes: list[Any] = field(default_factory=list)
+    quit_connected: bool = False
+
+    def stop_jobs(self) -> None:
+        if self.jobs is not None:
+            self.jobs.executor.shutdown(wait=False, cancel_futures=True)
+
+    def close(self) -> None:
+        # Scripted sessions close explicitly; Qt objects left to interpreter teardown can crash PySide.
+        # The executor goes last: a draw still pending when the window closes can submit cursor work.
+        for pipe in self.pipes:
+            pipe.stop()
+        self.window.close()
+        self.window.deleteLater()
+        self.app.processEvents()
+        # The application outlives the session, so its quit signal must not keep this session alive.
+        if self.quit_connected:
+            self.app.aboutToQuit.disconnect(self.stop_jobs)
+            self.quit_connected = False
+        self.stop_jobs()
+
 
 def launch_gui(
     datasets: list[Dataset],
@@ -22,16 +131,53 @@ def launch_gui(
     world: list[float] | None,
     autoscale: bool,
     legend_labels: list[str] | None,
+    density_threshold: int | None = None,
+    pipes: list[Path] | None = None,
+    ring_size: int | None = None,
 ) -> None:
-    matplotlib.use("QtAgg")
+    session = build_gui(
+        datasets, title, xlabel, ylabel, world, autoscale, legend_labels, density_threshold, pipes, ring_size
+    )
+    session.window.show()
+    session.app.exec()
+
+
+def build_gui(
+    datasets: list[Dataset],
+    title: str | None,
+    xlabel: str | None,
+    ylabel: str | None,
+    world: list[float] | None,
+    autoscale: bool,
+    legend_labels: list[str] | None,
+    density_threshold: int | None = None,
+    pipes: list[Path] | None = None,
+    ring_size: int | None = None,
+) -> GuiSession:
+    started = time.perf_counter()
     from PySide6 import QtCore, QtWidgets
     from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
     from matplotlib.backends.backend_qtagg import NavigationToolbar2QT as NavigationToolbar
-    import matplotlib.pyplot as plt
+    from matplotlib.figure import Figure
+
+    from .cursor import HoverCursor
+    from .stream import LiveTable, PipeFollower
+    from .gui_models import (
+        DatasetListModel,
+        DatasetNamesModel,
+        ExtremaDelegate,
+        ExtremaModel,
+        StatsModel,
+        dataset_filter_model,
+        filtered_rows,
+        use_dataset_names,
+    )
 
     app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv)
 
-    fig, ax = plt.subplots()
+    # The figure is embedded directly rather than through pyplot, so several sessions can live in one process.
+    fig = Figure()
+    ax = fig.add_subplot()
     canvas = FigureCanvas(fig)
     toolbar = NavigationToolbar(canvas, None)
 
@@ -43,6 +189,7 @@ def launch_gui(
             ylabel=ylabel,
             world=world,
             autoscale=autoscale,
+            density_threshold=density_threshold,
         ),
         legend_labels=legend_labels,
     )
@@ -59,8 +206,6 @@ def launch_gui(
     layout.addWidget(canvas)
     window.setCentralWidget(central)
 
-    controls = QtWidgets.QWidget()
-    form = QtWidgets.QFormLayout(controls)
 
     state.title_size = ax.title.get_fontsize()
     state.xlabel_size = ax.xaxis.label.get_size()
@@ -68,529 +213,818 @@ def launch_gui(
     state.xtick_size = ax.xaxis.get_ticklabels()[0].get_size() if ax.xaxis.get_ticklabels() else 10
     state.ytick_size = ax.yaxis.get_ticklabels()[0].get_size() if ax.yaxis.get_ticklabels() else 10
 
+    view_timer = QtCore.QTimer(window)
+    view_timer.setSingleShot(True)
+    view_timer.setInterval(150)
+
+    def follow_view() -> None:
+        # Out-of-core sets re-read only the byte range under the new x-window, and sorted sets clipped to an
+        # older window are re-sliced to this one; either way the user's view is kept.
+        xlim = ax.get_xlim()
+        ylim = ax.get_ylim()
+        xmin, xmax = min(xlim), max(xlim)
+        refined = backend.refine_envelopes(xmin, xmax)
+        if refined or not backend.clip_covers(xmin, xmax):
+            backend.render(ax, (xmin, xmax))
+            ax.set_xlim(xlim)
+            ax.set_ylim(ylim)
+            watch_view()
+            canvas.draw_idle()
+
+    view_timer.timeout.connect(follow_view)
+
+    def watch_view() -> None:
+        if backend.clipped_to is not None or any(ds.envelope is not None for ds in datasets):
+            ax.callbacks.connect("xlim_changed", lambda _ax: view_timer.start())
+
+    refresh_label = QtWidgets.QLabel("")
+    window.statusBar().addPermanentWidget(refresh_label)
+
+    cursor_label = QtWidgets.QLabel("")
+    window.statusBar().addWidget(cursor_label)
+    hover = HoverCursor(canvas, ax, backend.visible_datasets, cursor_label.setText)
+
+    busy_bar = QtWidgets.QProgressBar()
+    busy_bar.setRange(0, 0)
+    busy_bar.setMaximumWidth(120)
+    busy_bar.setVisible(False)
+    window.statusBar().addPermanentWidget(busy_bar)
+
+    # Transforms, extrema searches and plugin preparation run here; matplotlib drawing stays on the UI thread.
+    executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="pygrace-gui")
+    job_timer = QtCore.QTimer(window)
+    job_timer.setInterval(15)
+
+    def set_busy(busy: bool) -> None:
+        busy_bar.setVisible(busy)
+        if busy and not job_timer.isActive():
+            job_timer.start()
+        elif not busy:
+            job_timer.stop()
+
+    jobs = BackgroundJobs(executor, set_busy)
+    job_timer.timeout.connect(jobs.poll)
+
+    session = GuiSession(app=app, window=window, fig=fig, ax=ax, canvas=canvas, backend=backend, jobs=jobs)
+    app.aboutToQuit.connect(session.stop_jobs)
+    session.quit_connected = True
+    widgets = session.widgets
+    widgets["refresh_label"] = refresh_label
+    widgets["cursor_label"] = cursor_label
+    session.cursor = hover
+
+    refresh_started: list[float] = []
+    render_seconds: list[float] = [0.0]
+    draw_times = session.draw_times
+
+    def report_refresh_time(_event) -> None:
+        # Measured from the start of refresh() until the deferred canvas draw has finished.
+        draw_times.append(time.perf_counter())
+        # Index newly shown or changed sets for the cursor readout before the mouse gets there.
+        if not jobs.pending("cursor"):
+            requests = hover.stale_requests()
+            if requests:
+                jobs.submit("cursor", lambda: HoverCursor.build_indexes(requests), hover.store)
+        # Likewise summarize them, so the next autoscale reads their stats instead of re-walking the artists.
+        if not jobs.pending("stats"):
+            stale = backend.stale_stats()
+            if stale:
+                jobs.submit("stats", lambda: PlotBackend.summarize(stale), stats_model.store)
+        if session.first_plot_seconds is None:
+            session.first_plot_seconds = draw_times[-1] - started
+            refresh_label.setText(f"First plot: {session.first_plot_seconds * 1000:.1f} ms")
+            # The plot is on screen; the controls dock fills in on the next event loop pass.
+            QtCore.QTimer.singleShot(0, controls_panel.get)
+        if not refresh_started:
+            return
+        total = time.perf_counter() - refresh_started.pop()
+        refresh_started.clear()
+        refresh_label.setText(f"Last refresh: {total * 1000:.1f} ms (render {render_seconds[0] * 1000:.1f} ms)")
+
+    canvas.mpl_connect("draw_event", report_refresh_time)
+
     def refresh() -> None:
+        start = time.perf_counter()
+        refresh_started.append(start)
         backend.render(ax)
+        render_seconds[0] = time.perf_counter() - start
+        watch_view()
         canvas.draw_idle()
 
-    axis_dialog = QtWidgets.QDialog(window)
-    axis_dialog.setWindowTitle("Axes")
-    axis_dialog.setModal(False)
-    axis_layout = QtWidgets.QFormLayout(axis_dialog)
-
-    title_edit = QtWidgets.QLineEdit(state.title or "")
-    xlabel_edit = QtWidgets.QLineEdit(state.xlabel or "")
-    ylabel_edit = QtWidgets.QLineEdit(state.ylabel or "")
-
-    def update_title(text: str) -> None:
-        state.title = text
-        refresh()
-
-    def update_xlabel(text: str) -> None:
-        state.xlabel = text
-        refresh()
-
-    def update_ylabel(text: str) -> None:
-        state.ylabel = text
-        refresh()
-
-    title_edit.textChanged.connect(update_title)
-    xlabel_edit.textChanged.connect(update_xlabel)
-    ylabel_edit.textChanged.connect(update_ylabel)
-
-    axis_layout.addRow("Title", title_edit)
-    axis_layout.addRow("X label", xlabel_edit)
-    axis_layout.addRow("Y label", ylabel_edit)
-
-    title_size_slider = QtWidgets.QSlider(QtCore.Qt.Orientation.Horizontal)
-    title_size_slider.setRange(8, 48)
-    title_size_slider.setValue(int(state.title_size or 12))
-    title_size_value = QtWidgets.QLabel(str(title_size_slider.value()))
-
-    def handle_title_size(value: int) -> None:
-        title_size_value.setText(str(value))
-        state.title_size = value
-        refresh()
-
-    title_size_slider.valueChanged.connect(handle_title_size)
-    title_size_row = QtWidgets.QWidget()
-    title_size_layout = QtWidgets.QHBoxLayout(title_size_row)
-    title_size_layout.setContentsMargins(0, 0, 0, 0)
-    title_size_layout.addWidget(title_size_slider)
-    title_size_layout.addWidget(title_size_value)
-    axis_layout.addRow("Title size", title_size_row)
-
-    link_label_sizes = QtWidgets.QCheckBox("Link label sizes")
-    link_label_sizes.setChecked(True)
-
-    def make_size_slider(value: int) -> QtWidgets.QSlider:
-        slider = QtWidgets.QSlider(QtCore.Qt.Orientation.Horizontal)
-        slider.setRange(6, 36)
-        slider.setValue(value)
-        slider.setSingleStep(1)
-        return slider
-
-    xlabel_slider = make_size_slider(int(state.xlabel_size or 10))
-    ylabel_slider = make_size_slider(int(state.ylabel_size or 10))
-    xlabel_value = QtWidgets.QLabel(str(xlabel_slider.value()))
-    ylabel_value = QtWidgets.QLabel(str(ylabel_slider.value()))
-
-    def set_label_sizes(x_size: int, y_size: int) -> None:
-        state.xlabel_size = x_size
-        state.ylabel_size = y_size
-        refresh()
-
-    def handle_xlabel_change(value: int) -> None:
-        xlabel_value.setText(str(value))
-        if link_label_sizes.isChecked():
-            ylabel_slider.blockSignals(True)
-            ylabel_slider.setValue(value)
-            ylabel_slider.blockSignals(False)
-            ylabel_value.setText(str(value))
-            set_label_sizes(value, value)
-        else:
-            set_label_sizes(value, ylabel_slider.value())
-
-    def handle_ylabel_change(value: int) -> None:
-        ylabel_value.setText(str(value))
-        if link_label_sizes.isChecked():
-            xlabel_slider.blockSignals(True)
-            xlabel_slider.setValue(value)
-            xlabel_slider.blockSignals(False)
-            xlabel_value.setText(str(value))
-            set_label_sizes(value, value)
-        else:
-            set_label_sizes(xlabel_slider.value(), value)
-
-    xlabel_slider.valueChanged.connect(handle_xlabel_change)
-    ylabel_slider.valueChanged.connect(handle_ylabel_change)
-
-    xlabel_row = QtWidgets.QWidget()
-    xlabel_row_layout = QtWidgets.QHBoxLayout(xlabel_row)
-    xlabel_row_layout.setContentsMargins(0, 0, 0, 0)
-    xlabel_row_layout.addWidget(xlabel_slider)
-    xlabel_row_layout.addWidget(xlabel_value)
-
-    ylabel_row = QtWidgets.QWidget()
-    ylabel_row_layout = QtWidgets.QHBoxLayout(ylabel_row)
-    ylabel_row_layout.setContentsMargins(0, 0, 0, 0)
-    ylabel_row_layout.addWidget(ylabel_slider)
-    ylabel_row_layout.addWidget(ylabel_value)
-
-    axis_layout.addRow(link_label_sizes)
-    axis_layout.addRow("X label size", xlabel_row)
-    axis_layout.addRow("Y label size", ylabel_row)
-
-    link_tick_sizes = QtWidgets.QCheckBox("Link tick sizes")
-    link_tick_sizes.setChecked(True)
-
-    xtick_slider = make_size_slider(int(state.xtick_size or 10))
-    ytick_slider = make_size_slider(int(state.ytick_size or 10))
-    xtick_value = QtWidgets.QLabel(str(xtick_slider.value()))
-    ytick_value = QtWidgets.QLabel(str(ytick_slider.value()))
-
-    def set_tick_sizes(x_size: int, y_size: int) -> None:
-        state.xtick_size = x_size
-        state.ytick_size = y_size
-        refresh()
-
-    def handle_xtick_change(value: int) -> None:
-        xtick_value.setText(str(value))
-        if link_tick_sizes.isChecked():
-            ytick_slider.blockSignals(True)
-            ytick_slider.setValue(value)
-            ytick_slider.blockSignals(False)
-            ytick_value.setText(str(value))
-            set_tick_sizes(value, value)
-        else:
-            set_tick_sizes(value, ytick_slider.value())
-
-    def handle_ytick_change(value: int) -> None:
-        ytick_value.setText(str(value))
-        if link_tick_sizes.isChecked():
-            xtick_slider.blockSignals(True)
-            xtick_slider.setValue(value)
-            xtick_slider.blockSignals(False)
-            xtick_value.setText(str(value))
-            set_tick_sizes(value, value)
-        else:
-            set_tick_sizes(xtick_slider.value(), value)
-
-    xtick_slider.valueChanged.connect(handle_xtick_change)
-    ytick_slider.valueChanged.connect(handle_ytick_change)
-
-    xtick_row = QtWidgets.QWidget()
-    xtick_layout = QtWidgets.QHBoxLayout(xtick_row)
-    xtick_layout.setContentsMargins(0, 0, 0, 0)
-    xtick_layout.addWidget(xtick_slider)
-    xtick_layout.addWidget(xtick_value)
-
-    ytick_row = QtWidgets.QWidget()
-    ytick_layout = QtWidgets.QHBoxLayout(ytick_row)
-    ytick_layout.setContentsMargins(0, 0, 0, 0)
-    ytick_layout.addWidget(ytick_slider)
-    ytick_layout.addWidget(ytick_value)
-
-    axis_layout.addRow(link_tick_sizes)
-    axis_layout.addRow("X tick size", xtick_row)
-    axis_layout.addRow("Y tick size", ytick_row)
-
-    limits_group = QtWidgets.QGroupBox("Limits")
-    limits_layout = QtWidgets.QFormLayout(limits_group)
-    limits_enabled = QtWidgets.QCheckBox("Use limits")
-    limits_enabled.setChecked(state.world is not None)
-    x_min_spin = QtWidgets.QDoubleSpinBox()
-    x_max_spin = QtWidgets.QDoubleSpinBox()
-    y_min_spin = QtWidgets.QDoubleSpinBox()
-    y_max_spin = QtWidgets.QDoubleSpinBox()
-    for spin in (x_min_spin, x_max_spin, y_min_spin, y_max_spin):
-        spin.setRange(-1e12, 1e12)
-        spin.setDecimals(6)
-
-    if state.world:
-        x_min_spin.setValue(state.world[0])
-        x_max_spin.setValue(state.world[1])
-        y_min_spin.setValue(state.world[2])
-        y_max_spin.setValue(state.world[3])
-
-    def apply_limits() -> None:
-        if limits_enabled.isChecked():
-            state.world = [
-                x_min_spin.value(),
-                x_max_spin.value(),
-                y_min_spin.value(),
-                y_max_spin.value(),
-            ]
-            state.autoscale = False
-        else:
-            state.world = None
-            state.autoscale = True
-        refresh()
-
-    limits_enabled.stateChanged.connect(lambda _s: apply_limits())
-    for spin in (x_min_spin, x_max_spin, y_min_spin, y_max_spin):
-        spin.editingFinished.connect(apply_limits)
-
-    limits_layout.addRow(limits_enabled)
-    limits_layout.addRow("X min", x_min_spin)
-    limits_layout.addRow("X max", x_max_spin)
-    limits_layout.addRow("Y min", y_min_spin)
-    limits_layout.addRow("Y max", y_max_spin)
-    axis_layout.addRow(limits_group)
-
-    ticks_group = QtWidgets.QGroupBox("Ticks")
-    ticks_layout = QtWidgets.QFormLayout(ticks_group)
-    major_enabled = QtWidgets.QCheckBox("Use major tick spacing")
-    minor_enabled = QtWidgets.QCheckBox("Enable minor ticks")
-    major_enabled.setChecked(False)
-    minor_enabled.setChecked(False)
-
-    x_major_spin = QtWidgets.QDoubleSpinBox()
-    y_major_spin = QtWidgets.QDoubleSpinBox()
-    x_minor_spin = QtWidgets.QDoubleSpinBox()
-    y_minor_spin = QtWidgets.QDoubleSpinBox()
-    for spin in (x_major_spin, y_major_spin, x_minor_spin, y_minor_spin):
-        spin.setRange(0.0, 1e9)
-        spin.setDecimals(6)
-        spin.setSingleStep(0.1)
-
-    def apply_ticks() -> None:
-        if major_enabled.isChecked() and x_major_spin.value() > 0:
-            state.x_major_step = x_major_spin.value()
-        else:
-            state.x_major_step = None
-        if major_enabled.isChecked() and y_major_spin.value() > 0:
-            state.y_major_step = y_major_spin.value()
-        else:
-            state.y_major_step = None
-        state.minor_ticks = minor_enabled.isChecked()
-        if state.minor_ticks and x_minor_spin.value() > 0:
-            state.x_minor_step = x_minor_spin.value()
-        else:
-            state.x_minor_step = None
-        if state.minor_ticks and y_minor_spin.value() > 0:
-            state.y_minor_step = y_minor_spin.value()
-        else:
-            state.y_minor_step = None
-        refresh()
-
-    major_enabled.stateChanged.connect(lambda _s: apply_ticks())
-    minor_enabled.stateChanged.connect(lambda _s: apply_ticks())
-    for spin in (x_major_spin, y_major_spin, x_minor_spin, y_minor_spin):
-        spin.editingFinished.connect(apply_ticks)
-
-    ticks_layout.addRow(major_enabled)
-    ticks_layout.addRow("X major step", x_major_spin)
-    ticks_layout.addRow("Y major step", y_major_spin)
-    ticks_layout.addRow(minor_enabled)
-    ticks_layout.addRow("X minor step", x_minor_spin)
-    ticks_layout.addRow("Y minor step", y_minor_spin)
-    axis_layout.addRow(ticks_group)
-
-    dataset_list = QtWidgets.QListWidget()
-    for ds in datasets:
-        item = QtWidgets.QListWidgetItem(ds.name)
-        item.setFlags(item.flags() | QtCore.Qt.ItemFlag.ItemIsUserCheckable)
-        item.setCheckState(QtCore.Qt.CheckState.Checked)
-        dataset_list.addItem(item)
-
-    name_edit = QtWidgets.QLineEdit()
-
-    def update_selected_name() -> None:
-        row = dataset_list.currentRow()
-        if 0 <= row < len(datasets):
-            name_edit.setText(datasets[row].name)
-        else:
-            name_edit.setText("")
-
-    appearance_set = QtWidgets.QComboBox()
-    for ds in datasets:
-        appearance_set.addItem(ds.name)
-
-    extrema_box = QtWidgets.QGroupBox("Align Extrema")
-    extrema_layout = QtWidgets.QFormLayout(extrema_box)
-    extrema_selectors: list[tuple[Dataset, QtWidgets.QComboBox]] = []
-
-    def format_extrema_label(entry: tuple[str, int, float, float]) -> str:
-        kind, idx, xval, yval = entry
-        return f"{kind} @ i={idx}, x={xval:.4g}, y={yval:.4g}"
-
-    def rebuild_extrema_selectors() -> None:
-        for i in reversed(range(extrema_layout.rowCount())):
-            extrema_layout.removeRow(i)
-        extrema_selectors.clear()
-        for ds in datasets:
-            combo = QtWidgets.QComboBox()
-            extrema = backend.extrema_for_dataset(ds)
-            for entry in extrema:
-                combo.addItem(format_extrema_label(entry), entry)
-            extrema_layout.addRow(ds.name, combo)
-            extrema_selectors.append((ds, combo))
-
-    def apply_name_change(text: str) -> None:
-        row = dataset_list.currentRow()
-        if 0 <= row < len(datasets):
-            backend.rename_dataset(row, text)
-            item = dataset_list.item(row)
-            if item is not None:
-                item.setText(text)
-            if 0 <= row < appearance_set.count():
-                appearance_set.setItemText(row, text)
+    watch_view()
+
+    dataset_model = DatasetListModel(backend)
+    dataset_names = DatasetNamesModel()
+    dataset_names.setSourceModel(dataset_model)
+
+    def request_stats(wanted: list[Dataset]) -> None:
+        requests = backend.stale_stats(wanted)
+        jobs.submit("stats_table", lambda: PlotBackend.summarize(requests), stats_model.store)
+
+    stats_model = StatsModel(datasets, request_stats)
+    # Models that list the sets; each is synced after sets are added or their columns replaced in place.
+    set_models: list[Any] = [dataset_model, stats_model]
+
+    # Each -npipe pipe is read on its own thread; the rows it queued are appended here in one batch per tick,
+    # so a fast writer costs one re-render per PIPE_POLL_MS however many lines it sends.
+    live_tables = []
+    for path in pipes or []:
+        follower = PipeFollower(path)
+        session.pipes.append(follower)
+        live_tables.append((follower, LiveTable(follower.name, capacity=ring_size)))
+
+    reported_pipes: set[str] = set()
+
+    def drain_pipes() -> None:
+        changed = False
+        for follower, table in live_tables:
+            if follower.error is not None and follower.name not in reported_pipes:
+                # The reader thread has stopped; say so rather than leave the pipe's sets silently frozen.
+                reported_pipes.add(follower.name)
+                reason = follower.error.strerror or follower.error
+                window.statusBar().showMessage(f"Error: pipe {follower.name}: {reason}")
+            rows = follower.take()
+            if not rows:
+                continue
+            datasets.extend(table.append(rows, len(datasets)))
+            changed = True
+        if changed:
+            for model in set_models:
+                model.sync()
             refresh()
-            rebuild_extrema_selectors()
 
-    dataset_list.currentRowChanged.connect(lambda _idx: update_selected_name())
-    name_edit.textChanged.connect(apply_name_change)
+    pipe_timer = QtCore.QTimer(window)
+    pipe_timer.setInterval(PIPE_POLL_MS)
+    pipe_timer.timeout.connect(drain_pipes)
+    if live_tables:
+        for follower, _table in live_tables:
+            follower.start()
+        pipe_timer.start()
 
-    def toggle_dataset(item: QtWidgets.QListWidgetItem) -> None:
-        idx = dataset_list.row(item)
-        backend.set_dataset_visible(idx, item.checkState() == QtCore.Qt.CheckState.Checked)
-        refresh()
-
-    dataset_list.itemChanged.connect(toggle_dataset)
+    dock = QtWidgets.QDockWidget("Controls", window)
+    scroll = QtWidgets.QScrollArea()
+    scroll.setWidgetResizable(True)
+    dock.setWidget(scroll)
+    window.addDockWidget(QtCore.Qt.DockWidgetArea.RightDockWidgetArea, dock)
 
-    form.addRow("Datasets", dataset_list)
-    form.addRow("Set name", name_edit)
+    def build_axis_dialog() -> QtWidgets.QDialog:
+        axis_dialog = QtWidgets.QDialog(window)
+        axis_dialog.setWindowTitle("Axes")
+        axis_dialog.setModal(False)
+        axis_layout = QtWidgets.QFormLayout(axis_dialog)
 
-    appearance_box = QtWidgets.QGroupBox("Set Appearance")
-    appearance_layout = QtWidgets.QFormLayout(appearance_box)
+        title_edit = QtWidgets.QLineEdit(state.title or "")
+        xlabel_edit = QtWidgets.QLineEdit(state.xlabel or "")
+        ylabel_edit = QtWidgets.QLineEdit(state.ylabel or "")
 
-    line_width_spin = QtWidgets.QDoubleSpinBox()
-    line_width_spin.setRange(0.1, 10.0)
-    line_width_spin.setSingleStep(0.1)
+        def update_title(text: str) -> None:
+            state.title = text
+            refresh()
 
-    line_style_combo = QtWidgets.QComboBox()
-    line_style_combo.addItems(["-", "--", "-.", ":", "None"])
+        def update_xlabel(text: str) -> None:
+            state.xlabel = text
+            refresh()
 
-    line_color_edit = QtWidgets.QLineEdit()
-    line_color_button = QtWidgets.QPushButton("Pick")
+        def update_ylabel(text: str) -> None:
+            state.ylabel = text
+            refresh()
 
-    marker_combo = QtWidgets.QComboBox()
-    marker_combo.addItems(["o", "s", "^", "v", "D", "x", "+", ".", "None"])
+        title_edit.textChanged.connect(update_title)
+        xlabel_edit.textChanged.connect(update_xlabel)
+        ylabel_edit.textChanged.connect(update_ylabel)
 
-    marker_size_spin = QtWidgets.QDoubleSpinBox()
-    marker_size_spin.setRange(1.0, 20.0)
-    marker_size_spin.setSingleStep(0.5)
+        axis_layout.addRow("Title", title_edit)
+        axis_layout.addRow("X label", xlabel_edit)
+        axis_layout.addRow("Y label", ylabel_edit)
 
-    marker_face_edit = QtWidgets.QLineEdit()
-    marker_face_button = QtWidgets.QPushButton("Pick")
+        title_size_slider = QtWidgets.QSlider(QtCore.Qt.Orientation.Horizontal)
+        title_size_slider.setRange(8, 48)
+        title_size_slider.setValue(int(state.title_size or 12))
+        title_size_value = QtWidgets.QLabel(str(title_size_slider.value()))
 
-    marker_edge_edit = QtWidgets.QLineEdit()
-    marker_edge_button = QtWidgets.QPushButton("Pick")
+        def handle_title_size(value: int) -> None:
+            title_size_value.setText(str(value))
+            state.title_size = value
+            refresh()
 
-    marker_fill_check = QtWidgets.QCheckBox("Fill marker")
+        title_size_slider.valueChanged.connect(handle_title_size)
+        title_size_row = QtWidgets.QWidget()
+        title_size_layout = QtWidgets.QHBoxLayout(title_size_row)
+        title_size_layout.setContentsMargins(0, 0, 0, 0)
+        title_size_layout.addWidget(title_size_slider)
+        title_size_layout.addWidget(title_size_value)
+        axis_layout.addRow("Title size", title_size_row)
+
+        link_label_sizes = QtWidgets.QCheckBox("Link label sizes")
+        link_label_sizes.setChecked(True)
+
+        def make_size_slider(value: int) -> QtWidgets.QSlider:
+            slider = QtWidgets.QSlider(QtCore.Qt.Orientation.Horizontal)
+            slider.setRange(6, 36)
+            slider.setValue(value)
+            slider.setSingleStep(1)
+            return slider
+
+        xlabel_slider = make_size_slider(int(state.xlabel_size or 10))
+        ylabel_slider = make_size_slider(int(state.ylabel_size or 10))
+        xlabel_value = QtWidgets.QLabel(str(xlabel_slider.value()))
+        ylabel_value = QtWidgets.QLabel(str(ylabel_slider.value()))
+
+        def set_label_sizes(x_size: int, y_size: int) -> None:
+            state.xlabel_size = x_size
+            state.ylabel_size = y_size
+            refresh()
 
-    def current_appearance_index() -> int:
-        return appearance_set.currentIndex()
+        def handle_xlabel_change(value: int) -> None:
+            xlabel_value.setText(str(value))
+            if link_label_sizes.isChecked():
+                ylabel_slider.blockSignals(True)
+                ylabel_slider.setValue(value)
+                ylabel_slider.blockSignals(False)
+                ylabel_value.setText(str(value))
+                set_label_sizes(value, value)
+            else:
+                set_label_sizes(value, ylabel_slider.value())
+
+        def handle_ylabel_change(value: int) -> None:
+            ylabel_value.setText(str(value))
+            if link_label_sizes.isChecked():
+                xlabel_slider.blockSignals(True)
+                xlabel_slider.setValue(value)
+                xlabel_slider.blockSignals(False)
+                xlabel_value.setText(str(value))
+                set_label_sizes(value, value)
+            else:
+                set_label_sizes(xlabel_slider.value(), value)
+
+        xlabel_slider.valueChanged.connect(handle_xlabel_change)
+        ylabel_slider.valueChanged.connect(handle_ylabel_change)
+
+        xlabel_row = QtWidgets.QWidget()
+        xlabel_row_layout = QtWidgets.QHBoxLayout(xlabel_row)
+        xlabel_row_layout.setContentsMargins(0, 0, 0, 0)
+        xlabel_row_layout.addWidget(xlabel_slider)
+        xlabel_row_layout.addWidget(xlabel_value)
+
+        ylabel_row = QtWidgets.QWidget()
+        ylabel_row_layout = QtWidgets.QHBoxLayout(ylabel_row)
+        ylabel_row_layout.setContentsMargins(0, 0, 0, 0)
+        ylabel_row_layout.addWidget(ylabel_slider)
+        ylabel_row_layout.addWidget(ylabel_value)
+
+        axis_layout.addRow(link_label_sizes)
+        axis_layout.addRow("X label size", xlabel_row)
+        axis_layout.addRow("Y label size", ylabel_row)
+
+        link_tick_sizes = QtWidgets.QCheckBox("Link tick sizes")
+        link_tick_sizes.setChecked(True)
+
+        xtick_slider = make_size_slider(int(state.xtick_size or 10))
+        ytick_slider = make_size_slider(int(state.ytick_size or 10))
+        xtick_value = QtWidgets.QLabel(str(xtick_slider.value()))
+        ytick_value = QtWidgets.QLabel(str(ytick_slider.value()))
+
+        def set_tick_sizes(x_size: int, y_size: int) -> None:
+            state.xtick_size = x_size
+            state.ytick_size = y_size
+            refresh()
 
-    def apply_appearance_from_ui() -> None:
-        idx = current_appearance_index()
-        if not (0 <= idx < len(datasets)):
-            return
-        backend.set_dataset_appearance(
-            idx,
-            line_width=line_width_spin.value(),
-            line_style=line_style_combo.currentText(),
-            line_color=line_color_edit.text().strip(),
-            marker=marker_combo.currentText(),
-            marker_size=marker_size_spin.value(),
-            marker_face_color=marker_face_edit.text().strip(),
-            marker_edge_color=marker_edge_edit.text().strip(),
-            marker_fill=marker_fill_check.isChecked(),
-        )
-        refresh()
+        def handle_xtick_change(value: int) -> None:
+            xtick_value.setText(str(value))
+            if link_tick_sizes.isChecked():
+                ytick_slider.blockSignals(True)
+                ytick_slider.setValue(value)
+                ytick_slider.blockSignals(False)
+                ytick_value.setText(str(value))
+                set_tick_sizes(value, value)
+            else:
+                set_tick_sizes(value, ytick_slider.value())
+
+        def handle_ytick_change(value: int) -> None:
+            ytick_value.setText(str(value))
+            if link_tick_sizes.isChecked():
+                xtick_slider.blockSignals(True)
+                xtick_slider.setValue(value)
+                xtick_slider.blockSignals(False)
+                xtick_value.setText(str(value))
+                set_tick_sizes(value, value)
+            else:
+                set_tick_sizes(xtick_slider.value(), value)
+
+        xtick_slider.valueChanged.connect(handle_xtick_change)
+        ytick_slider.valueChanged.connect(handle_ytick_change)
+
+        xtick_row = QtWidgets.QWidget()
+        xtick_layout = QtWidgets.QHBoxLayout(xtick_row)
+        xtick_layout.setContentsMargins(0, 0, 0, 0)
+        xtick_layout.addWidget(xtick_slider)
+        xtick_layout.addWidget(xtick_value)
+
+        ytick_row = QtWidgets.QWidget()
+        ytick_layout = QtWidgets.QHBoxLayout(ytick_row)
+        ytick_layout.setContentsMargins(0, 0, 0, 0)
+        ytick_layout.addWidget(ytick_slider)
+        ytick_layout.addWidget(ytick_value)
+
+        axis_layout.addRow(link_tick_sizes)
+        axis_layout.addRow("X tick size", xtick_row)
+        axis_layout.addRow("Y tick size", ytick_row)
+
+        limits_group = QtWidgets.QGroupBox("Limits")
+        limits_layout = QtWidgets.QFormLayout(limits_group)
+        limits_enabled = QtWidgets.QCheckBox("Use limits")
+        limits_enabled.setChecked(state.world is not None)
+        x_min_spin = QtWidgets.QDoubleSpinBox()
+        x_max_spin = QtWidgets.QDoubleSpinBox()
+        y_min_spin = QtWidgets.QDoubleSpinBox()
+        y_max_spin = QtWidgets.QDoubleSpinBox()
+        for spin in (x_min_spin, x_max_spin, y_min_spin, y_max_spin):
+            spin.setRange(-1e12, 1e12)
+            spin.setDecimals(6)
+
+        if state.world:
+            x_min_spin.setValue(state.world[0])
+            x_max_spin.setValue(state.world[1])
+            y_min_spin.setValue(state.world[2])
+            y_max_spin.setValue(state.world[3])
+
+        def apply_limits() -> None:
+            if limits_enabled.isChecked():
+                state.world = [
+                    x_min_spin.value(),
+                    x_max_spin.value(),
+                    y_min_spin.value(),
+                    y_max_spin.value(),
+                ]
+                state.autoscale = False
+            else:
+                state.world = None
+                state.autoscale = True
+            refresh()
 
-    def load_appearance_into_ui() -> None:
-        idx = current_appearance_index()
-        if not (0 <= idx < len(datasets)):
-            return
-        ds = datasets[idx]
-        line_width_spin.setValue(ds.line_width)
-        line_style_combo.setCurrentText(ds.line_style)
-        line_color_edit.setText(ds.line_color)
-        marker_combo.setCurrentText(ds.marker)
-        marker_size_spin.setValue(ds.marker_size)
-        marker_face_edit.setText(ds.marker_face_color)
-        marker_edge_edit.setText(ds.marker_edge_color)
-        marker_fill_check.setChecked(ds.marker_fill)
-
-    def pick_color(target: QtWidgets.QLineEdit) -> None:
-        color = QtWidgets.QColorDialog.getColor(parent=window)
-        if color.isValid():
-            target.setText(color.name())
-            apply_appearance_from_ui()
-
-    line_color_button.clicked.connect(lambda: pick_color(line_color_edit))
-    marker_face_button.clicked.connect(lambda: pick_color(marker_face_edit))
-    marker_edge_button.clicked.connect(lambda: pick_color(marker_edge_edit))
-
-    appearance_set.currentIndexChanged.connect(lambda _idx: load_appearance_into_ui())
-    line_width_spin.valueChanged.connect(lambda _v: apply_appearance_from_ui())
-    line_style_combo.currentIndexChanged.connect(lambda _i: apply_appearance_from_ui())
-    line_color_edit.editingFinished.connect(apply_appearance_from_ui)
-    marker_combo.currentIndexChanged.connect(lambda _i: apply_appearance_from_ui())
-    marker_size_spin.valueChanged.connect(lambda _v: apply_appearance_from_ui())
-    marker_face_edit.editingFinished.connect(apply_appearance_from_ui)
-    marker_edge_edit.editingFinished.connect(apply_appearance_from_ui)
-    marker_fill_check.stateChanged.connect(lambda _s: apply_appearance_from_ui())
-
-    appearance_layout.addRow("Set", appearance_set)
-    appearance_layout.addRow("Line width", line_width_spin)
-    appearance_layout.addRow("Line style", line_style_combo)
-    line_color_row = QtWidgets.QWidget()
-    line_color_row_layout = QtWidgets.QHBoxLayout(line_color_row)
-    line_color_row_layout.setContentsMargins(0, 0, 0, 0)
-    line_color_row_layout.addWidget(line_color_edit)
-    line_color_row_layout.addWidget(line_color_button)
-    appearance_layout.addRow("Line color", line_color_row)
-    appearance_layout.addRow("Marker", marker_combo)
-    appearance_layout.addRow("Marker size", marker_size_spin)
-    marker_face_row = QtWidgets.QWidget()
-    marker_face_layout = QtWidgets.QHBoxLayout(marker_face_row)
-    marker_face_layout.setContentsMargins(0, 0, 0, 0)
-    marker_face_layout.addWidget(marker_face_edit)
-    marker_face_layout.addWidget(marker_face_button)
-    appearance_layout.addRow("Marker face", marker_face_row)
-    marker_edge_row = QtWidgets.QWidget()
-    marker_edge_layout = QtWidgets.QHBoxLayout(marker_edge_row)
-    marker_edge_layout.setContentsMargins(0, 0, 0, 0)
-    marker_edge_layout.addWidget(marker_edge_edit)
-    marker_edge_layout.addWidget(marker_edge_button)
-    appearance_layout.addRow("Marker edge", marker_edge_row)
-    appearance_layout.addRow(marker_fill_check)
-
-    appearance_dialog = QtWidgets.QDialog(window)
-    appearance_dialog.setWindowTitle("Set Appearance")
-    appearance_dialog.setModal(False)
-    appearance_layout_container = QtWidgets.QVBoxLayout(appearance_dialog)
-    appearance_layout_container.addWidget(appearance_box)
-    appearance_dialog.setLayout(appearance_layout_container)
-
-    rebuild_extrema_selectors()
-    load_appearance_into_ui()
-
-    def align_selected_extrema() -> None:
-        selections: list[tuple[Dataset, tuple[str, int, float, float]]] = []
-        for ds, combo in extrema_selectors:
-            data = combo.currentData()
-            if data is None:
-                continue
-            selections.append((ds, data))
-        if not selections:
-            return
-        backend.align_extrema(selections)
-        refresh()
+        limits_enabled.stateChanged.connect(lambda _s: apply_limits())
+        for spin in (x_min_spin, x_max_spin, y_min_spin, y_max_spin):
+            spin.editingFinished.connect(apply_limits)
+
+        limits_layout.addRow(limits_enabled)
+        limits_layout.addRow("X min", x_min_spin)
+        limits_layout.addRow("X max", x_max_spin)
+        limits_layout.addRow("Y min", y_min_spin)
+        limits_layout.addRow("Y max", y_max_spin)
+        axis_layout.addRow(limits_group)
+
+        ticks_group = QtWidgets.QGroupBox("Ticks")
+        ticks_layout = QtWidgets.QFormLayout(ticks_group)
+        major_enabled = QtWidgets.QCheckBox("Use major tick spacing")
+        minor_enabled = QtWidgets.QCheckBox("Enable minor ticks")
+        major_enabled.setChecked(False)
+        minor_enabled.setChecked(False)
+
+        x_major_spin = QtWidgets.QDoubleSpinBox()
+        y_major_spin = QtWidgets.QDoubleSpinBox()
+        x_minor_spin = QtWidgets.QDoubleSpinBox()
+        y_minor_spin = QtWidgets.QDoubleSpinBox()
+        for spin in (x_major_spin, y_major_spin, x_minor_spin, y_minor_spin):
+            spin.setRange(0.0, 1e9)
+            spin.setDecimals(6)
+            spin.setSingleStep(0.1)
+
+        def apply_ticks() -> None:
+            if major_enabled.isChecked() and x_major_spin.value() > 0:
+                state.x_major_step = x_major_spin.value()
+            else:
+                state.x_major_step = None
+            if major_enabled.isChecked() and y_major_spin.value() > 0:
+                state.y_major_step = y_major_spin.value()
+            else:
+                state.y_major_step = None
+            state.minor_ticks = minor_enabled.isChecked()
+            if state.minor_ticks and x_minor_spin.value() > 0:
+                state.x_minor_step = x_minor_spin.value()
+            else:
+                state.x_minor_step = None
+            if state.minor_ticks and y_minor_spin.value() > 0:
+                state.y_minor_step = y_minor_spin.value()
+            else:
+                state.y_minor_step = None
+            refresh()
 
-    align_button = QtWidgets.QPushButton("Align Selected")
-    align_button.clicked.connect(align_selected_extrema)
-    extrema_layout.addRow(align_button)
-    form.addRow(extrema_box)
+        major_enabled.stateChanged.connect(lambda _s: apply_ticks())
+        minor_enabled.stateChanged.connect(lambda _s: apply_ticks())
+        for spin in (x_major_spin, y_major_spin, x_minor_spin, y_minor_spin):
+            spin.editingFinished.connect(apply_ticks)
+
+        ticks_layout.addRow(major_enabled)
+        ticks_layout.addRow("X major step", x_major_spin)
+        ticks_layout.addRow("Y major step", y_major_spin)
+        ticks_layout.addRow(minor_enabled)
+        ticks_layout.addRow("X minor step", x_minor_spin)
+        ticks_layout.addRow("Y minor step", y_minor_spin)
+        axis_layout.addRow(ticks_group)
+
+        widgets.update(title_edit=title_edit, title_size_slider=title_size_slider, xtick_slider=xtick_slider)
+        return axis_dialog
+
+    def build_appearance_dialog() -> QtWidgets.QDialog:
+        appearance_set = QtWidgets.QComboBox()
+        use_dataset_names(appearance_set, dataset_names)
+
+        appearance_box = QtWidgets.QGroupBox("Set Appearance")
+        appearance_layout = QtWidgets.QFormLayout(appearance_box)
+
+        line_width_spin = QtWidgets.QDoubleSpinBox()
+        line_width_spin.setRange(0.1, 10.0)
+        line_width_spin.setSingleStep(0.1)
+
+        line_style_combo = QtWidgets.QComboBox()
+        line_style_combo.addItems(["-", "--", "-.", ":", "None"])
+
+        line_color_edit = QtWidgets.QLineEdit()
+        line_color_button = QtWidgets.QPushButton("Pick")
+
+        marker_combo = QtWidgets.QComboBox()
+        marker_combo.addItems(["o", "s", "^", "v", "D", "x", "+", ".", "None"])
+
+        marker_size_spin = QtWidgets.QDoubleSpinBox()
+        marker_size_spin.setRange(1.0, 20.0)
+        marker_size_spin.setSingleStep(0.5)
+
+        marker_face_edit = QtWidgets.QLineEdit()
+        marker_face_button = QtWidgets.QPushButton("Pick")
+
+        marker_edge_edit = QtWidgets.QLineEdit()
+        marker_edge_button = QtWidgets.QPushButton("Pick")
+
+        marker_fill_check = QtWidgets.QCheckBox("Fill marker")
+
+        def current_appearance_index() -> int:
+            return appearance_set.currentIndex()
+
+        def apply_appearance_from_ui() -> None:
+            idx = current_appearance_index()
+            if not (0 <= idx < len(datasets)):
+                return
+            backend.set_dataset_appearance(
+                idx,
+                line_width=line_width_spin.value(),
+                line_style=line_style_combo.currentText(),
+                line_color=line_color_edit.text().strip(),
+                marker=marker_combo.currentText(),
+                marker_size=marker_size_spin.value(),
+                marker_face_color=marker_face_edit.text().strip(),
+                marker_edge_color=marker_edge_edit.text().strip(),
+                marker_fill=marker_fill_check.isChecked(),
+            )
+            refresh()
 
-    transform_edit = QtWidgets.QLineEdit()
-    transform_edit.setPlaceholderText("e.g. y1 = y0 + 2, x2 = x0 * 0.5")
-    transform_status = QtWidgets.QLabel("")
+        def load_appearance_into_ui() -> None:
+            idx = current_appearance_index()
+            if not (0 <= idx < len(datasets)):
+                return
+            ds = datasets[idx]
+            # Showing a set's values must not write them back and re-render every set once per editor.
+            editors = (line_width_spin, line_style_combo, marker_combo, marker_size_spin, marker_fill_check)
+            for editor in editors:
+                editor.blockSignals(True)
+            line_width_spin.setValue(ds.line_width)
+            line_style_combo.setCurrentText(ds.line_style)
+            line_color_edit.setText(ds.line_color)
+            marker_combo.setCurrentText(ds.marker)
+            marker_size_spin.setValue(ds.marker_size)
+            marker_face_edit.setText(ds.marker_face_color)
+            marker_edge_edit.setText(ds.marker_edge_color)
+            marker_fill_check.setChecked(ds.marker_fill)
+            for editor in editors:
+                editor.blockSignals(False)
+
+        def pick_color(target: QtWidgets.QLineEdit) -> None:
+            color = QtWidgets.QColorDialog.getColor(parent=window)
+            if color.isValid():
+                target.setText(color.name())
+                apply_appearance_from_ui()
+
+        line_color_button.clicked.connect(lambda: pick_color(line_color_edit))
+        marker_face_button.clicked.connect(lambda: pick_color(marker_face_edit))
+        marker_edge_button.clicked.connect(lambda: pick_color(marker_edge_edit))
+
+        appearance_set.currentIndexChanged.connect(lambda _idx: load_appearance_into_ui())
+        line_width_spin.valueChanged.connect(lambda _v: apply_appearance_from_ui())
+        line_style_combo.currentIndexChanged.connect(lambda _i: apply_appearance_from_ui())
+        line_color_edit.editingFinished.connect(apply_appearance_from_ui)
+        marker_combo.currentIndexChanged.connect(lambda _i: apply_appearance_from_ui())
+        marker_size_spin.valueChanged.connect(lambda _v: apply_appearance_from_ui())
+        marker_face_edit.editingFinished.connect(apply_appearance_from_ui)
+        marker_edge_edit.editingFinished.connect(apply_appearance_from_ui)
+        marker_fill_check.stateChanged.connect(lambda _s: apply_appearance_from_ui())
+
+        appearance_layout.addRow("Set", appearance_set)
+        appearance_layout.addRow("Line width", line_width_spin)
+        appearance_layout.addRow("Line style", line_style_combo)
+        line_color_row = QtWidgets.QWidget()
+        line_color_row_layout = QtWidgets.QHBoxLayout(line_color_row)
+        line_color_row_layout.setContentsMargins(0, 0, 0, 0)
+        line_color_row_layout.addWidget(line_color_edit)
+        line_color_row_layout.addWidget(line_color_button)
+        appearance_layout.addRow("Line color", line_color_row)
+        appearance_layout.addRow("Marker", marker_combo)
+        appearance_layout.addRow("Marker size", marker_size_spin)
+        marker_face_row = QtWidgets.QWidget()
+        marker_face_layout = QtWidgets.QHBoxLayout(marker_face_row)
+        marker_face_layout.setContentsMargins(0, 0, 0, 0)
+        marker_face_layout.addWidget(marker_face_edit)
+        marker_face_layout.addWidget(marker_face_button)
+        appearance_layout.addRow("Marker face", marker_face_row)
+        marker_edge_row = QtWidgets.QWidget()
+        marker_edge_layout = QtWidgets.QHBoxLayout(marker_edge_row)
+        marker_edge_layout.setContentsMargins(0, 0, 0, 0)
+        marker_edge_layout.addWidget(marker_edge_edit)
+        marker_edge_layout.addWidget(marker_edge_button)
+        appearance_layout.addRow("Marker edge", marker_edge_row)
+        appearance_layout.addRow(marker_fill_check)
+
+        appearance_dialog = QtWidgets.QDialog(window)
+        appearance_dialog.setWindowTitle("Set Appearance")
+        appearance_dialog.setModal(False)
+        appearance_layout_container = QtWidgets.QVBoxLayout(appearance_dialog)
+        appearance_layout_container.addWidget(appearance_box)
+        appearance_dialog.setLayout(appearance_layout_container)
+
+        load_appearance_into_ui()
+        widgets["appearance_set"] = appearance_set
+        return appearance_dialog
+
+    def build_stats_dialog() -> QtWidgets.QDialog:
+        stats_dialog = QtWidgets.QDialog(window)
+        stats_dialog.setWindowTitle("Set Statistics")
+        stats_dialog.setModal(False)
+        stats_layout = QtWidgets.QVBoxLayout(stats_dialog)
+        stats_view = QtWidgets.QTableView()
+        stats_view.setModel(stats_model)
+        stats_view.verticalHeader().setVisible(False)
+        stats_view.horizontalHeader().setStretchLastSection(True)
+        stats_layout.addWidget(stats_view)
+        stats_dialog.resize(720, 360)
+        widgets["stats_view"] = stats_view
+        return stats_dialog
+
+    def build_controls() -> QtWidgets.QWidget:
+        controls = QtWidgets.QWidget()
+        form = QtWidgets.QFormLayout(controls)
+
+        dataset_proxy = dataset_filter_model(dataset_model)
+        dataset_filter = QtWidgets.QLineEdit()
+        dataset_filter.setPlaceholderText("Filter sets by name")
+        dataset_filter.textChanged.connect(dataset_proxy.setFilterFixedString)
+
+        dataset_list = QtWidgets.QListView()
+        dataset_list.setUniformItemSizes(True)
+        dataset_list.setModel(dataset_proxy)
+
+        check_all_button = QtWidgets.QPushButton("Check all")
+        uncheck_all_button = QtWidgets.QPushButton("Uncheck all")
+        check_all_button.clicked.connect(lambda: dataset_model.set_visible(filtered_rows(dataset_proxy), True))
+        uncheck_all_button.clicked.connect(lambda: dataset_model.set_visible(filtered_rows(dataset_proxy), False))
+        dataset_buttons = QtWidgets.QWidget()
+        dataset_buttons_layout = QtWidgets.QHBoxLayout(dataset_buttons)
+        dataset_buttons_layout.setContentsMargins(0, 0, 0, 0)
+        dataset_buttons_layout.addWidget(check_all_button)
+        dataset_buttons_layout.addWidget(uncheck_all_button)
+
+        name_edit = QtWidgets.QLineEdit()
+
+        def current_dataset_row() -> int:
+            return dataset_proxy.mapToSource(dataset_list.currentIndex()).row()
+
+        def update_selected_name() -> None:
+            row = current_dataset_row()
+            if 0 <= row < len(datasets):
+                name_edit.setText(datasets[row].name)
+            else:
+                name_edit.setText("")
+
+        extrema_box = QtWidgets.QGroupBox("Align Extrema")
+        extrema_layout = QtWidgets.QVBoxLayout(extrema_box)
+
+        def find_extrema(requests: list[tuple[Dataset, int, Any, Any]]) -> list[tuple[Dataset, int, list]]:
+            # Works on the columns captured with each request, never on the live datasets.
+            return [
+                (ds, version, PlotBackend.dataset_extrema(Dataset(name=ds.name, x=x, y=y)))
+                for ds, version, x, y in requests
+            ]
 
-    def apply_transform() -> None:
-        text = transform_edit.text().strip()
-        if not text:
-            return
-        try:
-            target_index = backend.apply_transform(text)
-            if target_index >= dataset_list.count():
-                target = datasets[target_index]
-                item = QtWidgets.QListWidgetItem(target.name)
-                item.setFlags(item.flags() | QtCore.Qt.ItemFlag.ItemIsUserCheckable)
-                item.setCheckState(QtCore.Qt.CheckState.Checked)
-                dataset_list.addItem(item)
-                appearance_set.addItem(target.name)
-            refresh()
-            rebuild_extrema_selectors()
-            transform_status.setText("Applied.")
-        except Exception as exc:  # noqa: BLE001
-            transform_status.setText(f"Error: {exc}")
-
-    transform_button = QtWidgets.QPushButton("Apply Transform")
-    transform_button.clicked.connect(apply_transform)
-    form.addRow("Transform", transform_edit)
-    form.addRow(transform_button)
-    form.addRow(transform_status)
-
-    export_button = QtWidgets.QPushButton("Export PNG")
-
-    def export_png() -> None:
-        path, _ = QtWidgets.QFileDialog.getSaveFileName(
-            window, "Export PNG", "plot.png", "PNG Files (*.png)"
+        def request_extrema(requests: list[tuple[Dataset, int, Any, Any]]) -> None:
+            jobs.submit("extrema", lambda: find_extrema(requests), extrema_model.store)
+
+        extrema_model = ExtremaModel(datasets, request_extrema)
+        set_models.append(extrema_model)
+        extrema_view = QtWidgets.QTableView()
+        extrema_view.setModel(extrema_model)
+        extrema_view.setItemDelegateForColumn(1, ExtremaDelegate(extrema_view))
+        extrema_view.verticalHeader().setVisible(False)
+        extrema_view.horizontalHeader().setStretchLastSection(True)
+        extrema_view.setEditTriggers(
+            QtWidgets.QAbstractItemView.EditTrigger.CurrentChanged
+            | QtWidgets.QAbstractItemView.EditTrigger.SelectedClicked
         )
-        if path:
-            fig.tight_layout()
-            fig.savefig(path, dpi=150)
-
-    export_button.clicked.connect(export_png)
-    form.addRow(export_button)
+        extrema_layout.addWidget(extrema_view)
+
+        def apply_name_change(text: str) -> None:
+            row = current_dataset_row()
+            if 0 <= row < len(datasets):
+                backend.rename_dataset(row, text)
+                dataset_model.rename(row)
+                extrema_model.rename(row)
+                stats_model.rename(row)
+                refresh()
+
+        dataset_list.selectionModel().currentChanged.connect(lambda _new, _old: update_selected_name())
+        name_edit.textChanged.connect(apply_name_change)
+        dataset_model.visibilityChanged.connect(refresh)
+
+        form.addRow("Datasets", dataset_filter)
+        form.addRow(dataset_list)
+        form.addRow(dataset_buttons)
+        form.addRow("Set name", name_edit)
+
+        def align_selected_extrema() -> None:
+            # Sets never scrolled into view have no extrema yet; find them first, then align every set.
+            requests = extrema_model.stale_requests()
+
+            def align(found: list[tuple[Dataset, int, list]]) -> None:
+                extrema_model.store(found)
+                selections = []
+                for ds in datasets:
+                    entry = extrema_model.selection(ds)
+                    if entry is not None:
+                        selections.append((ds, entry))
+                if selections:
+                    try:
+                        backend.align_extrema(selections)
+                    except ValueError as exc:
+                        window.statusBar().showMessage(f"Error: {exc}")
+                        return
+                    stats_model.sync()
+                    refresh()
+
+            jobs.submit("align", lambda: find_extrema(requests), align)
+
+        align_button = QtWidgets.QPushButton("Align Selected")
+        align_button.clicked.connect(align_selected_extrema)
+        extrema_layout.addWidget(align_button)
+        form.addRow(extrema_box)
+
+        transform_edit = QtWidgets.QLineEdit()
+        transform_edit.setPlaceholderText("e.g. y1 = y0 + 2, x2 = x0 * 0.5")
+        transform_status = QtWidgets.QLabel("")
+
+        def apply_transform() -> None:
+            text = transform_edit.text().strip()
+            if not text:
+                return
+
+            def commit(result) -> None:
+                try:
+                    backend.commit_transform(result)
+                except ValueError as exc:
+                    transform_status.setText(f"Error: {exc}")
+                    return
+                for model in set_models:
+                    model.sync()
+                refresh()
+                transform_status.setText("Applied.")
+
+            transform_status.setText("Running...")
+            jobs.submit(
+                "transform",
+                lambda: backend.evaluate_transform(text),
+                commit,
+                lambda exc: transform_status.setText(f"Error: {exc}"),
+            )
+
+        transform_button = QtWidgets.QPushButton("Apply Transform")
+        transform_button.clicked.connect(apply_transform)
+        form.addRow("Transform", transform_edit)
+        form.addRow(transform_button)
+        form.addRow(transform_status)
+
+        from .transforms import OPERATION_LIST
+
+        operation_box = QtWidgets.QGroupBox("Operations")
+        operation_layout = QtWidgets.QFormLayout(operation_box)
+        operation_combo = QtWidgets.QComboBox()
+        for operation in OPERATION_LIST:
+            operation_combo.addItem(operation.name, operation.op_id)
+        operation_edit = QtWidgets.QLineEdit()
+        operation_status = QtWidgets.QLabel("")
+
+        def update_operation_parameter() -> None:
+            operation = OPERATION_LIST[operation_combo.currentIndex()]
+            operation_edit.setEnabled(operation.parameter is not None)
+            operation_edit.setText("" if operation.parameter is None else str(operation.default))
+            operation_edit.setPlaceholderText(" / ".join(operation.choices) or (operation.parameter or ""))
+
+        def apply_operation() -> None:
+            # Works on the selected set and adds the result as a new set.
+            row = current_dataset_row()
+            if not 0 <= row < len(datasets):
+                operation_status.setText("Select a set first.")
+                return
+            operation = OPERATION_LIST[operation_combo.currentIndex()]
+            try:
+                params = {}
+                if operation.parameter is not None:
+                    params[operation.parameter] = operation.coerce(operation_edit.text().strip())
+            except ValueError as exc:
+                operation_status.setText(f"Error: {exc}")
+                return
+
+            def commit(result) -> None:
+                try:
+                    backend.commit_operation(result)
+                except ValueError as exc:
+                    operation_status.setText(f"Error: {exc}")
+                    return
+                for model in set_models:
+                    model.sync()
+                refresh()
+                operation_status.setText("Applied.")
+
+            operation_status.setText("Running...")
+            jobs.submit(
+                "operation",
+                lambda: backend.evaluate_operation(row, operation.op_id, **params),
+                commit,
+                lambda exc: operation_status.setText(f"Error: {exc}"),
+            )
+
+        operation_combo.currentIndexChanged.connect(lambda _index: update_operation_parameter())
+        update_operation_parameter()
+        operation_button = QtWidgets.QPushButton("Apply to Selected Set")
+        operation_button.clicked.connect(apply_operation)
+        operation_layout.addRow("Operation", operation_combo)
+        operation_layout.addRow("Parameter", operation_edit)
+        operation_layout.addRow(operation_button)
+        operation_layout.addRow(operation_status)
+        form.addRow(operation_box)
+
+        export_button = QtWidgets.QPushButton("Export PNG")
+
+        def export_png() -> None:
+            path, _ = QtWidgets.QFileDialog.getSaveFileName(
+                window, "Export PNG", "plot.png", "PNG Files (*.png)"
+            )
+            if path:
+                fig.tight_layout()
+                fig.savefig(path, dpi=150)
+
+        export_button.clicked.connect(export_png)
+        form.addRow(export_button)
+
+        scroll.setWidget(controls)
+        widgets.update(
+            dataset_filter=dataset_filter,
+            dataset_list=dataset_list,
+            check_all_button=check_all_button,
+            uncheck_all_button=uncheck_all_button,
+            name_edit=name_edit,
+            extrema_view=extrema_view,
+            align_button=align_button,
+            transform_edit=transform_edit,
+            transform_button=transform_button,
+            transform_status=transform_status,
+            operation_combo=operation_combo,
+            operation_edit=operation_edit,
+            operation_button=operation_button,
+            operation_status=operation_status,
+        )
+        return controls
 
-    dock = QtWidgets.QDockWidget("Controls", window)
-    scroll = QtWidgets.QScrollArea()
-    scroll.setWidgetResizable(True)
-    scroll.setWidget(controls)
-    dock.setWidget(scroll)
-    window.addDockWidget(QtCore.Qt.DockWidgetArea.RightDockWidgetArea, dock)
+    controls_panel = LazyPanel(build_controls)
+    axis_panel = LazyPanel(build_axis_dialog)
+    appearance_panel = LazyPanel(build_appearance_dialog)
+    stats_panel = LazyPanel(build_stats_dialog)
+    session.panels.update(controls=controls_panel, axes=axis_panel, appearance=appearance_panel, stats=stats_panel)
+    widgets["dataset_model"] = dataset_model
 
     menu = window.menuBar()
     menu.setNativeMenuBar(False)
     set_menu = menu.addMenu("Set")
     appearance_action = set_menu.addAction("Appearance...")
+    stats_action = set_menu.addAction("Statistics...")
     axis_menu = menu.addMenu("Axis")
     axis_action = axis_menu.addAction("Axes...")
     plugins_menu = menu.addMenu("Plugins")
-
-    def show_appearance_dialog() -> None:
-        appearance_dialog.show()
-        appearance_dialog.raise_()
-        appearance_dialog.activateWindow()
-
-    def show_axis_dialog() -> None:
-        axis_dialog.show()
-        axis_dialog.raise_()
-        axis_dialog.activateWindow()
+    view_menu = menu.addMenu("View")
+    cursor_action = view_menu.addAction("Cursor readout")
+    cursor_action.setCheckable(True)
+    cursor_action.setChecked(True)
+    cursor_action.toggled.connect(hover.set_enabled)
+
+    def show_dialog(panel: LazyPanel) -> None:
+        dialog = panel.get()
+        dialog.show()
+        dialog.raise_()
+        dialog.activateWindow()
 
     def configure_plugin(plugin_id: str, plugin_name: str) -> None:
         dialog = QtWidgets.QDialog(window)
@@ -609,8 +1043,7 @@ def launch_gui(
         alpha_spin.setDecimals(2)
         alpha_spin.setValue(alpha_default)
         dataset_combo = QtWidgets.QComboBox()
-        for ds in datasets:
-            dataset_combo.addItem(ds.name)
+        use_dataset_names(dataset_combo, dataset_names)
         dataset_index_default = int((current or {}).get("dataset_index", 0))
         if dataset_combo.count() > 0:
             dataset_combo.setCurrentIndex(max(0, min(dataset_combo.count() - 1, dataset_index_default)))
@@ -632,19 +1065,29 @@ def launch_gui(
         if dialog.exec() != QtWidgets.QDialog.DialogCode.Accepted:
             return
 
-        if enabled_check.isChecked():
-            config = {"enabled": True}
-            if plugin_id == Y_EQUALS_X_PLUGIN_ID:
-                config["alpha"] = float(alpha_spin.value())
-            if plugin_id == LINEAR_REGRESSION_PLUGIN_ID and dataset_combo.count() > 0:
-                config["dataset_index"] = int(dataset_combo.currentIndex())
-            backend.enable_plugin(plugin_id, **config)
-        else:
+        kind = f"plugin:{plugin_id}"
+        if not enabled_check.isChecked():
+            jobs.cancel(kind)
             backend.disable_plugin(plugin_id)
-        refresh()
+            refresh()
+            return
+
+        config = {"enabled": True}
+        if plugin_id == Y_EQUALS_X_PLUGIN_ID:
+            config["alpha"] = float(alpha_spin.value())
+        if plugin_id == LINEAR_REGRESSION_PLUGIN_ID and dataset_combo.count() > 0:
+            config["dataset_index"] = int(dataset_combo.currentIndex())
+
+        def enable(prepared) -> None:
+            backend.enable_plugin(plugin_id, prepared=prepared, **config)
+            refresh()
+
+        merged = backend.plugin_config(plugin_id, **config)
+        jobs.submit(kind, lambda: backend.prepare_plugin(plugin_id, merged), enable)
 
-    appearance_action.triggered.connect(show_appearance_dialog)
-    axis_action.triggered.connect(show_axis_dialog)
+    appearance_action.triggered.connect(lambda: show_dialog(appearance_panel))
+    stats_action.triggered.connect(lambda: show_dialog(stats_panel))
+    axis_action.triggered.connect(lambda: show_dialog(axis_panel))
     for plugin_id, plugin_name in backend.available_plugins():
         action = plugins_menu.addAction(plugin_name)
         action.triggered.connect(
@@ -652,5 +1095,4 @@ def launch_gui(
         )
 
     window.resize(1100, 700)
-    window.show()
-    app.exec()
+    return session
@@ -0,0 +1,298 @@
+from __future__ import annotations
+
+from typing import Any, Callable
+
+from PySide6 import QtCore, QtWidgets
+
+from .backend import PlotBackend
+from .data import Dataset, DatasetStats
+
+Extremum = tuple[str, int, float, float]
+# Snapshot handed to a worker: the set, the version it was taken at, and the columns at that version.
+ExtremaRequest = tuple[Dataset, int, Any, Any]
+
+PENDING_TEXT = "..."
+STATS_COLUMNS = ("Set", "Points", "X min", "X max", "Y min", "Y max", "Mean", "Std")
+
+
+def format_extrema_label(entry: Extremum) -> str:
+    kind, idx, xval, yval = entry
+    return f"{kind} @ i={idx}, x={xval:.4g}, y={yval:.4g}"
+
+
+class DatasetListModel(QtCore.QAbstractListModel):
+    # One row per backend dataset, checked when visible. The set list, the appearance combo and the plugin
+    # dialogs all view this model, so Qt only builds rows that are on screen.
+    visibilityChanged = QtCore.Signal()
+
+    def __init__(self, backend: PlotBackend) -> None:
+        super().__init__()
+        self.backend = backend
+        self._rows = len(backend.datasets)
+
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._rows
+
+    def flags(self, index: QtCore.QModelIndex):
+        return super().flags(index) | QtCore.Qt.ItemFlag.ItemIsUserCheckable
+
+    def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.backend.datasets):
+            return None
+        row = index.row()
+        if role in (QtCore.Qt.ItemDataRole.DisplayRole, QtCore.Qt.ItemDataRole.EditRole):
+            return self.backend.datasets[row].name
+        if role == QtCore.Qt.ItemDataRole.CheckStateRole:
+            visible = row >= len(self.backend.visible) or self.backend.visible[row]
+            return QtCore.Qt.CheckState.Checked if visible else QtCore.Qt.CheckState.Unchecked
+        return None
+
+    def setData(self, index: QtCore.QModelIndex, value: Any, role: int = QtCore.Qt.ItemDataRole.EditRole) -> bool:
+        if not index.isValid() or role != QtCore.Qt.ItemDataRole.CheckStateRole:
+            return False
+        checked = QtCore.Qt.CheckState(value) == QtCore.Qt.CheckState.Checked
+        self.set_visible([index.row()], checked)
+        return True
+
+    def set_visible(self, rows: list[int] | None, visible: bool) -> None:
+        # Bulk check/uncheck: one dataChanged and one visibilityChanged however many rows change.
+        rows = range(self._rows) if rows is None else rows
+        for row in rows:
+            self.backend.set_dataset_visible(row, visible)
+        if rows:
+            self.dataChanged.emit(
+                self.index(min(rows)), self.index(max(rows)), [QtCore.Qt.ItemDataRole.CheckStateRole]
+            )
+            self.visibilityChanged.emit()
+
+    def rename(self, row: int) -> None:
+        self.dataChanged.emit(self.index(row), self.index(row))
+
+    def sync(self) -> None:
+        if len(self.backend.datasets) > self._rows:
+            self.beginInsertRows(QtCore.QModelIndex(), self._rows, len(self.backend.datasets) - 1)
+            self._rows = len(self.backend.datasets)
+            self.endInsertRows()
+
+
+class DatasetNamesModel(QtCore.QIdentityProxyModel):
+    # Names only, for combo boxes, which would otherwise draw the visibility check marks.
+    def flags(self, index: QtCore.QModelIndex):
+        return super().flags(index) & ~QtCore.Qt.ItemFlag.ItemIsUserCheckable
+
+    def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.ItemDataRole.DisplayRole):
+        if role == QtCore.Qt.ItemDataRole.CheckStateRole:
+            return None
+        return super().data(index, role)
+
+
+def dataset_filter_model(source: DatasetListModel) -> QtCore.QSortFilterProxyModel:
+    proxy = QtCore.QSortFilterProxyModel()
+    proxy.setSourceModel(source)
+    proxy.setFilterCaseSensitivity(QtCore.Qt.CaseSensitivity.CaseInsensitive)
+    return proxy
+
+
+def filtered_rows(proxy: QtCore.QSortFilterProxyModel) -> list[int] | None:
+    # Source rows shown through the filter; None when nothing is filtered out.
+    if not proxy.filterRegularExpression().pattern():
+        return None
+    return [proxy.mapToSource(proxy.index(row, 0)).row() for row in range(proxy.rowCount())]
+
+
+def use_dataset_names(combo: QtWidgets.QComboBox, names: DatasetNamesModel) -> None:
+    combo.setModel(names)
+    # Sizing to contents would measure every name; a fixed width keeps large models cheap.
+    combo.setSizeAdjustPolicy(QtWidgets.QComboBox.SizeAdjustPolicy.AdjustToMinimumContentsLengthWithIcon)
+    combo.setMinimumContentsLength(16)
+    combo.view().setUniformItemSizes(True)
+
+
+class ExtremaModel(QtCore.QAbstractTableModel):
+    # Rows are the datasets; extrema are computed only for rows a view asks about, cached per dataset
+    # version, and requested from a worker in batches through request_extrema.
+    def __init__(self, datasets: list[Dataset], request_extrema: Callable[[list[ExtremaRequest]], None]) -> None:
+        super().__init__()
+        self.datasets = datasets
+        self._request_extrema = request_extrema
+        self._cache: dict[int, tuple[int, list[Extremum]]] = {}
+        self._selected: dict[int, int] = {}
+        self._wanted: dict[int, Dataset] = {}
+        self._rows = len(datasets)
+        self._request_timer = QtCore.QTimer(self)
+        self._request_timer.setSingleShot(True)
+        self._request_timer.timeout.connect(self.request_wanted)
+
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._rows
+
+    def columnCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else 2
+
+    def headerData(self, section: int, orientation, role: int = QtCore.Qt.ItemDataRole.DisplayRole):
+        if role == QtCore.Qt.ItemDataRole.DisplayRole and orientation == QtCore.Qt.Orientation.Horizontal:
+            return ("Set", "Extremum")[section]
+        return None
+
+    def flags(self, index: QtCore.QModelIndex):
+        flags = super().flags(index)
+        if index.column() == 1 and self.extrema(self.datasets[index.row()]):
+            flags |= QtCore.Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.datasets):
+            return None
+        ds = self.datasets[index.row()]
+        if index.column() == 0:
+            return ds.name if role == QtCore.Qt.ItemDataRole.DisplayRole else None
+        if role == QtCore.Qt.ItemDataRole.EditRole:
+            return self._selected.get(id(ds), 0)
+        if role != QtCore.Qt.ItemDataRole.DisplayRole:
+            return None
+        entry = self.selection(ds)
+        if entry is not None:
+            return format_extrema_label(entry)
+        return "" if self.extrema(ds) == [] else PENDING_TEXT
+
+    def setData(self, index: QtCore.QModelIndex, value: Any, role: int = QtCore.Qt.ItemDataRole.EditRole) -> bool:
+        if index.column() != 1 or role != QtCore.Qt.ItemDataRole.EditRole:
+            return False
+        self._selected[id(self.datasets[index.row()])] = int(value)
+        self.dataChanged.emit(index, index)
+        return True
+
+    def extrema(self, ds: Dataset) -> list[Extremum] | None:
+        cached = self._cache.get(id(ds))
+        if cached is None or cached[0] != ds.version:
+            # Asked for by a view, so the row is visible: queue it for the next worker batch.
+            self._wanted[id(ds)] = ds
+            self._request_timer.start(0)
+            return None
+        return cached[1]
+
+    def selection(self, ds: Dataset) -> Extremum | None:
+        extrema = self.extrema(ds)
+        if not extrema:
+            return None
+        return extrema[min(self._selected.get(id(ds), 0), len(extrema) - 1)]
+
+    def stale_requests(self, datasets: list[Dataset] | None = None) -> list[ExtremaRequest]:
+        requests = []
+        for ds in self.datasets if datasets is None else datasets:
+            cached = self._cache.get(id(ds))
+            if cached is None or cached[0] != ds.version:
+                requests.append((ds, ds.version, ds.x, ds.y))
+        return requests
+
+    def request_wanted(self) -> None:
+        # Everything still wanted goes out together, so a newer batch superseding an older one loses nothing.
+        if self._wanted:
+            self._request_extrema(self.stale_requests(list(self._wanted.values())))
+
+    def store(self, found: list[tuple[Dataset, int, list[Extremum]]]) -> None:
+        rows = {id(ds): row for row, ds in enumerate(self.datasets)}
+        for ds, version, extrema in found:
+            self._wanted.pop(id(ds), None)
+            if ds.version != version:
+                continue
+            if self._cache.get(id(ds), (None,))[0] != version:
+                self._selected.pop(id(ds), None)
+            self._cache[id(ds)] = (version, extrema)
+            row = rows.get(id(ds))
+            if row is not None:
+                self.dataChanged.emit(self.index(row, 1), self.index(row, 1))
+
+    def rename(self, row: int) -> None:
+        self.dataChanged.emit(self.index(row, 0), self.index(row, 0))
+
+    def sync(self) -> None:
+        # After a transform: append rows for new sets and let views re-ask about changed extrema.
+        if len(self.datasets) > self._rows:
+            self.beginInsertRows(QtCore.QModelIndex(), self._rows, len(self.datasets) - 1)
+            self._rows = len(self.datasets)
+            self.endInsertRows()
+        if self._rows:
+            self.dataChanged.emit(self.index(0, 1), self.index(self._rows - 1, 1))
+
+
+class StatsModel(QtCore.QAbstractTableModel):
+    # Rows are the datasets. Stats live in each Dataset's own version-checked cache; rows a view shows
+    # without them are summarized by a worker in batches through request_stats.
+    def __init__(self, datasets: list[Dataset], request_stats: Callable[[list[Dataset]], None]) -> None:
+        super().__init__()
+        self.datasets = datasets
+        self._request_stats = request_stats
+        self._wanted: dict[int, Dataset] = {}
+        self._rows = len(datasets)
+        self._request_timer = QtCore.QTimer(self)
+        self._request_timer.setSingleShot(True)
+        self._request_timer.timeout.connect(self.request_wanted)
+
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._rows
+
+    def columnCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(STATS_COLUMNS)
+
+    def headerData(self, section: int, orientation, role: int = QtCore.Qt.ItemDataRole.DisplayRole):
+        if role == QtCore.Qt.ItemDataRole.DisplayRole and orientation == QtCore.Qt.Orientation.Horizontal:
+            return STATS_COLUMNS[section]
+        return None
+
+    def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.datasets) or role != QtCore.Qt.ItemDataRole.DisplayRole:
+            return None
+        ds = self.datasets[index.row()]
+        if index.column() == 0:
+            return ds.name
+        stats = ds.cached_stats()
+        if stats is None:
+            self._wanted[id(ds)] = ds
+            self._request_timer.start(0)
+            return PENDING_TEXT
+        if index.column() == 1:
+            return str(stats.count)
+        value = (stats.xmin, stats.xmax, stats.ymin, stats.ymax, stats.mean, stats.std)[index.column() - 2]
+        return f"{value:.6g}"
+
+    def request_wanted(self) -> None:
+        if self._wanted:
+            self._request_stats(list(self._wanted.values()))
+
+    def store(self, found: list[tuple[Dataset, int, DatasetStats]]) -> None:
+        rows = {id(ds): row for row, ds in enumerate(self.datasets)}
+        last = len(STATS_COLUMNS) - 1
+        for ds, version, stats in found:
+            self._wanted.pop(id(ds), None)
+            ds.store_stats(version, stats)
+            row = rows.get(id(ds))
+            if row is not None:
+                self.dataChanged.emit(self.index(row, 1), self.index(row, last))
+
+    def rename(self, row: int) -> None:
+        self.dataChanged.emit(self.index(row, 0), self.index(row, 0))
+
+    def sync(self) -> None:
+        if len(self.datasets) > self._rows:
+            self.beginInsertRows(QtCore.QModelIndex(), self._rows, len(self.datasets) - 1)
+            self._rows = len(self.datasets)
+            self.endInsertRows()
+        if self._rows:
+            self.dataChanged.emit(self.index(0, 1), self.index(self._rows - 1, len(STATS_COLUMNS) - 1))
+
+
+class ExtremaDelegate(QtWidgets.QStyledItemDelegate):
+    def createEditor(self, parent, option, index):
+        combo = QtWidgets.QComboBox(parent)
+        model = index.model()
+        for entry in model.extrema(model.datasets[index.row()]) or []:
+            combo.addItem(format_extrema_label(entry))
+        combo.activated.connect(lambda _idx: self.commitData.emit(combo))
+        return combo
+
+    def setEditorData(self, editor, index) -> None:
+        editor.setCurrentIndex(int(index.data(QtCore.Qt.ItemDataRole.EditRole) or 0))
+
+    def setModelData(self, editor, model, index) -> None:
+        model.setData(index, editor.currentIndex(), QtCore.Qt.ItemDataRole.EditRole)
@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from . import __version__
+from .backend import PlotBackend, PlotState
+from .data import STDIN_PATH, is_stream, load_datasets
+from .profiling import span
+
+HARDCOPY_DEVICES = {"PNG": "png", "PDF": "pdf", "SVG": "svg", "EPS": "eps"}
+VECTOR_DEVICES = {"PDF", "SVG", "EPS"}
+# Vector output rasterizes any dataset with more points than this unless the job overrides it.
+DEFAULT_RASTER_THRESHOLD = 50_000
+HASH_SUFFIX = ".pygrace-hash"
+
+
+@dataclass
+class HardcopyJob:
+    files: list[Path]
+    printfile: Path
+    bxy_specs: list[str | None] = field(default_factory=list)
+    title: str | None = None
+    xlabel: str | None = None
+    ylabel: str | None = None
+    legend_labels: list[str] | None = None
+    world: list[float] | None = None
+    autoscale: bool = False
+    device: str = "PNG"
+    raster_threshold: int | None = None
+    density_threshold: int | None = None
+    out_of_core: bool = False
+    envelope_bins: int | None = None
+    incremental: bool = False
+    # Keep only the newest rows of stdin and pipe inputs.
+    ring_size: int | None = None
+    # Data transformations applied in order, each {"op": name, "set": index, **parameters}; see transforms.py.
+    operations: list[dict[str, Any]] = field(default_factory=list)
+
+
+@dataclass
+class JobResult:
+    index: int
+    printfile: Path
+    ok: bool
+    seconds: float
+    error: str | None = None
+    skipped: bool = False
+
+
+def parse_legend(text: str | None) -> list[str] | None:
+    if not text:
+        return None
+    return [label.strip() for label in text.split(",") if label.strip()]
+
+
+def map_bxy_specs(files: list[Path], specs: list[str]) -> list[str | None]:
+    if len(specs) > len(files):
+        raise ValueError("more -bxy specs than data files")
+    bxy_by_file: list[str | None] = [None for _ in files]
+    for idx, spec in enumerate(specs):
+        bxy_by_file[idx] = spec
+    return bxy_by_file
+
+
+def normalize_device(device: str | None, printfile: Path | None = None) -> str:
+    if device is None and printfile is not None:
+        # Without a device the printfile's suffix decides, when it names a format we write; otherwise PNG.
+        suffix = printfile.suffix.lstrip(".").upper()
+        device = suffix if suffix in HARDCOPY_DEVICES else None
+    normalized = (device or "PNG").upper()
+    if normalized not in HARDCOPY_DEVICES:
+        raise ValueError(f"unsupported device {normalized}; choose one of {', '.join(HARDCOPY_DEVICES)}")
+    return normalized
+
+
+def job_from_args(args: argparse.Namespace, cwd: Path | None = None) -> HardcopyJob:
+    base = cwd or Path()
+    files = [base / p for p in args.files] + [base / p for p in args.nxy_files]
+    # Without a window to keep open, -pipe and -npipe inputs are read to the end like files.
+    if args.pipe:
+        files.append(Path(STDIN_PATH))
+    files += [base / p for p in args.npipes]
+    printfile = base / (args.printfile or "")
+    return HardcopyJob(
+        files=files,
+        printfile=printfile,
+        bxy_specs=map_bxy_specs(files, args.bxy_specs),
+        title=args.title,
+        xlabel=args.xlabel,
+        ylabel=args.ylabel,
+        legend_labels=parse_legend(args.legend),
+        world=args.world,
+        autoscale=args.autoscale,
+        device=normalize_device(args.device, printfile),
+        raster_threshold=args.raster_threshold,
+        density_threshold=args.density_threshold,
+        out_of_core=args.out_of_core,
+        envelope_bins=args.envelope_bins,
+        incremental=args.incremental,
+        ring_size=args.ring_size,
+    )
+
+
+def effective_raster_threshold(job: HardcopyJob) -> int | None:
+    threshold = job.raster_threshold
+    if threshold is None:
+        return DEFAULT_RASTER_THRESHOLD if job.device in VECTOR_DEVICES else None
+    return threshold if threshold > 0 else None
+
+
+def job_state(job: HardcopyJob) -> PlotState:
+    return PlotState(
+        title=job.title,
+        xlabel=job.xlabel,
+        ylabel=job.ylabel,
+        world=job.world,
+        autoscale=job.autoscale or job.world is None,
+        raster_threshold=effective_raster_threshold(job),
+        density_threshold=job.density_threshold,
+    )
+
+
+def job_backend(job: HardcopyJob) -> PlotBackend:
+    if not job.out_of_core:
+        with span("load_datasets"):
+            datasets = load_datasets(job.files, bxy_specs=job.bxy_specs, ring_size=job.ring_size)
+        backend = PlotBackend(datasets, job_state(job), job.legend_labels)
+        for operation in job.operations:
+            params = {key: value for key, value in operation.items() if key not in ("op", "set")}
+            backend.apply_operation(operation.get("set", 0), operation["op"], **params)
+        return backend
+
+    from .envelope import DEFAULT_ENVELOPE_BINS, load_envelope_datasets
+
+    bins = job.envelope_bins or DEFAULT_ENVELOPE_BINS
+    backend = PlotBackend(load_envelope_datasets(job.files, job.bxy_specs, bins), job_state(job), job.legend_labels)
+    if job.world is not None:
+        backend.refine_envelopes(job.world[0], job.world[1])
+    return backend
+
+
+def _file_fingerprint(path: Path) -> list[Any] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return [os.path.abspath(path), stat.st_size, stat.st_mtime_ns]
+
+
+def job_fingerprint(job: HardcopyJob) -> str:
+    # Inputs are fingerprinted by size and mtime so the check never has to read the data.
+    payload = {
+        "version": __version__,
+        "files": [_file_fingerprint(path) for path in job.files],
+        "bxy": job.bxy_specs,
+        "state": asdict(job_state(job)),
+        "legend": job.legend_labels,
+        "device": job.device,
+        "out_of_core": [job.out_of_core, job.envelope_bins],
+        "operations": job.operations,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def hash_sidecar(printfile: Path) -> Path:
+    return printfile.with_name(printfile.name + HASH_SUFFIX)
+
+
+def load_hash_index(path: Path) -> dict[str, str]:
+    try:
+        index = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {}
+    except ValueError as exc:
+        raise ValueError(f"{path}: invalid hash index") from exc
+    if not isinstance(index, dict):
+        raise ValueError(f"{path}: invalid hash index")
+    return index
+
+
+def save_hash_index(path: Path, index: dict[str, str]) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(index, indent=1, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def is_up_to_date(job: HardcopyJob, fingerprint: str, index: dict[str, str] | None = None) -> bool:
+    # Piped input has no size or mtime to compare, so it always counts as changed.
+    if not job.printfile.exists() or any(is_stream(path) for path in job.files):
+        return False
+    if index is not None:
+        return index.get(os.path.abspath(job.printfile)) == fingerprint
+    try:
+        return hash_sidecar(job.printfile).read_text(encoding="utf-8").strip() == fingerprint
+    except OSError:
+        return False
+
+
+def record_fingerprint(job: HardcopyJob, fingerprint: str, index: dict[str, str] | None = None) -> None:
+    if index is not None:
+        index[os.path.abspath(job.printfile)] = fingerprint
+    else:
+        hash_sidecar(job.printfile).write_text(fingerprint + "\n", encoding="utf-8")
+
+
+def render_job(job: HardcopyJob) -> None:
+    job_backend(job).render_to(job.printfile, fmt=HARDCOPY_DEVICES[job.device])
+
+
+def render_job_bytes(job: HardcopyJob) -> bytes:
+    return job_backend(job).render_bytes(HARDCOPY_DEVICES[job.device])
+
+
+def run_job(index: int, job: HardcopyJob) -> JobResult:
+    start = time.perf_counter()
+    try:
+        render_job(job)
+    except Exception as exc:  # noqa: BLE001
+        return JobResult(index, job.printfile, False, time.perf_counter() - start, str(exc))
+    return JobResult(index, job.printfile, True, time.perf_counter() - start)
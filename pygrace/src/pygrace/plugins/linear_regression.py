@@ -5,26 +5,16 @@ from .types import PluginDefinition
 LINEAR_REGRESSION_PLUGIN_ID = "linear_regression"
 
 
-def _render_linear_regression(ax, config: dict[str, object], backend: object) -> None:
-    # Typed loosely to keep plugin package decoupled from backend module imports.
-    datasets = getattr(backend, "datasets", [])
-    if not datasets:
-        return
-
-    idx = int(config.get("dataset_index", 0))
-    if idx < 0 or idx >= len(datasets):
-        return
-
-    ds = datasets[idx]
+def _fit_line(ds) -> tuple[list[float], list[float]] | None:
     if len(ds.x) < 2 or len(ds.y) < 2:
-        return
+        return None
 
     n = len(ds.x)
     x_mean = sum(ds.x) / n
     y_mean = sum(ds.y) / n
     sxx = sum((x - x_mean) ** 2 for x in ds.x)
     if sxx == 0:
-        return
+        return None
     sxy = sum((x - x_mean) * (y - y_mean) for x, y in zip(ds.x, ds.y))
 
     slope = sxy / sxx
@@ -32,8 +22,39 @@ def _render_linear_regression(ax, config: dict[str, object], backend: object) ->
 
     xmin = min(ds.x)
     xmax = max(ds.x)
-    xs = [xmin, xmax]
-    ys = [slope * xmin + intercept, slope * xmax + intercept]
+    return [xmin, xmax], [slope * xmin + intercept, slope * xmax + intercept]
+
+
+def _selected_dataset(config: dict[str, object], backend: object):
+    # Typed loosely to keep plugin package decoupled from backend module imports.
+    datasets = getattr(backend, "datasets", [])
+    idx = int(config.get("dataset_index", 0))
+    if idx < 0 or idx >= len(datasets):
+        return None
+    return datasets[idx]
+
+
+def _prepare_linear_regression(config: dict[str, object], backend: object) -> dict[str, object] | None:
+    ds = _selected_dataset(config, backend)
+    if ds is None:
+        return None
+    # Keep the fitted columns so render can tell whether the fit still matches the data.
+    return {"x": ds.x, "y": ds.y, "line": _fit_line(ds)}
+
+
+def _render_linear_regression(ax, config: dict[str, object], backend: object) -> None:
+    ds = _selected_dataset(config, backend)
+    if ds is None:
+        return
+
+    prepared = config.get("prepared")
+    if isinstance(prepared, dict) and prepared["x"] is ds.x and prepared["y"] is ds.y:
+        line = prepared["line"]
+    else:
+        line = _fit_line(ds)
+    if line is None:
+        return
+    xs, ys = line
 
     color = str(config.get("color", "tab:green"))
     linewidth = float(config.get("line_width", 2.0))
@@ -52,4 +73,5 @@ PLUGIN = PluginDefinition(
         "line_style": "-",
     },
     render=_render_linear_regression,
+    prepare=_prepare_linear_regression,
 )
@@ -10,3 +10,5 @@ class PluginDefinition:
     name: str
     default_config: dict[str, Any]
     render: Callable[[Any, dict[str, Any], Any], None]
+    # Optional heavy, read-only step run before enabling; its result reaches render as config["prepared"].
+    prepare: Callable[[dict[str, Any], Any], Any] | None = None
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import json
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import Any, Iterator
+
+# Shared no-op context returned by span() while profiling is off, so instrumented code pays one global lookup.
+_NULL_SPAN = nullcontext()
+_active: Profiler | None = None
+
+# Span and dataset records kept. A long GUI session drops the oldest half when it gets there; totals() still
+# counts every span.
+MAX_RECORDS = 10_000
+
+
+def column_nbytes(values: Any) -> int:
+    if values is None:
+        return 0
+    nbytes = getattr(values, "nbytes", None)
+    if nbytes is not None:
+        return int(nbytes)
+    return sys.getsizeof(values) + sum(map(sys.getsizeof, values))
+
+
+class Profiler:
+    def __init__(self, memory: bool = False) -> None:
+        self.memory = memory
+        self.spans: list[dict[str, Any]] = []
+        self.datasets: list[dict[str, Any]] = []
+        self._totals: dict[str, dict[str, float]] = {}
+        self._lock = threading.Lock()
+        # Spans nest per thread: GUI jobs open spans on worker threads while the UI thread opens its own.
+        self._local = threading.local()
+        self._owns_tracemalloc = False
+
+    def start(self) -> None:
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracemalloc = True
+
+    def stop(self) -> None:
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+
+    def _frames(self) -> list[list[int]]:
+        # Per open span in this thread: traced bytes at entry and the highest peak seen so far, since nested
+        # spans reset the peak. tracemalloc itself is process-wide, so spans overlapping across threads share it.
+        frames = getattr(self._local, "frames", None)
+        if frames is None:
+            frames = self._local.frames = []
+        return frames
+
+    @contextmanager
+    def span(self, name: str, **info: Any) -> Iterator[dict[str, Any]]:
+        frames = self._frames()
+        depth = getattr(self._local, "depth", 0)
+        record: dict[str, Any] = {"name": name, "depth": depth, **info}
+        tracing = self.memory and tracemalloc.is_tracing()
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            if frames:
+                frames[-1][1] = max(frames[-1][1], peak)
+            tracemalloc.reset_peak()
+            frames.append([current, current])
+        self._local.depth = depth + 1
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["seconds"] = time.perf_counter() - start
+            self._local.depth = depth
+            if tracing:
+                current, peak = tracemalloc.get_traced_memory()
+                entry, seen = frames.pop()
+                peak = max(peak, seen)
+                record["peak_bytes"] = peak - entry
+                record["retained_bytes"] = current - entry
+                if frames:
+                    frames[-1][1] = max(frames[-1][1], peak)
+            with self._lock:
+                self._add_total(record)
+                _append_capped(self.spans, record)
+
+    def _add_total(self, record: dict[str, Any]) -> None:
+        entry = self._totals.setdefault(record["name"], {"calls": 0, "seconds": 0.0})
+        entry["calls"] += 1
+        entry["seconds"] += record["seconds"]
+        if "peak_bytes" in record:
+            entry["peak_bytes"] = max(entry.get("peak_bytes", 0), record["peak_bytes"])
+            entry["retained_bytes"] = entry.get("retained_bytes", 0) + record["retained_bytes"]
+
+    def note_dataset(self, name: str, points: int, **info: Any) -> None:
+        with self._lock:
+            _append_capped(self.datasets, {"name": name, "points": points, **info})
+
+    def totals(self) -> dict[str, dict[str, float]]:
+        with self._lock:
+            return {name: dict(entry) for name, entry in self._totals.items()}
+
+    def to_dict(self) -> dict[str, Any]:
+        totals = self.totals()
+        with self._lock:
+            return {"totals": totals, "spans": list(self.spans), "datasets": list(self.datasets)}
+
+    def write_json(self, path) -> None:
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(self.to_dict(), handle, indent=1)
+
+    def format_table(self) -> str:
+        lines = [f"{'stage':<24}{'calls':>8}{'total ms':>12}"]
+        for name, entry in self.totals().items():
+            lines.append(f"{name:<24}{int(entry['calls']):>8}{entry['seconds'] * 1000:>12.2f}")
+        with self._lock:
+            datasets = list(self.datasets)
+        if datasets:
+            # Each refresh re-notes every dataset; the table keeps the latest entry per dataset and stage.
+            latest = {(entry["name"], entry.get("stage", "")): entry for entry in datasets}
+            lines.append("")
+            lines.append(f"{'dataset':<32}{'stage':<8}{'points':>12}")
+            for (name, stage), entry in latest.items():
+                lines.append(f"{name:<32}{stage:<8}{entry['points']:>12}")
+        return "\n".join(lines)
+
+    def format_memory_table(self) -> str:
+        lines = [f"{'stage':<24}{'calls':>8}{'peak KiB':>12}{'retained KiB':>14}"]
+        for name, entry in self.totals().items():
+            if "peak_bytes" not in entry:
+                continue
+            lines.append(
+                f"{name:<24}{int(entry['calls']):>8}"
+                f"{entry['peak_bytes'] / 1024:>12.1f}{entry['retained_bytes'] / 1024:>14.1f}"
+            )
+        with self._lock:
+            latest = {entry["name"]: entry for entry in self.datasets if "data_bytes" in entry}
+        if latest:
+            lines.append("")
+            lines.append(f"{'dataset':<32}{'points':>12}{'data KiB':>12}{'snapshot KiB':>14}{'artists KiB':>13}")
+            for name, entry in latest.items():
+                lines.append(
+                    f"{name:<32}{entry['points']:>12}{entry['data_bytes'] / 1024:>12.1f}"
+                    f"{entry['snapshot_bytes'] / 1024:>14.1f}{entry.get('artist_bytes', 0) / 1024:>13.1f}"
+                )
+        return "\n".join(lines)
+
+
+def _append_capped(records: list[dict[str, Any]], record: dict[str, Any]) -> None:
+    records.append(record)
+    if len(records) > MAX_RECORDS:
+        del records[: MAX_RECORDS // 2]
+
+
+def span(name: str, **info: Any):
+    profiler = _active
+    if profiler is None:
+        return _NULL_SPAN
+    return profiler.span(name, **info)
+
+
+def note_dataset(name: str, points: int, **info: Any) -> None:
+    profiler = _active
+    if profiler is not None:
+        profiler.note_dataset(name, points, **info)
+
+
+def tracking_memory() -> bool:
+    profiler = _active
+    return profiler is not None and profiler.memory
+
+
+def enable(profiler: Profiler | None = None) -> Profiler:
+    global _active
+    _active = profiler or Profiler()
+    _active.start()
+    return _active
+
+
+def disable() -> Profiler | None:
+    global _active
+    profiler, _active = _active, None
+    if profiler is not None:
+        profiler.stop()
+    return profiler
+
+
+def active_profiler() -> Profiler | None:
+    return _active
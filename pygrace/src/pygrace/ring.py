@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Sequence
+
+import numpy as np
+
+from .data import Dataset
+
+
+@dataclass
+class RingDataset(Dataset):
+    # Keeps only the newest `capacity` points. Every point is written twice, at slot i and i + capacity of a
+    # buffer twice the capacity, so the newest points are always one contiguous slice: appending is O(1) per
+    # point and the columns handed to the renderer are views, never a reallocated copy.
+    #
+    # The x/y/dx/dy views share the buffer, so a view taken before an append may see the oldest point
+    # overwritten. Every append bumps the version, which is what caches and background jobs check.
+    capacity: int = 0
+    live: bool = field(default=True, compare=False)
+    _buffer: Any = field(default=None, init=False, compare=False, repr=False)
+    _head: int = field(default=0, init=False, compare=False, repr=False)
+    _count: int = field(default=0, init=False, compare=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.capacity <= 0:
+            raise ValueError("ring capacity must be positive")
+        if len(self.x) > self.capacity:
+            keep = slice(len(self.x) - self.capacity, None)
+            self.x = self.x[keep]
+            self.y = self.y[keep]
+            if self.dx is not None:
+                self.dx = self.dx[keep]
+            if self.dy is not None:
+                self.dy = self.dy[keep]
+
+    def _columns(self) -> list[Sequence[float] | None]:
+        return [self.x, self.y, self.dx, self.dy]
+
+    def _allocate(self) -> None:
+        # The buffer is made on the first append, seeded with the columns the set was created with; snapshots
+        # made with dataclasses.replace() therefore stay cheap until someone appends to them.
+        columns = [column for column in self._columns() if column is not None]
+        object.__setattr__(self, "_buffer", np.empty((len(columns), 2 * self.capacity)))
+        object.__setattr__(self, "_head", 0)
+        object.__setattr__(self, "_count", 0)
+        if len(self.x):
+            self._write(np.asarray(columns, dtype=np.float64))
+
+    def append(
+        self,
+        x: Sequence[float] | float,
+        y: Sequence[float] | float,
+        dx: Sequence[float] | float | None = None,
+        dy: Sequence[float] | float | None = None,
+    ) -> None:
+        if self._buffer is None:
+            self._allocate()
+        given = [x, y, dx, dy]
+        if [value is None for value in given[2:]] != [column is None for column in self._columns()[2:]]:
+            raise ValueError("append must supply exactly the error columns the set has")
+        self._write(np.asarray([np.atleast_1d(value) for value in given if value is not None], dtype=np.float64))
+
+    def _write(self, values: np.ndarray) -> None:
+        capacity = self.capacity
+        buffer = self._buffer
+        if values.shape[1] >= capacity:
+            values = values[:, -capacity:]
+            buffer[:, :capacity] = values
+            buffer[:, capacity:] = values
+            head = 0
+        else:
+            head = self._head
+            first = min(values.shape[1], capacity - head)
+            for offset in (0, capacity):
+                buffer[:, offset + head : offset + head + first] = values[:, :first]
+                buffer[:, offset : offset + values.shape[1] - first] = values[:, first:]
+            head = (head + values.shape[1]) % capacity
+        count = min(capacity, self._count + values.shape[1])
+        object.__setattr__(self, "_head", head)
+        object.__setattr__(self, "_count", count)
+        window = buffer[:, head + capacity - count : head + capacity]
+        names = [name for name, column in zip(("x", "y", "dx", "dy"), self._columns()) if column is not None]
+        for name, view in zip(names, window):
+            object.__setattr__(self, name, view)
+        # One version bump per append, however many columns were replaced.
+        object.__setattr__(self, "version", self.version + 1)
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import signal
+import socket
+import stat
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import BinaryIO
+
+SOCKET_ENV = "PYGRACE_SOCKET"
+CHUNK_SIZE = 64 * 1024
+
+
+class ServiceError(RuntimeError):
+    pass
+
+
+class ServiceUnavailable(ServiceError):
+    # No service answered at the socket; the caller can render by itself instead.
+    pass
+
+
+def default_socket_path() -> Path:
+    override = os.environ.get(SOCKET_ENV)
+    if override:
+        return Path(override)
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir) / f"pygrace-{os.getuid()}.sock"
+    # The shared temp dir lets anyone create the socket first, so it goes in a directory only this user can use.
+    return private_directory(Path(tempfile.gettempdir()) / f"pygrace-{os.getuid()}") / "render.sock"
+
+
+def private_directory(path: Path) -> Path:
+    path.mkdir(mode=0o700, exist_ok=True)
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise ValueError(f"{path} must be a directory that only this user can access")
+    return path
+
+
+def _warm_worker() -> None:
+    # Pay the matplotlib import and font setup once per worker instead of once per plot.
+    from .backend import PlotBackend
+
+    PlotBackend.from_data([([0.0, 1.0], [0.0, 1.0])]).render_bytes("png")
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def render_request(argv: list[str], cwd: str) -> tuple[bool, bytes | str]:
+    from .cli import build_parser
+    from .hardcopy import job_from_args, render_job_bytes
+
+    try:
+        args, _unknown = build_parser().parse_known_args(argv)
+        return True, render_job_bytes(job_from_args(args, cwd=Path(cwd)))
+    except Exception as exc:  # noqa: BLE001
+        return False, str(exc)
+
+
+class RenderService:
+    def __init__(self, socket_path: Path, workers: int = 1) -> None:
+        self.socket_path = socket_path
+        self.workers = max(1, workers)
+        self._pool: ProcessPoolExecutor | None = None
+        self._server: asyncio.AbstractServer | None = None
+
+    async def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_worker)
+        await asyncio.gather(*(loop.run_in_executor(self._pool, _ping) for _ in range(self.workers)))
+        if self.socket_path.is_socket():
+            self.socket_path.unlink()
+        self._server = await asyncio.start_unix_server(self._handle, path=str(self.socket_path))
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        assert self._server is not None
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        if self.socket_path.is_socket():
+            self.socket_path.unlink()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            try:
+                request = json.loads(await reader.readline())
+                argv = [str(arg) for arg in request["argv"]]
+                cwd = str(request.get("cwd") or os.getcwd())
+            except (ValueError, KeyError, TypeError):
+                ok, payload = False, "malformed render request"
+            else:
+                loop = asyncio.get_running_loop()
+                ok, payload = await loop.run_in_executor(self._pool, render_request, argv, cwd)
+
+            if ok and isinstance(payload, bytes):
+                writer.write(json.dumps({"ok": True, "size": len(payload)}).encode() + b"\n")
+                for start in range(0, len(payload), CHUNK_SIZE):
+                    writer.write(payload[start : start + CHUNK_SIZE])
+                    await writer.drain()
+            else:
+                writer.write(json.dumps({"ok": False, "error": str(payload)}).encode() + b"\n")
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+def run_service(socket_path: Path, workers: int = 1) -> None:
+    async def main() -> None:
+        service = RenderService(socket_path, workers)
+        await service.start()
+        loop = asyncio.get_running_loop()
+        stop = asyncio.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, stop.set)
+        serving = asyncio.ensure_future(service.serve_forever())
+        await stop.wait()
+        serving.cancel()
+        await service.close()
+
+    asyncio.run(main())
+
+
+def request_render(socket_path: Path, argv: list[str], out: BinaryIO, cwd: str | None = None) -> int:
+    request = {"argv": argv, "cwd": cwd or os.getcwd()}
+    try:
+        owner = os.stat(socket_path).st_uid
+    except OSError as exc:
+        raise ServiceUnavailable(f"no render service at {socket_path}: {exc}") from exc
+    if owner != os.getuid():
+        # Whoever owns the socket would receive the request and choose the bytes written to the printfile.
+        raise ServiceError(f"{socket_path} belongs to another user")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(socket_path))
+        except OSError as exc:
+            raise ServiceUnavailable(f"no render service at {socket_path}: {exc}") from exc
+        try:
+            sock.sendall(json.dumps(request).encode() + b"\n")
+            stream = sock.makefile("rb")
+            header = json.loads(stream.readline() or b"{}")
+            if not header.get("ok"):
+                raise ServiceError(header.get("error") or "render service closed the connection")
+            remaining = int(header["size"])
+            while remaining > 0:
+                chunk = stream.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    raise ServiceError("render service closed the connection")
+                out.write(chunk)
+                remaining -= len(chunk)
+        except ConnectionError as exc:
+            raise ServiceError(f"render service connection failed: {exc}") from exc
+        return int(header["size"])
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from .data import (
+    DEFAULT_COLORS,
+    Dataset,
+    _extract_columns,
+    _parse_bxy_spec,
+    _parse_numeric_rows,
+    input_name,
+    open_stream,
+    read_line_chunks,
+)
+from .ring import RingDataset
+
+
+# Points a live set's buffer starts with; it doubles whenever it fills up.
+LIVE_BUFFER_POINTS = 1024
+
+
+class LiveTable:
+    # Datasets fed by a pipe that keeps delivering rows. The first rows decide which sets exist, like
+    # load_datasets; later rows are appended by replacing the columns, so work holding the old ones is unaffected.
+    # With a capacity the sets are RingDatasets instead, holding only the newest points at a fixed cost.
+    def __init__(self, name: str, spec: str | None = None, capacity: int | None = None) -> None:
+        self.name = name
+        self.capacity = capacity
+        self.layout = [_parse_bxy_spec(spec)] if spec else None
+        self.datasets: list[Dataset] = []
+        # Per set without a capacity: the buffer its columns are views of, and how many points are filled.
+        self._buffers: list[tuple[Any, int]] = []
+
+    def _create(self, rows: list[list[float]], color_offset: int) -> list[Dataset]:
+        if self.layout is None:
+            width = min(len(row) for row in rows)
+            self.layout = [(0, y_idx, None, None) for y_idx in range(1, width)]
+        for number, (_x_idx, y_idx, dx_idx, dy_idx) in enumerate(self.layout):
+            color = DEFAULT_COLORS[(color_offset + number) % len(DEFAULT_COLORS)]
+            named = len(self.layout) == 1 or y_idx == 1
+            columns = {
+                "name": self.name if named else f"{self.name}:col{y_idx + 1}",
+                "x": [],
+                "y": [],
+                "dx": None if dx_idx is None else [],
+                "dy": None if dy_idx is None else [],
+                "line_color": color,
+                "marker_face_color": color,
+                "marker_edge_color": color,
+                "live": True,
+            }
+            if self.capacity:
+                self.datasets.append(RingDataset(**columns, capacity=self.capacity))
+            else:
+                self.datasets.append(Dataset(**columns))
+                self._buffers.append((None, 0))
+        return list(self.datasets)
+
+    def _extend(self, number: int, columns: list[list[float]]) -> None:
+        # New rows go after the filled part of a buffer that doubles when full, so a pipe that runs for days
+        # costs amortized O(rows) per tick. The columns become views of the filled part; the rows written
+        # later lie beyond every earlier view, so those never change, just as if the columns were replaced.
+        ds = self.datasets[number]
+        buffer, count = self._buffers[number]
+        filled = count + len(columns[0])
+        if buffer is None or filled > buffer.shape[1]:
+            size = max(filled, LIVE_BUFFER_POINTS, 0 if buffer is None else 2 * buffer.shape[1])
+            grown = np.empty((len(columns), size))
+            if buffer is not None:
+                grown[:, :count] = buffer[:, :count]
+            buffer = grown
+        buffer[:, count:filled] = columns
+        self._buffers[number] = (buffer, filled)
+        names = [name for name in ("x", "y", "dx", "dy") if getattr(ds, name) is not None]
+        for name, view in zip(names, buffer[:, :filled]):
+            setattr(ds, name, view)
+
+    def append(self, rows: list[list[float]], color_offset: int = 0) -> list[Dataset]:
+        # Returns the sets created by this call, colored from color_offset on like the sets before them.
+        created = [] if self.datasets or not rows else self._create(rows, color_offset)
+        for number, (ds, indices) in enumerate(zip(self.datasets, self.layout or [])):
+            x, y, dx, dy = _extract_columns(rows, indices)
+            if not x:
+                continue
+            if isinstance(ds, RingDataset):
+                ds.append(x, y, dx, dy)
+            else:
+                self._extend(number, [column for column in (x, y, dx, dy) if column is not None])
+        return created
+
+
+class PipeFollower:
+    # Reads a named pipe on a daemon thread and queues parsed rows for the UI thread to take(). When a writer
+    # closes the pipe, the pipe is opened again for the next one, as a long-running plotter expects.
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.name = input_name(path)
+        self.error: OSError | None = None
+        self._rows: list[list[float]] = []
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"pipe {self.name}", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        # A read blocked on a silent pipe cannot be interrupted; the daemon thread simply ends with the process.
+        self._stopped.set()
+
+    def take(self) -> list[list[float]]:
+        with self._lock:
+            rows, self._rows = self._rows, []
+        return rows
+
+    def _run(self) -> None:
+        try:
+            while not self._stopped.is_set():
+                with open_stream(self.path) as stream:
+                    for lines in read_line_chunks(stream):
+                        rows = _parse_numeric_rows(lines)
+                        if rows:
+                            with self._lock:
+                                self._rows.extend(rows)
+                        if self._stopped.is_set():
+                            return
+        except OSError as exc:
+            self.error = exc
@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Sequence
+
+import numpy as np
+
+# Long columns are processed this many points at a time, so temporaries stay bounded for any dataset size.
+TRANSFORM_CHUNK = 1 << 20
+
+Columns = tuple[np.ndarray, np.ndarray]
+
+# interp() mappings kept, most recently used last. Each entry holds its two x columns, which can be large.
+INTERP_CACHE_SIZE = 8
+
+DERIVATIVE_METHODS = ("centered", "forward", "backward")
+FOURIER_OUTPUTS = ("magnitude", "power", "phase")
+
+
+def _pair(x: Sequence[float], y: Sequence[float]) -> Columns:
+    xs = np.asarray(x, dtype=np.float64)
+    ys = np.asarray(y, dtype=np.float64)
+    n = min(len(xs), len(ys))
+    return xs[:n], ys[:n]
+
+
+def _empty() -> Columns:
+    return np.empty(0), np.empty(0)
+
+
+def running_average(x: Sequence[float], y: Sequence[float], window: int = 3, chunk: int = TRANSFORM_CHUNK) -> Columns:
+    # Mean of every run of `window` consecutive points, x and y alike, as Grace does: n - window + 1 points.
+    if window < 1:
+        raise ValueError("running average window must be at least 1")
+    xs, ys = _pair(x, y)
+    count = len(xs) - window + 1
+    if count <= 0:
+        return _empty()
+    out_x = np.empty(count)
+    out_y = np.empty(count)
+    for start in range(0, count, chunk):
+        stop = min(count, start + chunk)
+        for source, out in ((xs, out_x), (ys, out_y)):
+            # Prefix sums restart every chunk, so their rounding error does not grow with the set's length.
+            sums = np.concatenate(([0.0], np.cumsum(source[start : stop + window - 1])))
+            out[start:stop] = (sums[window:] - sums[:-window]) / window
+    return out_x, out_y
+
+
+def derivative(
+    x: Sequence[float], y: Sequence[float], method: str = "centered", chunk: int = TRANSFORM_CHUNK
+) -> Columns:
+    # Finite differences dy/dx. Centered differences sit on the inner points; forward and backward ones on
+    # the left and right point of each pair.
+    if method not in DERIVATIVE_METHODS:
+        raise ValueError(f"derivative method must be one of {', '.join(DERIVATIVE_METHODS)}")
+    xs, ys = _pair(x, y)
+    step = 2 if method == "centered" else 1
+    count = len(xs) - step
+    if count <= 0:
+        return _empty()
+    offset = {"centered": 1, "forward": 0, "backward": 1}[method]
+    out_y = np.empty(count)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for start in range(0, count, chunk):
+            stop = min(count, start + chunk)
+            xw = xs[start : stop + step]
+            yw = ys[start : stop + step]
+            out_y[start:stop] = (yw[step:] - yw[:-step]) / (xw[step:] - xw[:-step])
+    return xs[offset : offset + count].copy(), out_y
+
+
+def integral(x: Sequence[float], y: Sequence[float], chunk: int = TRANSFORM_CHUNK) -> Columns:
+    # Running trapezoid-rule integral from the first point; the last value is the integral over the whole set.
+    xs, ys = _pair(x, y)
+    if not len(xs):
+        return _empty()
+    out_y = np.empty(len(xs))
+    out_y[0] = 0.0
+    for start in range(0, len(xs) - 1, chunk):
+        stop = min(len(xs) - 1, start + chunk)
+        xw = xs[start : stop + 1]
+        yw = ys[start : stop + 1]
+        out_y[start + 1 : stop + 1] = out_y[start] + np.cumsum(0.5 * (yw[1:] + yw[:-1]) * np.diff(xw))
+    return xs.copy(), out_y
+
+
+def fourier(x: Sequence[float], y: Sequence[float], output: str = "magnitude") -> Columns:
+    # One-sided spectrum of y against frequency in cycles per x unit. Like Grace, x is taken to be evenly
+    # spaced. The FFT needs the whole signal at once, so this is the one kernel that does not chunk.
+    if output not in FOURIER_OUTPUTS:
+        raise ValueError(f"Fourier output must be one of {', '.join(FOURIER_OUTPUTS)}")
+    xs, ys = _pair(x, y)
+    if len(xs) < 2:
+        raise ValueError("Fourier transform needs at least 2 points")
+    spacing = abs(xs[-1] - xs[0]) / (len(xs) - 1)
+    if not np.isfinite(spacing) or spacing == 0:
+        raise ValueError("Fourier transform needs distinct, finite x values")
+    spectrum = np.fft.rfft(ys)
+    frequency = np.fft.rfftfreq(len(ys), spacing)
+    if output == "phase":
+        return frequency, np.angle(spectrum)
+    magnitude = np.abs(spectrum) / len(ys)
+    return frequency, magnitude * magnitude if output == "power" else magnitude
+
+
+def interpolate(
+    x: Sequence[float],
+    y: Sequence[float],
+    points: int = 1000,
+    onto: Sequence[float] | None = None,
+    chunk: int = TRANSFORM_CHUNK,
+) -> Columns:
+    # Linear interpolation onto `onto` (e.g. another set's x) or onto `points` evenly spaced x values spanning
+    # the set. Nothing is extrapolated: x values outside the set get NaN, which leaves a gap in the plot.
+    xs, ys = _pair(x, y)
+    finite = np.isfinite(xs) & np.isfinite(ys)
+    if not finite.all():
+        xs = xs[finite]
+        ys = ys[finite]
+    if len(xs) < 2:
+        raise ValueError("interpolation needs at least 2 finite points")
+    if not bool((xs[1:] >= xs[:-1]).all()):
+        order = np.argsort(xs, kind="stable")
+        xs = xs[order]
+        ys = ys[order]
+    if onto is not None:
+        new_x = np.asarray(onto, dtype=np.float64)
+    elif points < 2:
+        raise ValueError("interpolation needs at least 2 points")
+    else:
+        new_x = np.linspace(xs[0], xs[-1], points)
+    new_y = np.empty(len(new_x))
+    for start in range(0, len(new_x), chunk):
+        stop = min(len(new_x), start + chunk)
+        new_y[start:stop] = np.interp(new_x[start:stop], xs, ys, left=np.nan, right=np.nan)
+    return new_x, new_y
+
+
+@dataclass(frozen=True)
+class InterpolationMap:
+    # Where each new x falls among the old ones: y_new = y[lower] * (1 - weight) + y[upper] * weight.
+    lower: np.ndarray
+    upper: np.ndarray
+    weight: np.ndarray
+    outside: np.ndarray
+
+    def apply(self, y: Sequence[float]) -> np.ndarray:
+        ys = np.asarray(y, dtype=np.float64)
+        values = ys[self.lower] * (1.0 - self.weight) + ys[self.upper] * self.weight
+        values[self.outside] = np.nan
+        return values
+
+
+def interpolation_map(x_new: Sequence[float], x_old: Sequence[float]) -> InterpolationMap:
+    # One binary search per new point, all at once; the old x is sorted first if it has to be. Non-finite old x
+    # values are dropped, as interpolate() does; `order` maps what is left back to positions in the old column.
+    xp = np.asarray(x_old, dtype=np.float64)
+    order = None
+    finite = np.isfinite(xp)
+    if not finite.all():
+        order = np.flatnonzero(finite)
+        xp = xp[order]
+    if len(xp) < 2:
+        raise ValueError("interp() needs at least 2 finite points to interpolate between")
+    if not bool((xp[1:] >= xp[:-1]).all()):
+        sort = np.argsort(xp, kind="stable")
+        xp = xp[sort]
+        order = sort if order is None else order[sort]
+    xn = np.asarray(x_new, dtype=np.float64)
+    upper = np.searchsorted(xp, xn, side="right").clip(1, len(xp) - 1)
+    lower = upper - 1
+    step = xp[upper] - xp[lower]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        weight = np.where(step > 0, (xn - xp[lower]) / step, 0.0)
+    # Like interpolate(), nothing is extrapolated.
+    outside = ~((xn >= xp[0]) & (xn <= xp[-1]))
+    if order is not None:
+        lower = order[lower]
+        upper = order[upper]
+    return InterpolationMap(lower, upper, weight, outside)
+
+
+_interp_cache: OrderedDict[tuple[int, int], tuple[Any, Any, InterpolationMap]] = OrderedDict()
+_interp_lock = threading.Lock()
+
+
+def cached_interpolation_map(x_new: Sequence[float], x_old: Sequence[float]) -> InterpolationMap:
+    # Keyed by the identity of both columns: columns are replaced, never mutated, so the same pair of objects
+    # always maps the same way. Entries hold the columns, so their ids cannot be reused while cached.
+    key = (id(x_new), id(x_old))
+    with _interp_lock:
+        entry = _interp_cache.get(key)
+        if entry is not None:
+            _interp_cache.move_to_end(key)
+            return entry[2]
+    mapping = interpolation_map(x_new, x_old)
+    with _interp_lock:
+        _interp_cache[key] = (x_new, x_old, mapping)
+        while len(_interp_cache) > INTERP_CACHE_SIZE:
+            _interp_cache.popitem(last=False)
+    return mapping
+
+
+@dataclass(frozen=True)
+class Operation:
+    op_id: str
+    name: str
+    kernel: Callable[..., Columns]
+    # The keyword the GUI offers for editing, with its default; batch manifests and the API may pass any keyword.
+    parameter: str | None = None
+    default: Any = None
+    choices: tuple[str, ...] = ()
+
+    def coerce(self, text: str) -> Any:
+        # Turns the GUI's parameter text into the keyword's type.
+        if self.parameter is None:
+            return None
+        if self.choices:
+            if text not in self.choices:
+                raise ValueError(f"{self.parameter} must be one of {', '.join(self.choices)}")
+            return text
+        try:
+            return type(self.default)(text)
+        except ValueError as exc:
+            raise ValueError(f"{self.parameter} must be {type(self.default).__name__}") from exc
+
+
+OPERATION_LIST: list[Operation] = [
+    Operation("running_average", "Running average", running_average, "window", 3),
+    Operation("derivative", "Derivative", derivative, "method", "centered", DERIVATIVE_METHODS),
+    Operation("integral", "Integral", integral),
+    Operation("fourier", "Fourier transform", fourier, "output", "magnitude", FOURIER_OUTPUTS),
+    Operation("interpolate", "Interpolation", interpolate, "points", 1000),
+]
+OPERATIONS: dict[str, Operation] = {operation.op_id: operation for operation in OPERATION_LIST}
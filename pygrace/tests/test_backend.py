@@ -30,6 +30,82 @@ def test_apply_transform_creates_dataset_when_target_missing():
     assert datasets[1].y == [2.0, 4.0, 6.0]
 
 
+def test_commit_transform_rejects_results_whose_source_sets_changed():
+    import pytest
+
+    datasets = [Dataset(name="s0", x=[0, 1, 2], y=[0, 2, 0]), Dataset(name="s1", x=[0, 1, 2], y=[5, 5, 5])]
+    backend = PlotBackend(datasets, PlotState(None, None, None, None, True), None)
+
+    from_y0 = backend.evaluate_transform("y1 = y0 * 2")
+    into_new = backend.evaluate_transform("y2 = y1 + 1")
+    unrelated = backend.evaluate_transform("y1 = y1 + 1")
+    backend.align_extrema([(datasets[0], ("max", 1, 1.0, 10.0))])
+
+    with pytest.raises(ValueError, match="s0 changed while the transform was running"):
+        backend.commit_transform(from_y0)
+    assert datasets[1].y == [5, 5, 5]
+    assert backend.commit_transform(unrelated) == 1
+
+    with pytest.raises(ValueError, match="changed while the transform was running"):
+        backend.commit_transform(into_new)
+    fresh = backend.evaluate_transform("y2 = y1 + 1")
+    backend.apply_operation(0, "integral")
+    with pytest.raises(ValueError, match="set2 changed"):
+        backend.commit_transform(fresh)
+    assert len(backend.datasets) == 3
+
+
+def test_align_extrema_twice_with_entries_from_aligned_sets_is_stable():
+    ds0 = Dataset(name="a", x=[0, 1, 2], y=[0, 2, 0])
+    ds1 = Dataset(name="b", x=[0, 1, 2], y=[0, 4, 0])
+    backend = PlotBackend([ds0, ds1], PlotState(None, None, None, None, True), None)
+
+    backend.align_extrema([(ds0, ("max", 1, 1.0, 2.0)), (ds1, ("max", 1, 1.0, 4.0))])
+    backend.align_extrema([(ds, backend.dataset_extrema(ds)[0]) for ds in (ds0, ds1)])
+
+    assert ds0.y == [1.0, 3.0, 1.0]
+    assert ds1.y == [-1.0, 3.0, -1.0]
+
+
+def test_evaluate_transform_is_read_only_and_commit_rejects_stale_results():
+    datasets = [Dataset(name="s0", x=[0, 1, 2], y=[1, 2, 3])]
+    backend = PlotBackend(datasets, PlotState(None, None, None, None, True), None)
+
+    result = backend.evaluate_transform("y0 = y0 * 10")
+    stale = backend.evaluate_transform("y0 = y0 + 1")
+    assert datasets[0].y == [1, 2, 3]
+
+    assert backend.commit_transform(result) == 0
+    assert datasets[0].y == [10.0, 20.0, 30.0]
+    try:
+        backend.commit_transform(stale)
+    except ValueError as exc:
+        assert "changed while the transform was running" in str(exc)
+    else:
+        raise AssertionError("stale transform was committed")
+    assert datasets[0].y == [10.0, 20.0, 30.0]
+
+
+def test_transform_resamples_sets_with_different_x_through_interp():
+    datasets = [
+        Dataset(name="fine", x=[0, 1, 2, 3, 4], y=[0, 10, 20, 30, 40]),
+        Dataset(name="coarse", x=[4, 0, 2], y=[4, 0, 2]),
+    ]
+    backend = PlotBackend(datasets, PlotState(None, None, None, None, True), None)
+
+    try:
+        backend.apply_transform("y2 = y0 - y1")
+    except ValueError as exc:
+        assert "interp(" in str(exc)
+    else:
+        raise AssertionError("mismatched lengths were combined")
+
+    assert backend.apply_transform("y2 = y0 - interp(x0, x1, y1)") == 2
+    assert backend.datasets[2].y == [0.0, 9.0, 18.0, 27.0, 36.0]
+    resampled = backend.evaluate_transform("y1 = interp(x1, x0, y0)")
+    assert resampled.values == [40.0, 0.0, 20.0]
+
+
 def test_align_extrema_shifts_dataset_to_common_y():
     ds0 = Dataset(name="a", x=[0, 1, 2], y=[0, 2, 0])
     ds1 = Dataset(name="b", x=[0, 1, 2], y=[0, 4, 0])
@@ -56,6 +132,18 @@ def test_extrema_falls_back_to_global_when_no_local_extrema():
     assert extrema[1][0] == "max"
 
 
+def test_extrema_and_align_accept_array_backed_sets():
+    import numpy as np
+
+    backend = PlotBackend.from_data([(np.arange(5.0), np.arange(5.0)), (np.arange(5.0), np.array([0, 3, 1, 2, 0.0]))])
+    rising, peaked = backend.datasets
+
+    assert backend.extrema_for_dataset(rising) == [("min", 0, 0.0, 0.0), ("max", 4, 4.0, 4.0)]
+    backend.align_extrema([(rising, backend.extrema_for_dataset(rising)[1]), (peaked, ("max", 1, 1.0, 3.0))])
+    assert rising.y[4] == peaked.y[1] == 3.5
+    assert backend.dataset_extrema(Dataset(name="empty", x=np.empty(0), y=np.empty(0))) == []
+
+
 def test_plot_datasets_respects_visibility_and_legend_labels():
     ds0 = Dataset(name="a", x=[0, 1], y=[1, 2], line_color="red")
     ds1 = Dataset(name="b", x=[0, 1], y=[2, 3], line_color="blue")
@@ -233,3 +321,203 @@ def test_render_draws_linear_regression_plugin_line():
     assert x_vals == [0, 3]
     assert y_vals == [1.0, 7.0]
     plt.close(fig)
+
+
+def test_linear_regression_uses_prepared_fit_only_while_columns_match():
+    ds = Dataset(name="lin", x=[0, 1, 2, 3], y=[1, 3, 5, 7])
+    backend = PlotBackend([ds], PlotState(None, None, None, None, True), None)
+    config = backend.plugin_config(LINEAR_REGRESSION_PLUGIN_ID, dataset_index=0)
+    prepared = backend.prepare_plugin(LINEAR_REGRESSION_PLUGIN_ID, config)
+    assert prepared["line"] == ([0, 3], [1.0, 7.0])
+
+    fig, ax = plt.subplots()
+    backend.enable_plugin(
+        LINEAR_REGRESSION_PLUGIN_ID, prepared=dict(prepared, line=([0, 3], [0.0, 0.0])), dataset_index=0
+    )
+    backend.render(ax)
+    assert ax.lines[-1].get_ydata().tolist() == [0.0, 0.0]
+
+    ds.y = [2, 4, 6, 8]
+    backend.render(ax)
+    assert ax.lines[-1].get_ydata().tolist() == [2.0, 8.0]
+
+    backend.disable_plugin(LINEAR_REGRESSION_PLUGIN_ID)
+    assert backend.plugin_prepared == {}
+    plt.close(fig)
+
+
+def test_render_hardcopy_is_pyplot_free_and_thread_safe(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    open_figures = plt.get_fignums()
+
+    def render(idx: int):
+        output = tmp_path / f"plot{idx}.png"
+        render_hardcopy(
+            datasets=[Dataset(name=f"s{idx}", x=[0, 1, 2], y=[idx, idx + 1, idx])],
+            output_path=output,
+            title=f"Plot {idx}",
+            xlabel="X",
+            ylabel="Y",
+            world=None,
+            autoscale=True,
+            legend_labels=None,
+        )
+        return output
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        outputs = list(pool.map(render, range(8)))
+
+    assert all(output.stat().st_size > 0 for output in outputs)
+    assert plt.get_fignums() == open_figures
+
+
+def test_render_bytes_returns_image_in_requested_format():
+    backend = PlotBackend.from_data([([0, 1, 2], [1, 3, 2])])
+
+    assert backend.render_bytes("png").startswith(b"\x89PNG")
+    assert b"<svg" in backend.render_bytes("svg")
+    assert backend.render_bytes("PDF").startswith(b"%PDF")
+    try:
+        backend.render_bytes("bmp")
+        assert False, "Expected ValueError"
+    except ValueError as exc:
+        assert "bmp" in str(exc)
+
+
+def test_render_to_writes_into_caller_buffer():
+    import io
+
+    buffer = io.BytesIO()
+    backend = PlotBackend.from_data([Dataset(name="a", x=[0, 1], y=[1, 2])])
+
+    backend.render_to(buffer, fmt="png")
+
+    assert buffer.getvalue().startswith(b"\x89PNG")
+
+
+def test_from_data_keeps_array_columns_without_copying():
+    import numpy as np
+
+    x = np.linspace(0.0, 1.0, 5)
+    y = x**2
+    dy = np.full(5, 0.1)
+    ds = Dataset(name="ready", x=[0, 1], y=[0, 1])
+
+    backend = PlotBackend.from_data([(x, y, dy), ds])
+
+    assert backend.datasets[0].x is x
+    assert backend.datasets[0].y is y
+    assert backend.datasets[0].dy is dy
+    assert backend.datasets[0].dx is None
+    assert backend.datasets[1] is ds
+
+
+def test_plot_datasets_rasterizes_only_sets_above_threshold():
+    dense = Dataset(name="dense", x=list(range(50)), y=list(range(50)), dy=[0.1] * 50)
+    sparse = Dataset(name="sparse", x=[0, 1], y=[1, 0])
+    state = PlotState(None, None, None, None, True, raster_threshold=10)
+    backend = PlotBackend([dense, sparse], state, None)
+
+    fig, ax = plt.subplots()
+    backend.plot_datasets(ax)
+
+    assert [line.get_rasterized() for line in ax.lines[:1]] == [True]
+    assert ax.lines[-1].get_rasterized() is False
+    assert all(c.get_rasterized() for c in ax.collections)
+    assert ax.title.get_rasterized() is False
+    plt.close(fig)
+
+
+def test_density_grid_bins_points_in_chunks():
+    from pygrace.density import density_grid
+
+    x = [0.1, 0.1, 0.9, 5.0]
+    y = [0.1, 0.2, 0.9, 5.0]
+
+    grid = density_grid(x, y, [0.0, 1.0, 0.0, 1.0], (2, 2), chunk=2)
+
+    assert grid.tolist() == [[2, 0], [0, 1]]
+
+
+def test_plot_datasets_draws_dense_sets_as_image_and_rebins_on_zoom():
+    import numpy as np
+
+    x = np.linspace(0.0, 10.0, 5000)
+    ds = Dataset(name="cloud", x=x, y=np.sin(x), line_style="None", marker="o")
+    state = PlotState(None, None, None, None, True, density_threshold=1000)
+    backend = PlotBackend([ds], state, ["cloud"])
+
+    fig, ax = plt.subplots()
+    backend.plot_datasets(ax)
+
+    assert len(ax.lines) == 0
+    assert len(ax.images) == 1
+    image = ax.images[0]
+    assert int(image.get_array().sum()) == 5000
+    assert [text.get_text() for text in ax.get_legend().get_texts()] == ["cloud"]
+
+    ax.set_xlim(0.0, 1.0)
+
+    assert tuple(round(v, 6) for v in image.get_extent()[:2]) == (0.0, 1.0)
+    assert int(image.get_array().sum()) == int(np.count_nonzero(x <= 1.0))
+    plt.close(fig)
+
+
+def test_render_with_world_draws_only_the_visible_window_of_sorted_sets():
+    sorted_set = Dataset(name="sorted", x=list(range(1000)), y=[0.0] * 1000, dy=[0.1] * 1000)
+    shuffled = Dataset(name="shuffled", x=[3, 1, 2, 0], y=[0, 1, 2, 3])
+    state = PlotState(None, None, None, [100, 109.5, -1, 1], False)
+    backend = PlotBackend([sorted_set, shuffled], state, None)
+
+    fig, ax = plt.subplots()
+    backend.render(ax)
+
+    def xdata(label):
+        (line,) = [line for line in ax.lines if line.get_label() == label]
+        return list(line.get_xdata())
+
+    assert xdata("sorted") == list(range(99, 111))
+    assert len(xdata("shuffled")) == 4
+    assert ax.get_xlim() == (100, 109.5)
+    assert backend.clipped_to == (100, 109.5)
+    assert backend.clip_covers(101, 105)
+    assert not backend.clip_covers(50, 105)
+
+    backend.render(ax, (0, 5))
+    assert xdata("sorted") == list(range(0, 7))
+
+    state.world = None
+    backend.render(ax)
+    assert len(xdata("sorted")) == 1000
+    assert backend.clipped_to is None
+    plt.close(fig)
+
+
+def test_autoscale_reads_warm_dataset_stats_instead_of_relim(monkeypatch):
+    datasets = [
+        Dataset(name="a", x=[0, 1, 2, 3], y=[1, 2, 5, 3], dy=[0.5] * 4),
+        Dataset(name="b", x=[1, float("nan"), 4], y=[0, 1, 2]),
+        Dataset(name="hidden", x=[-100, 100], y=[-100, 100]),
+    ]
+    backend = PlotBackend.from_data(datasets)
+    backend.set_dataset_visible(2, False)
+
+    fig, ax = plt.subplots()
+    backend.render(ax)
+    relim_limits = (ax.get_xlim(), ax.get_ylim())
+    assert [ds.name for ds, _version, _snapshot in backend.stale_stats()] == ["a", "b"]
+
+    for ds, version, stats in PlotBackend.summarize(backend.stale_stats()):
+        ds.store_stats(version, stats)
+    assert backend.stale_stats() == []
+    assert backend.data_limits() == (0, 4, 0, 5.5)
+
+    def no_relim(*_args):
+        raise AssertionError("relim() with warm stats")
+
+    monkeypatch.setattr(ax, "relim", no_relim)
+    backend.render(ax)
+    assert (ax.get_xlim(), ax.get_ylim()) == relim_limits
+    assert [row["count"] for row in backend.stats_report()] == [4, 2, 2]
+    plt.close(fig)
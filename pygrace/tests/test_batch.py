@@ -0,0 +1,158 @@
+import json
+from pathlib import Path
+
+from pygrace.batch import load_manifest, run_batch
+from pygrace.cli import main
+
+
+def _write_xy(path: Path) -> Path:
+    path.write_text("0 1\n1 3\n2 2\n", encoding="utf-8")
+    return path
+
+
+def test_load_manifest_reads_json_lines(tmp_path: Path):
+    manifest = tmp_path / "jobs.jsonl"
+    manifest.write_text(
+        "# nightly plots\n"
+        + json.dumps({"files": ["a.dat"], "printfile": "a.png", "legend": "A", "world": [0, 1, 2, 3]})
+        + "\n"
+        + json.dumps({"files": ["b.dat", "c.dat"], "bxy": ["1:2:3"], "output": "b.png", "device": "png"})
+        + "\n",
+        encoding="utf-8",
+    )
+
+    jobs = load_manifest(manifest)
+
+    assert len(jobs) == 2
+    assert jobs[0].legend_labels == ["A"]
+    assert jobs[0].world == [0.0, 1.0, 2.0, 3.0]
+    assert jobs[1].printfile == Path("b.png")
+    assert jobs[1].bxy_specs == ["1:2:3", None]
+    assert jobs[1].device == "PNG"
+
+
+def test_load_manifest_reports_bad_job(tmp_path: Path):
+    manifest = tmp_path / "jobs.jsonl"
+    manifest.write_text(json.dumps({"files": ["a.dat"]}) + "\n", encoding="utf-8")
+
+    try:
+        load_manifest(manifest)
+        assert False, "Expected ValueError"
+    except ValueError as exc:
+        assert "job 0" in str(exc)
+        assert "printfile" in str(exc)
+
+
+def test_main_batch_reports_mistyped_fields_instead_of_crashing(tmp_path: Path, capsys):
+    manifest = tmp_path / "jobs.jsonl"
+    toml = tmp_path / "jobs.toml"
+    toml.write_text("job = [1]\n", encoding="utf-8")
+    base = {"files": ["a.dat"], "printfile": "a.png"}
+    cases = [
+        ("world", 5, "world must have 4 values"),
+        ("world", [0, 1, "a", 2], "world values must be numbers"),
+        ("raster_threshold", [1], "raster_threshold must be an integer"),
+        ("envelope_bins", "many", "envelope_bins must be an integer"),
+        ("legend", 3, "legend must be"),
+        ("device", 1, "device must be a string"),
+    ]
+    for key, value, message in cases:
+        manifest.write_text(json.dumps(dict(base, **{key: value})) + "\n", encoding="utf-8")
+        assert main(["-batch", str(manifest)]) == 2
+        assert f"job 0: {message}" in capsys.readouterr().err
+
+    assert main(["-batch", str(toml)]) == 2
+    assert "job 0: job must be a table" in capsys.readouterr().err
+
+
+def test_run_batch_renders_jobs_and_reports_failures(tmp_path: Path):
+    data = _write_xy(tmp_path / "a.dat")
+    manifest = tmp_path / "jobs.jsonl"
+    manifest.write_text(
+        json.dumps({"files": [str(data)], "printfile": str(tmp_path / "a.png"), "title": "A"})
+        + "\n"
+        + json.dumps({"files": [str(data)], "bxy": ["1:a"], "printfile": str(tmp_path / "bad.png")})
+        + "\n",
+        encoding="utf-8",
+    )
+
+    seen = []
+    results = run_batch(load_manifest(manifest), workers=1, on_result=seen.append)
+
+    assert [result.index for result in results] == [0, 1]
+    assert len(seen) == 2
+    assert results[0].ok
+    assert results[0].seconds >= 0
+    assert (tmp_path / "a.png").stat().st_size > 0
+    assert not results[1].ok
+    assert "indices" in (results[1].error or "")
+
+
+def test_main_batch_returns_nonzero_when_a_job_fails(tmp_path: Path, capsys):
+    data = _write_xy(tmp_path / "a.dat")
+    manifest = tmp_path / "jobs.jsonl"
+    manifest.write_text(
+        json.dumps({"files": [str(data)], "printfile": str(tmp_path / "a.png")})
+        + "\n"
+        + json.dumps({"files": [str(data)], "bxy": ["1:0"], "printfile": str(tmp_path / "b.png")})
+        + "\n",
+        encoding="utf-8",
+    )
+
+    rc = main(["-batch", str(manifest), "-workers", "2"])
+    captured = capsys.readouterr()
+
+    assert rc == 1
+    assert "\tok\t" in captured.out
+    assert "\tFAILED\t" in captured.out
+    assert "1/2 jobs rendered" in captured.err
+
+
+def test_run_batch_applies_operations_before_rendering(tmp_path: Path):
+    from pygrace.hardcopy import job_backend
+
+    data = _write_xy(tmp_path / "a.dat")
+    entry = {
+        "files": [str(data)],
+        "printfile": str(tmp_path / "a.png"),
+        "operations": [{"op": "running_average", "window": 2}, {"op": "integral", "set": 1}],
+    }
+    manifest = tmp_path / "jobs.jsonl"
+    manifest.write_text(
+        json.dumps(entry) + "\n" + json.dumps(dict(entry, operations=[{"op": "smooth"}])) + "\n",
+        encoding="utf-8",
+    )
+
+    jobs = load_manifest(manifest)
+    backend = job_backend(jobs[0])
+    results = run_batch(jobs, workers=1)
+
+    names = [ds.name for ds in backend.datasets]
+    assert names == ["a.dat", "running_average(a.dat)", "integral(running_average(a.dat))"]
+    assert backend.datasets[2].y.tolist() == [0.0, 2.25]
+    assert results[0].ok
+    assert not results[1].ok
+    assert "Unknown operation" in (results[1].error or "")
+
+
+def test_run_batch_incremental_skips_unchanged_jobs(tmp_path: Path):
+    data = _write_xy(tmp_path / "a.dat")
+    index_path = tmp_path / "index.json"
+    manifest = tmp_path / "jobs.jsonl"
+    manifest.write_text(
+        json.dumps({"files": [str(data)], "printfile": str(tmp_path / "a.png"), "incremental": True})
+        + "\n"
+        + json.dumps({"files": [str(data)], "printfile": str(tmp_path / "b.png"), "title": "B", "incremental": True})
+        + "\n",
+        encoding="utf-8",
+    )
+
+    first = run_batch(load_manifest(manifest), hash_index=index_path)
+    second = run_batch(load_manifest(manifest), hash_index=index_path)
+    manifest.write_text(manifest.read_text(encoding="utf-8").replace('"B"', '"B2"'), encoding="utf-8")
+    third = run_batch(load_manifest(manifest), hash_index=index_path)
+
+    assert [result.skipped for result in first] == [False, False]
+    assert [result.skipped for result in second] == [True, True]
+    assert [result.skipped for result in third] == [True, False]
+    assert len(json.loads(index_path.read_text(encoding="utf-8"))) == 2
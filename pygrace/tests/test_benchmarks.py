@@ -0,0 +1,84 @@
+import importlib
+import importlib.util
+import io
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+BENCH_PATH = Path(__file__).resolve().parents[1] / "benchmarks" / "bench.py"
+
+
+def _load_bench():
+    if "pygrace_bench" in sys.modules:
+        return sys.modules["pygrace_bench"]
+    spec = importlib.util.spec_from_file_location("pygrace_bench", BENCH_PATH)
+    module = importlib.util.module_from_spec(spec)
+    # Registered before running so the module's dataclasses can resolve their own module.
+    sys.modules["pygrace_bench"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_compare_flags_only_slowdowns_past_threshold_and_noise_floor():
+    bench = _load_bench()
+    baseline = {"results": {"a": {"seconds": 1.0}, "b": {"seconds": 1.0}, "c": {"seconds": 0.001}}}
+    current = {
+        "results": {"a": {"seconds": 1.2}, "b": {"seconds": 1.5}, "c": {"seconds": 0.003}, "new": {"seconds": 9.0}}
+    }
+
+    assert bench.compare(current, baseline, threshold=0.25, min_seconds=0.005) == [("b", 1.0, 1.5)]
+
+
+def test_run_cases_times_every_selected_case(tmp_path: Path):
+    bench = _load_bench()
+    cases = bench.build_cases([50], [3], tmp_path)
+
+    report = bench.run_cases(cases, repeat=2, pattern="load_datasets", log=io.StringIO())
+
+    assert set(report["results"]) == {
+        "load_datasets/whitespace/50",
+        "load_datasets/csv/50",
+        "load_datasets/bxy/50",
+        "load_datasets/sets/3",
+    }
+    assert all(len(entry["runs"]) == 2 for entry in report["results"].values())
+    json.dumps(report)
+
+
+def test_main_fails_on_regression_against_baseline(tmp_path: Path):
+    bench = _load_bench()
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps({"results": {"find_local_extrema/200": {"seconds": 0.0}}}), encoding="utf-8")
+    output = tmp_path / "current.json"
+
+    args = ["--points", "200", "--datasets", "1", "--repeat", "1", "-k", "find_local_extrema/"]
+    assert bench.main(args + ["--output", str(output)]) == 0
+    assert "find_local_extrema/200" in json.loads(output.read_text(encoding="utf-8"))["results"]
+    assert bench.main(args + ["--baseline", str(baseline), "--min-seconds", "0"]) == 1
+
+
+def test_gui_latency_harness_drives_real_widgets(tmp_path: Path, monkeypatch):
+    pytest.importorskip("PySide6")
+    monkeypatch.setenv("QT_QPA_PLATFORM", "offscreen")
+    monkeypatch.syspath_prepend(str(BENCH_PATH.parent))
+    _load_bench()
+    gui_latency = importlib.import_module("gui_latency")
+
+    results = gui_latency.run_interactions(sets=2, points=50, repeat=1, log=io.StringIO())
+    results.update(gui_latency.time_to_first_window(200, tmp_path, log=io.StringIO()))
+    results.update(gui_latency.time_to_first_plot(3, log=io.StringIO()))
+    results.update(gui_latency.time_hover(500, moves=5, log=io.StringIO()))
+
+    assert set(results) == {
+        "gui/tick_size_slider/2x50",
+        "gui/title_size_slider/2x50",
+        "gui/toggle_dataset/2x50",
+        "gui/rename_dataset/2x50",
+        "gui/apply_transform/2x50",
+        "gui/first_window/200",
+        "gui/first_plot/sets/3",
+        "gui/hover/500",
+    }
+    assert all(entry["seconds"] > 0 for entry in results.values())
@@ -1,3 +1,9 @@
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
 from pygrace.cli import main
 
 
@@ -7,3 +13,114 @@ def test_main_rejects_more_bxy_specs_than_files(capsys):
 
     assert rc == 2
     assert "more -bxy specs than data files" in captured.err
+
+
+def test_version_cold_start_skips_heavy_imports_and_stays_within_budget():
+    src = str(Path(__file__).resolve().parents[1] / "src")
+    env = dict(os.environ)
+    env["PYTHONPATH"] = src + os.pathsep + env.get("PYTHONPATH", "")
+    budget = float(os.environ.get("PYGRACE_STARTUP_BUDGET", "1.0"))
+    probe = (
+        "import sys\n"
+        "from pygrace.cli import main\n"
+        "try:\n"
+        "    main(['-version'])\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "heavy = sorted(m for m in ('matplotlib', 'numpy', 'PySide6', 'pygrace.gui') if m in sys.modules)\n"
+        "print('heavy:' + ','.join(heavy))\n"
+    )
+
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, env=env, check=True)
+    elapsed = time.perf_counter() - start
+
+    assert result.stdout.splitlines() == ["pygrace 0.1.0", "heavy:"]
+    assert elapsed < budget, f"-version cold start took {elapsed:.3f}s (budget {budget:.3f}s)"
+
+
+def test_hardcopy_vector_device_rasterizes_dense_sets(tmp_path: Path):
+    data = tmp_path / "dense.dat"
+    data.write_text("".join(f"{i} {(i * 7919) % 1000}\n" for i in range(20000)), encoding="utf-8")
+    raster = tmp_path / "raster.svg"
+    vector = tmp_path / "vector.svg"
+
+    common = ["-hardcopy", "-noserver", "-device", "svg", str(data)]
+    assert main(common + ["-printfile", str(raster), "-rasterthreshold", "1000"]) == 0
+    assert main(common + ["-printfile", str(vector), "-rasterthreshold", "0"]) == 0
+
+    assert b"<image" in raster.read_bytes()
+    assert b"<image" not in vector.read_bytes()
+    assert raster.stat().st_size < vector.stat().st_size
+
+
+def test_hardcopy_device_defaults_to_the_printfile_suffix(tmp_path: Path):
+    data = tmp_path / "a.dat"
+    data.write_text("0 1\n1 3\n", encoding="utf-8")
+
+    for name, magic in (("a.pdf", b"%PDF"), ("a.svg", b"<?xml"), ("a.out", b"\x89PNG"), ("b.svg", b"\x89PNG")):
+        device = ["-device", "png"] if name == "b.svg" else []
+        assert main(["-hardcopy", "-noserver", *device, "-printfile", str(tmp_path / name), str(data)]) == 0
+        assert (tmp_path / name).read_bytes().startswith(magic)
+
+
+def test_hardcopy_rejects_unknown_device(tmp_path: Path, capsys):
+    rc = main(["-hardcopy", "-device", "GIF", "-printfile", str(tmp_path / "a.gif")])
+    captured = capsys.readouterr()
+
+    assert rc == 2
+    assert "unsupported device GIF" in captured.err
+
+
+def test_incremental_hardcopy_uses_sidecar_hash(tmp_path: Path):
+    data = tmp_path / "a.dat"
+    data.write_text("0 1\n1 3\n", encoding="utf-8")
+    output = tmp_path / "out.png"
+    argv = ["-hardcopy", "-noserver", "-incremental", "-printfile", str(output), str(data)]
+
+    assert main(argv) == 0
+    sidecar = tmp_path / "out.png.pygrace-hash"
+    first_hash = sidecar.read_text(encoding="utf-8")
+    output.write_bytes(b"stale")
+
+    assert main(argv) == 0
+    assert output.read_bytes() == b"stale"
+
+    assert main(argv + ["-title", "changed"]) == 0
+    assert output.read_bytes().startswith(b"\x89PNG")
+    assert sidecar.read_text(encoding="utf-8") != first_hash
+
+
+def test_hardcopy_reads_stdin_and_is_never_skipped_as_up_to_date(tmp_path: Path):
+    src = str(Path(__file__).resolve().parents[1] / "src")
+    env = dict(os.environ)
+    env["PYTHONPATH"] = src + os.pathsep + env.get("PYTHONPATH", "")
+    output = tmp_path / "out.png"
+    data = "".join(f"{i} {i * i} {-i}\n" for i in range(5000))
+
+    for flag in ("-", "-pipe"):
+        output.write_bytes(b"stale")
+        argv = ["-hardcopy", "-noserver", "-incremental", "-printfile", str(output), flag]
+        subprocess.run(
+            [sys.executable, "-m", "pygrace", *argv], input=data, text=True, env=env, check=True, timeout=120
+        )
+        assert output.read_bytes().startswith(b"\x89PNG")
+
+
+def test_outofcore_rejects_stdin_and_pipes(tmp_path: Path, capsys):
+    fifo = tmp_path / "feed"
+    os.mkfifo(fifo)
+
+    assert main(["-outofcore", "-npipe", str(fifo)]) == 2
+    assert "-outofcore needs regular files" in capsys.readouterr().err
+    assert main(["-hardcopy", "-noserver", "-outofcore", "-printfile", str(tmp_path / "a.png"), "-", str(fifo)]) == 2
+    assert "not stdin, feed" in capsys.readouterr().err
+
+
+def test_npipe_rejects_paths_that_are_not_named_pipes(tmp_path: Path, capsys):
+    data = tmp_path / "a.dat"
+    data.write_text("0 1\n", encoding="utf-8")
+
+    assert main(["-npipe", str(data)]) == 2
+    assert "-npipe needs a named pipe" in capsys.readouterr().err
+    assert main(["-hardcopy", "-noserver", "-printfile", str(tmp_path / "a.png"), "-npipe", str(tmp_path / "no")]) == 2
@@ -0,0 +1,71 @@
+import math
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+from matplotlib.backend_bases import MouseEvent  # noqa: E402
+from matplotlib.backends.backend_agg import FigureCanvasAgg  # noqa: E402
+from matplotlib.figure import Figure  # noqa: E402
+
+from pygrace.backend import PlotBackend  # noqa: E402
+from pygrace.cursor import PointIndex  # noqa: E402
+from pygrace.data import Dataset  # noqa: E402
+
+
+def _identity(points):
+    return points
+
+
+def test_point_index_searches_only_the_x_window_and_maps_back_to_input_order():
+    index = PointIndex([3.0, 0.0, math.nan, 1.0, 2.0], [30.0, 0.0, 5.0, 10.0, 20.0])
+
+    assert index.order is not None
+    idx, dist = index.nearest((1.2, 10.0), 0.5, 1.5, _identity)
+    assert (idx, round(dist, 9)) == (3, 0.2)
+    assert index.nearest((2.9, 29.0), 2.5, 3.5, _identity)[0] == 0
+    assert index.nearest((10.0, 0.0), 9.0, 11.0, _identity) is None
+
+    sorted_index = PointIndex([0, 1, 2], [5, 6, 7])
+    assert sorted_index.order is None
+    assert sorted_index.nearest((2.0, 7.0), 1.5, 2.5, _identity) == (2, 0.0)
+
+
+def test_hover_cursor_blits_the_overlay_without_redrawing_the_plot():
+    fig = Figure()
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    datasets = [Dataset(name="a", x=[0, 1, 2, 3], y=[0, 1, 4, 9]), Dataset(name="b", x=[0, 1, 2, 3], y=[5, 5, 5, 5])]
+    backend = PlotBackend.from_data(datasets)
+    backend.render(ax)
+
+    from pygrace.cursor import HoverCursor
+
+    readouts = []
+    cursor = HoverCursor(canvas, ax, backend.visible_datasets, readouts.append)
+    draws = []
+    canvas.mpl_connect("draw_event", draws.append)
+    canvas.draw()
+
+    def move_to(x, y):
+        px, py = ax.transData.transform((x, y))
+        canvas.callbacks.process("motion_notify_event", MouseEvent("motion_notify_event", canvas, px, py))
+
+    move_to(2.0, 4.1)
+    assert readouts[-1] == "a [2]  x=2  y=4"
+    move_to(1.0, 5.1)
+    assert readouts[-1].startswith("b [1]")
+    assert len(draws) == 1
+
+    backend.set_dataset_visible(1, False)
+    datasets[0].y = [0, 1, 6, 9]
+    backend.render(ax)
+    canvas.draw()
+    move_to(2.0, 6.0)
+    assert readouts[-1] == "a [2]  x=2  y=6"
+    move_to(1.0, 5.1)
+    assert readouts[-1] == ""
+
+    cursor.set_enabled(False)
+    move_to(2.0, 6.0)
+    assert readouts[-1] == ""
@@ -1,6 +1,6 @@
 from pathlib import Path
 
-from pygrace.data import _parse_xy_lines
+from pygrace.data import Dataset, _parse_xy_lines
 from pygrace.data import load_datasets
 
 
@@ -46,6 +46,42 @@ def test_load_datasets_multicolumn_defaults_to_multiple_sets(tmp_path: Path):
     assert datasets[1].y == [100.0, 101.0, 102.0]
 
 
+def test_multicolumn_sets_share_one_read_only_x_column(tmp_path: Path):
+    import pickle
+
+    import pytest
+
+    from pygrace.backend import PlotBackend
+    from pygrace.data import SharedColumn
+
+    path = tmp_path / "wide.dat"
+    path.write_text("".join(f"{i} {i} {2 * i} {3 * i}\n" for i in range(100)), encoding="utf-8")
+    backend = PlotBackend.from_data(load_datasets([path]))
+    first, second, third = backend.datasets
+
+    assert isinstance(first.x, SharedColumn)
+    assert second.x is first.x and third.x is first.x
+    with pytest.raises(TypeError):
+        first.x.append(100.0)
+    with pytest.raises(TypeError):
+        first.x[0] = 1.0
+    assert pickle.loads(pickle.dumps(first.x)) == first.x
+    assert first.x_monotonic() and second.x_monotonic()
+
+    report = backend.memory_report()
+    assert report[0]["data_bytes"] > report[1]["data_bytes"] == report[2]["data_bytes"]
+
+    backend.align_extrema([(first, ("max", 99, 99.0, 99.0)), (second, ("max", 99, 99.0, 198.0))])
+    backend.apply_transform("y1 = y1 * 2")
+    backend.apply_transform("y3 = y0 + y2")
+    assert second.x is first.x and backend.datasets[3].x is first.x
+
+    # Changing one set's x replaces its column; the others keep the shared one.
+    backend.apply_transform("x2 = x2 * 10")
+    assert third.x[1] == 10.0 and first.x[1] == 1.0
+    assert second.x is first.x
+
+
 def test_load_datasets_bxy_xy(tmp_path: Path):
     path = tmp_path / "cols.dat"
     path.write_text(
@@ -109,3 +145,102 @@ def test_load_datasets_invalid_bxy_raises(tmp_path: Path):
         assert False, "Expected ValueError"
     except ValueError as exc:
         assert "indices" in str(exc)
+
+
+def test_dataset_version_bumps_only_when_a_data_column_is_replaced():
+    ds = Dataset(name="a", x=[0.0, 1.0], y=[1.0, 2.0])
+    assert ds.version == 0
+
+    ds.name = "renamed"
+    ds.line_color = "red"
+    assert ds.version == 0
+
+    ds.y = [3.0, 4.0]
+    ds.dy = [0.1, 0.1]
+    assert ds.version == 2
+    assert ds == Dataset(name="renamed", x=[0.0, 1.0], y=[3.0, 4.0], dy=[0.1, 0.1], line_color="red")
+
+
+def test_x_monotonic_is_cached_until_x_is_replaced(monkeypatch):
+    import numpy as np
+
+    from pygrace import data
+
+    ds = Dataset(name="a", x=[0.0, 1.0, 1.0, 2.0], y=[0.0] * 4)
+    checks = []
+    real_check = data.is_non_decreasing
+    monkeypatch.setattr(data, "is_non_decreasing", lambda values: checks.append(1) or real_check(values))
+
+    assert ds.x_monotonic() and ds.x_monotonic()
+    assert len(checks) == 1
+
+    ds.x = [0.0, 2.0, 1.0, 3.0]
+    assert not ds.x_monotonic()
+    ds.x = np.array([0.0, np.nan, 1.0, 2.0])
+    assert not ds.x_monotonic()
+    ds.x = np.arange(4.0)
+    assert ds.x_monotonic()
+    assert len(checks) == 4
+
+
+def test_stats_cover_error_bars_and_envelope_skip_non_finite_points_and_follow_the_version():
+    import numpy as np
+
+    from pygrace.data import dataset_stats
+
+    ds = Dataset(
+        name="a",
+        x=[0.0, 1.0, 2.0, float("nan"), 4.0],
+        y=[1.0, 3.0, 5.0, 100.0, 7.0],
+        dx=[0.5] * 5,
+        dy=[0.0, 0.0, 2.0, 0.0, 0.0],
+        envelope=([0.0, 2.0, 4.0, 99.0, 6.0], [2.0, 4.0, 6.0, 101.0, 8.5]),
+    )
+    stats = ds.stats()
+    assert (stats.count, stats.xmin, stats.xmax, stats.ymin, stats.ymax) == (4, -0.5, 4.5, 0.0, 8.5)
+    assert (stats.mean, round(stats.std, 12)) == (4.0, round(float(np.std([1, 3, 5, 7])), 12))
+    assert ds.stats() is stats
+
+    ds.y = [2.0, 2.0, 2.0, 2.0, 2.0]
+    assert ds.cached_stats() is None
+    assert ds.stats().mean == 2.0
+
+    long = Dataset(name="b", x=np.arange(1000.0), y=np.random.default_rng(0).normal(5.0, 2.0, 1000))
+    chunked = dataset_stats(long, chunk=64)
+    assert round(chunked.mean, 9) == round(float(long.y.mean()), 9)
+    assert round(chunked.std, 9) == round(float(long.y.std()), 9)
+    assert dataset_stats(Dataset(name="empty", x=[], y=[])).count == 0
+
+
+def test_stream_inputs_are_parsed_chunk_by_chunk_from_stdin_and_fifos(tmp_path: Path, monkeypatch):
+    import io
+    import os
+    import sys
+    import threading
+
+    from pygrace.data import read_line_chunks
+
+    chunks = list(read_line_chunks(io.BufferedReader(io.BytesIO(b"0 1\n1 2\n2 3"), buffer_size=5), size=5))
+    assert len(chunks) > 2
+    assert [line for chunk in chunks for line in chunk] == ["0 1", "1 2", "2 3"]
+
+    monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(io.BytesIO(b"# header\n0 1 5\n1 2 6\n")))
+    (first, second) = load_datasets([Path("-")])
+    assert (first.name, first.y, second.name, second.y) == ("stdin", [1.0, 2.0], "stdin:col3", [5.0, 6.0])
+
+    fifo = tmp_path / "feed"
+    os.mkfifo(fifo)
+
+    def write() -> None:
+        with fifo.open("w") as out:
+            for i in range(1000):
+                out.write(f"{i} {i * 2}\n")
+                if i % 100 == 0:
+                    out.flush()
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    (ds,) = load_datasets([fifo], ["1:2"])
+    writer.join()
+    assert ds.name == "feed"
+    assert ds.y == [float(i * 2) for i in range(1000)]
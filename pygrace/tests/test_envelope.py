@@ -0,0 +1,64 @@
+from pathlib import Path
+
+import numpy as np
+
+from pygrace import envelope
+from pygrace.backend import PlotBackend, PlotState
+from pygrace.envelope import EnvelopeDataset, load_envelope_datasets
+
+
+def _write_columns(path: Path, n: int) -> Path:
+    with path.open("w", encoding="utf-8") as handle:
+        handle.write("# t a b\n")
+        for i in range(n):
+            handle.write(f"{i} {np.sin(i / 50.0):.6f} {i % 7}\n")
+    return path
+
+
+def test_envelope_keeps_extremes_with_bounded_bins(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(envelope, "CHUNK_LINES", 100)
+    path = _write_columns(tmp_path / "traj.dat", 5000)
+
+    datasets = load_envelope_datasets([path], bins=64)
+
+    assert [ds.name for ds in datasets] == ["traj.dat", "traj.dat:col3"]
+    a, b = datasets
+    assert isinstance(a, EnvelopeDataset)
+    assert len(a.x) <= 64
+    assert a.source is b.source
+    assert a.source.rows == 5000
+    assert a.source.monotonic
+    lower, upper = b.envelope
+    assert float(np.min(lower)) == 0.0
+    assert float(np.max(upper)) == 6.0
+    assert abs(float(np.mean(b.y)) - np.mean([i % 7 for i in range(5000)])) < 0.05
+
+
+def test_refine_envelopes_reads_only_the_visible_byte_range(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(envelope, "CHUNK_LINES", 100)
+    path = _write_columns(tmp_path / "traj.dat", 5000)
+    datasets = load_envelope_datasets([path], bxy_specs=["1:3"], bins=64)
+    backend = PlotBackend(datasets, PlotState(None, None, None, None, True), None)
+    source = datasets[0].source
+
+    start, stop = source.byte_range(2000.0, 2100.0)
+    changed = backend.refine_envelopes(2000.0, 2100.0)
+
+    assert 0 < start < stop < path.stat().st_size
+    assert changed
+    assert float(np.min(datasets[0].x)) >= 2000.0
+    assert float(np.max(datasets[0].x)) <= 2100.0
+    assert 32 < len(datasets[0].x) <= 64
+    assert not backend.refine_envelopes(2000.0, 2100.0)
+
+
+def test_out_of_core_hardcopy_renders_envelope(tmp_path: Path):
+    from pygrace.cli import main
+
+    path = _write_columns(tmp_path / "traj.dat", 2000)
+    output = tmp_path / "out.png"
+
+    rc = main(["-hardcopy", "-noserver", "-outofcore", "-envelopebins", "32", "-printfile", str(output), str(path)])
+
+    assert rc == 0
+    assert output.read_bytes().startswith(b"\x89PNG")
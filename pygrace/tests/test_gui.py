@@ -0,0 +1,286 @@
+from concurrent.futures import Future
+
+import pytest
+
+from pygrace.data import Dataset
+from pygrace.gui import BackgroundJobs
+
+
+class ManualExecutor:
+    def __init__(self):
+        self.queued = []
+
+    def submit(self, fn):
+        future = Future()
+        self.queued.append((future, fn))
+        return future
+
+    def run_all(self):
+        for future, fn in self.queued:
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(fn())
+                except Exception as exc:  # noqa: BLE001
+                    future.set_exception(exc)
+        self.queued.clear()
+
+
+def test_background_jobs_supersede_pending_work_of_the_same_kind():
+    executor = ManualExecutor()
+    busy = []
+    applied = []
+    jobs = BackgroundJobs(executor, busy.append)
+
+    jobs.submit("transform", lambda: "first", applied.append)
+    first = executor.queued[0][0]
+    jobs.submit("transform", lambda: "second", applied.append)
+    jobs.submit("extrema", lambda: "extrema", applied.append)
+    assert first.cancelled()
+    assert jobs.busy
+
+    executor.run_all()
+    jobs.poll()
+
+    assert applied == ["second", "extrema"]
+    assert not jobs.busy
+    assert busy[-1] is False
+
+
+def test_background_jobs_discard_superseded_running_results_and_report_failures():
+    executor = ManualExecutor()
+    applied = []
+    errors = []
+    jobs = BackgroundJobs(executor, lambda _busy: None)
+
+    jobs.submit("plugin", lambda: "stale", applied.append)
+    stale_future, stale_fn = executor.queued.pop()
+    stale_future.set_running_or_notify_cancel()
+    jobs.submit("plugin", lambda: 1 / 0, applied.append, errors.append)
+    stale_future.set_result(stale_fn())
+    executor.run_all()
+    jobs.poll()
+
+    assert applied == []
+    assert isinstance(errors[0], ZeroDivisionError)
+
+
+@pytest.fixture
+def qt_app(monkeypatch):
+    pytest.importorskip("PySide6")
+    monkeypatch.setenv("QT_QPA_PLATFORM", "offscreen")
+    from PySide6 import QtWidgets
+
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+def test_extrema_model_scans_only_rows_asked_for_and_keeps_them_across_renames(qt_app):
+    from pygrace.backend import PlotBackend
+    from pygrace.gui_models import PENDING_TEXT, ExtremaModel
+
+    datasets = [Dataset(name=f"s{i}", x=[0, 1, 2], y=[0, i + 1, 0]) for i in range(100)]
+    batches = []
+    model = ExtremaModel(datasets, batches.append)
+
+    assert model.index(3, 1).data() == PENDING_TEXT
+    model.request_wanted()
+    (batch,) = batches
+    assert [ds.name for ds, _version, _x, _y in batch] == ["s3"]
+    model.store([(ds, version, PlotBackend.dataset_extrema(ds)) for ds, version, _x, _y in batch])
+    assert model.index(3, 1).data() == "max @ i=1, x=1, y=4"
+
+    datasets[3].name = "renamed"
+    model.rename(3)
+    assert model.index(3, 0).data() == "renamed"
+    assert model.stale_requests(datasets[:4])[-1][0] is datasets[2]
+
+    datasets[3].y = [0, -1, 0]
+    assert model.index(3, 1).data() == PENDING_TEXT
+    assert [ds.name for ds, *_ in model.stale_requests(datasets[3:4])] == ["renamed"]
+
+
+def test_extrema_model_drops_results_for_replaced_columns_and_adds_rows_on_sync(qt_app):
+    from pygrace.gui_models import ExtremaModel
+
+    datasets = [Dataset(name="a", x=[0, 1, 2], y=[0, 1, 0])]
+    model = ExtremaModel(datasets, lambda _batch: None)
+    (request,) = model.stale_requests()
+    datasets[0].y = [0, 5, 0]
+
+    model.store([(request[0], request[1], [("max", 1, 1.0, 1.0)])])
+    assert model.extrema(datasets[0]) is None
+
+    datasets.append(Dataset(name="b", x=[0, 1], y=[1, 2]))
+    model.sync()
+    assert model.rowCount() == 2
+
+
+def test_dataset_list_model_drives_visibility_filtering_and_new_rows(qt_app):
+    from PySide6 import QtCore
+
+    from pygrace.backend import PlotBackend
+    from pygrace.gui_models import DatasetListModel, DatasetNamesModel, dataset_filter_model, filtered_rows
+
+    checked, check_role = QtCore.Qt.CheckState.Checked, QtCore.Qt.ItemDataRole.CheckStateRole
+    backend = PlotBackend.from_data([Dataset(name=f"set{i}", x=[0, 1], y=[i, i]) for i in range(20)])
+    model = DatasetListModel(backend)
+    toggles = []
+    model.visibilityChanged.connect(lambda: toggles.append(list(backend.visible)))
+
+    assert model.rowCount() == 20
+    assert model.index(3).data() == "set3"
+    assert model.setData(model.index(3), QtCore.Qt.CheckState.Unchecked, check_role)
+    assert backend.visible[3] is False
+    assert model.index(3).data(check_role) != checked
+
+    proxy = dataset_filter_model(model)
+    assert filtered_rows(proxy) is None
+    proxy.setFilterFixedString("SET1")
+    assert filtered_rows(proxy) == [1] + list(range(10, 20))
+    model.set_visible(filtered_rows(proxy), False)
+    assert [i for i, shown in enumerate(backend.visible) if not shown] == [1, 3] + list(range(10, 20))
+    assert len(toggles) == 2
+
+    names = DatasetNamesModel()
+    names.setSourceModel(model)
+    assert names.index(3, 0).data(check_role) is None
+
+    backend.datasets.append(Dataset(name="set20", x=[0], y=[0]))
+    model.sync()
+    assert names.rowCount() == 21
+    assert model.index(20).data(check_role) == checked
+
+
+def test_build_gui_defers_dialogs_and_controls_until_after_the_first_plot(qt_app):
+    import time
+
+    from pygrace.gui import build_gui
+
+    datasets = [Dataset(name=f"s{i}", x=[0, 1, 2], y=[0, i, 0]) for i in range(3)]
+    session = build_gui(datasets, "t", "x", "y", None, True, None)
+    try:
+        assert not any(panel.built for panel in session.panels.values())
+        assert "title_size_slider" not in session.widgets
+
+        session.window.show()
+        deadline = time.perf_counter() + 30
+        while not session.panels["controls"].built and time.perf_counter() < deadline:
+            session.app.processEvents()
+        assert session.first_plot_seconds is not None
+        assert session.panels["controls"].built
+        assert not session.panels["axes"].built
+
+        session.panels["axes"].get()
+        assert session.widgets["title_size_slider"].value() > 0
+    finally:
+        session.close()
+
+
+def test_closed_sessions_leave_no_quit_handlers_on_the_application(qt_app):
+    from PySide6 import QtCore
+
+    from pygrace.gui import build_gui
+
+    signal = QtCore.SIGNAL("aboutToQuit()")
+    before = qt_app.receivers(signal)
+    for _ in range(3):
+        session = build_gui([Dataset(name="s", x=[0, 1], y=[0, 1])], None, None, None, None, True, None)
+        assert qt_app.receivers(signal) == before + 1
+        session.close()
+    assert qt_app.receivers(signal) == before
+
+
+def test_stats_model_summarizes_shown_rows_and_reasks_after_changes(qt_app):
+    from pygrace.backend import PlotBackend
+    from pygrace.gui_models import PENDING_TEXT, StatsModel
+
+    datasets = [Dataset(name=f"s{i}", x=[0, 1, 2], y=[0, i, 2 * i]) for i in range(50)]
+    backend = PlotBackend.from_data(datasets)
+    batches = []
+    model = StatsModel(datasets, batches.append)
+
+    assert model.index(4, 0).data() == "s4"
+    assert model.index(4, 5).data() == PENDING_TEXT
+    model.request_wanted()
+    (batch,) = batches
+    assert batch == [datasets[4]]
+    model.store(PlotBackend.summarize(backend.stale_stats(batch)))
+    assert [model.index(4, col).data() for col in range(1, 8)] == ["3", "0", "2", "0", "8", "4", "3.26599"]
+
+    datasets[4].y = [1, 1, 1]
+    assert model.index(4, 6).data() == PENDING_TEXT
+    datasets.append(Dataset(name="new", x=[0], y=[0]))
+    model.sync()
+    assert model.rowCount() == 51
+
+
+def test_build_gui_appends_rows_from_a_named_pipe_while_open(qt_app, tmp_path):
+    import os
+    import time
+
+    from pygrace.gui import build_gui
+
+    fifo = tmp_path / "feed"
+    os.mkfifo(fifo)
+    session = build_gui([Dataset(name="file", x=[0, 1], y=[0, 1])], "t", "x", "y", None, True, None, pipes=[fifo])
+    try:
+        with fifo.open("w") as out:
+            out.write("0 5\n1 6\n")
+            out.flush()
+            deadline = time.perf_counter() + 30
+            while len(session.backend.datasets) < 2 and time.perf_counter() < deadline:
+                session.app.processEvents()
+                time.sleep(0.01)
+            out.write("2 7\n")
+        live = session.backend.datasets[1]
+        deadline = time.perf_counter() + 30
+        while len(live.x) < 3 and time.perf_counter() < deadline:
+            session.app.processEvents()
+            time.sleep(0.01)
+        assert (live.name, list(live.y)) == ("feed", [5.0, 6.0, 7.0])
+        assert session.widgets["dataset_model"].rowCount() == 2
+    finally:
+        session.close()
+
+
+def test_build_gui_reports_a_pipe_that_cannot_be_read(qt_app, tmp_path):
+    import time
+
+    from pygrace.gui import build_gui
+
+    datasets = [Dataset(name="file", x=[0, 1], y=[0, 1])]
+    session = build_gui(datasets, "t", "x", "y", None, True, None, pipes=[tmp_path / "missing"])
+    try:
+        status = session.window.statusBar()
+        deadline = time.perf_counter() + 30
+        while not status.currentMessage() and time.perf_counter() < deadline:
+            session.app.processEvents()
+            time.sleep(0.01)
+        assert status.currentMessage().startswith("Error: pipe missing:")
+    finally:
+        session.close()
+
+
+def test_controls_apply_an_operation_to_the_selected_set(qt_app):
+    import time
+
+    from pygrace.gui import build_gui
+
+    session = build_gui([Dataset(name="s", x=[0, 1, 2], y=[0, 2, 4])], "t", "x", "y", None, True, None)
+    try:
+        session.panels["controls"].get()
+        widgets = session.widgets
+        widgets["dataset_list"].setCurrentIndex(widgets["dataset_list"].model().index(0, 0))
+        widgets["operation_combo"].setCurrentIndex(widgets["operation_combo"].findData("derivative"))
+        assert widgets["operation_edit"].text() == "centered"
+        widgets["operation_edit"].setText("forward")
+        widgets["operation_button"].click()
+        deadline = time.perf_counter() + 30
+        while len(session.backend.datasets) < 2 and time.perf_counter() < deadline:
+            session.app.processEvents()
+            time.sleep(0.01)
+        created = session.backend.datasets[1]
+        assert (created.name, created.y.tolist()) == ("derivative(s)", [2.0, 2.0])
+        assert widgets["dataset_model"].rowCount() == 2
+        assert widgets["operation_status"].text() == "Applied."
+    finally:
+        session.close()
@@ -0,0 +1,129 @@
+import json
+import threading
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+from pygrace import profiling
+from pygrace.backend import PlotBackend
+from pygrace.cli import main
+from pygrace.data import load_datasets
+
+
+def test_span_is_shared_noop_when_profiling_is_off():
+    assert profiling.active_profiler() is None
+    assert profiling.span("plot_datasets") is profiling.span("savefig")
+
+
+def test_profiler_records_named_stage_spans_and_dataset_points():
+    profiler = profiling.enable()
+    try:
+        PlotBackend.from_data([([0, 1, 2], [1, 3, 2])]).render_bytes("png")
+    finally:
+        assert profiling.disable() is profiler
+
+    totals = profiler.totals()
+    for stage in ("render", "plot_datasets", "apply_axes_state", "render_plugins", "tight_layout", "savefig"):
+        assert totals[stage]["calls"] == 1
+        assert totals[stage]["seconds"] >= 0
+    assert profiler.datasets == [{"name": "set0", "points": 3, "stage": "plot", "rasterized": False}]
+    assert "plot_datasets" in profiler.format_table()
+
+
+def test_spans_nest_per_thread_and_old_records_are_dropped(monkeypatch):
+    profiler = profiling.Profiler()
+    inside = threading.Event()
+    release = threading.Event()
+
+    def worker() -> None:
+        with profiler.span("job"):
+            inside.set()
+            release.wait(10)
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    inside.wait(10)
+    with profiler.span("refresh") as record:
+        pass
+    release.set()
+    thread.join(10)
+    # The worker's open span does not count as a parent of the UI thread's span.
+    assert record["depth"] == 0
+    assert [entry["name"] for entry in profiler.spans] == ["refresh", "job"]
+
+    monkeypatch.setattr(profiling, "MAX_RECORDS", 10)
+    for _ in range(25):
+        with profiler.span("tick"):
+            pass
+        profiler.note_dataset("set0", 3)
+    assert len(profiler.spans) <= 10 and len(profiler.datasets) <= 10
+    assert profiler.totals()["tick"]["calls"] == 25
+
+
+def test_main_profilejson_writes_stage_timings(tmp_path: Path):
+    data = tmp_path / "a.dat"
+    data.write_text("0 1 2\n1 3 4\n", encoding="utf-8")
+    report = tmp_path / "profile.json"
+
+    rc = main(["-hardcopy", "-noserver", "-profilejson", str(report), "-printfile", str(tmp_path / "a.png"), str(data)])
+
+    assert rc == 0
+    profile = json.loads(report.read_text(encoding="utf-8"))
+    for stage in ("load_datasets", "_parse_numeric_rows", "_extract_columns", "plot_datasets", "savefig"):
+        assert stage in profile["totals"]
+    assert profile["totals"]["_extract_columns"]["calls"] == 2
+    assert [(entry["stage"], entry["points"]) for entry in profile["datasets"]] == [
+        ("load", 2),
+        ("load", 2),
+        ("plot", 2),
+        ("plot", 2),
+    ]
+    assert profiling.active_profiler() is None
+
+
+def test_memory_report_counts_columns_and_only_diverged_snapshots():
+    x = np.linspace(0.0, 1.0, 1000)
+    backend = PlotBackend.from_data([(x, np.sin(x))])
+    ds = backend.datasets[0]
+
+    (report,) = backend.memory_report()
+    assert report == {"name": "set0", "points": 1000, "data_bytes": 16000, "snapshot_bytes": 0}
+
+    backend.align_extrema([(ds, ("max", 10, float(x[10]), 2.0))])
+    assert backend.memory_report()[0]["snapshot_bytes"] == 8000
+
+
+def test_memory_profiler_budgets_for_load_and_render(tmp_path: Path):
+    # CI guard: bytes per point for parsing, retained artists and stage peaks; raise deliberately, not casually.
+    rows = 20_000
+    data = tmp_path / "big.dat"
+    data.write_text("".join(f"{i * 1e-3:.6e} {i * 2e-3:.6e}\n" for i in range(rows)), encoding="utf-8")
+
+    profiler = profiling.enable(profiling.Profiler(memory=True))
+    try:
+        datasets = load_datasets([data])
+        PlotBackend(datasets, PlotBackend.from_data([]).state, None).render_bytes("png")
+    finally:
+        profiling.disable()
+    assert not tracemalloc.is_tracing()
+
+    totals = profiler.totals()
+    assert totals["_parse_numeric_rows"]["peak_bytes"] < 256 * rows
+    assert totals["plot_dataset"]["peak_bytes"] < 128 * rows
+    (plotted,) = [entry for entry in profiler.datasets if entry["stage"] == "plot"]
+    assert plotted["snapshot_bytes"] == 0
+    assert plotted["artist_bytes"] < 64 * rows
+    assert "big.dat" in profiler.format_memory_table()
+
+
+def test_main_memreport_prints_stage_and_dataset_tables(tmp_path: Path, capsys):
+    data = tmp_path / "a.dat"
+    data.write_text("0 1\n1 3\n", encoding="utf-8")
+
+    rc = main(["-hardcopy", "-noserver", "-memreport", "-printfile", str(tmp_path / "a.png"), str(data)])
+
+    assert rc == 0
+    err = capsys.readouterr().err
+    assert "peak KiB" in err
+    assert "a.dat" in err
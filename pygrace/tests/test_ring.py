@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from pygrace.backend import PlotBackend
+from pygrace.ring import RingDataset
+
+
+def test_ring_dataset_keeps_the_newest_points_as_a_view_of_one_buffer():
+    ring = RingDataset(name="r", x=list(range(6)), y=[v * v for v in range(6)], capacity=4)
+    assert ring.x == [2, 3, 4, 5]
+
+    ring.append(6, 36)
+    assert list(ring.x) == [3, 4, 5, 6]
+    assert list(ring.y) == [9, 16, 25, 36]
+    buffer = ring._buffer
+    version = ring.version
+
+    ring.append([7, 8, 9], [1, 2, 3])
+    assert list(ring.x) == [6, 7, 8, 9]
+    assert list(ring.y) == [36, 1, 2, 3]
+    assert ring.version == version + 1
+    assert ring._buffer is buffer and np.shares_memory(ring.x, buffer)
+
+    ring.append(np.arange(10, 20), np.arange(10))
+    assert list(ring.x) == [16, 17, 18, 19]
+    assert ring.x_monotonic()
+    assert ring.stats().count == 4
+
+
+def test_ring_dataset_error_columns_and_snapshots():
+    ring = RingDataset(name="e", x=[], y=[], dy=[], capacity=3)
+    ring.append(1, 2, dy=0.5)
+    ring.append([2, 3, 4], [3, 4, 5], dy=[1, 1, 1])
+    assert list(ring.dy) == [1, 1, 1]
+    with pytest.raises(ValueError):
+        ring.append(5, 6)
+    with pytest.raises(ValueError):
+        RingDataset(name="bad", x=[], y=[], capacity=0)
+
+    backend = PlotBackend.from_data([ring])
+    ((_ds, _version, snapshot),) = backend.stale_stats()
+    assert snapshot._buffer is None and list(snapshot.x) == [2, 3, 4]
+
+
+def test_live_sets_refuse_transforms_and_alignment_that_the_next_append_would_undo():
+    ring = RingDataset(name="r", x=[], y=[], capacity=4)
+    ring.append([0, 1, 2, 3], [0, 1, 2, 3])
+    backend = PlotBackend.from_data([ring, ([0, 1, 2, 3], [5, 5, 5, 5])])
+
+    with pytest.raises(ValueError, match="live"):
+        backend.align_extrema([(ring, ("max", 3, 3.0, 10.0))])
+    with pytest.raises(ValueError, match="live"):
+        backend.apply_transform("y0 = y0 * 2")
+    assert list(ring.y) == [0, 1, 2, 3]
+
+    # Reading a live set into another set is fine.
+    backend.apply_transform("y1 = y0 * 2")
+    assert list(backend.datasets[1].y) == [0, 2, 4, 6]
+
+
+def test_new_set_made_from_a_ring_owns_its_columns():
+    ring = RingDataset(name="r", x=[], y=[], capacity=4)
+    ring.append([0, 1, 2, 3], [10, 11, 12, 13])
+    backend = PlotBackend.from_data([ring])
+
+    index = backend.apply_transform("x1 = y0")
+    new = backend.datasets[index]
+    ring.append([4, 5, 6, 7], [14, 15, 16, 17])
+    assert list(new.x) == [10, 11, 12, 13]
+    assert list(new.y) == [10, 11, 12, 13]
@@ -0,0 +1,120 @@
+import asyncio
+import io
+import os
+import socket
+import threading
+from pathlib import Path
+
+import pytest
+
+from pygrace.cli import main
+from pygrace.service import RenderService, ServiceError, default_socket_path, request_render
+
+
+def _run_service(socket_path: Path):
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    service = RenderService(socket_path, workers=1)
+    asyncio.run_coroutine_threadsafe(service.start(), loop).result(timeout=120)
+    return loop, thread, service
+
+
+def _stop_service(loop, thread, service) -> None:
+    asyncio.run_coroutine_threadsafe(service.close(), loop).result(timeout=60)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout=10)
+
+
+def test_render_service_streams_image_and_reports_errors(tmp_path: Path):
+    data = tmp_path / "a.dat"
+    data.write_text("0 1\n1 3\n2 2\n", encoding="utf-8")
+    socket_path = tmp_path / "render.sock"
+    loop, thread, service = _run_service(socket_path)
+    try:
+        out = io.BytesIO()
+        size = request_render(socket_path, ["-hardcopy", "-printfile", "a.png", "a.dat"], out, cwd=str(tmp_path))
+        assert size == len(out.getvalue())
+        assert out.getvalue().startswith(b"\x89PNG")
+
+        try:
+            request_render(socket_path, ["-bxy", "1:a", "a.dat"], io.BytesIO(), cwd=str(tmp_path))
+            assert False, "Expected ServiceError"
+        except ServiceError as exc:
+            assert "indices" in str(exc)
+
+        output = tmp_path / "cli.png"
+        rc = main(["-hardcopy", "-socket", str(socket_path), "-printfile", str(output), str(data)])
+        assert rc == 0
+        assert output.read_bytes().startswith(b"\x89PNG")
+    finally:
+        _stop_service(loop, thread, service)
+
+    assert not socket_path.exists()
+
+
+def test_hardcopy_falls_back_to_local_render_without_service(tmp_path: Path):
+    data = tmp_path / "a.dat"
+    data.write_text("0 1\n1 3\n", encoding="utf-8")
+    output = tmp_path / "out.png"
+
+    rc = main(["-hardcopy", "-socket", str(tmp_path / "missing.sock"), "-printfile", str(output), str(data)])
+
+    assert rc == 0
+    assert output.read_bytes().startswith(b"\x89PNG")
+
+
+def test_hardcopy_leaves_printfile_alone_when_the_service_drops_the_image(tmp_path: Path):
+    data = tmp_path / "a.dat"
+    data.write_text("0 1\n1 3\n", encoding="utf-8")
+    output = tmp_path / "out.png"
+    output.write_bytes(b"previous")
+    socket_path = tmp_path / "broken.sock"
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(socket_path))
+    server.listen(1)
+
+    def answer_with_half_an_image() -> None:
+        conn, _ = server.accept()
+        with conn:
+            conn.makefile("rb").readline()
+            conn.sendall(b'{"ok": true, "size": 1000}\n\x89PNG')
+
+    thread = threading.Thread(target=answer_with_half_an_image, daemon=True)
+    thread.start()
+    try:
+        rc = main(["-hardcopy", "-socket", str(socket_path), "-printfile", str(output), str(data)])
+    finally:
+        thread.join(timeout=10)
+        server.close()
+
+    assert rc == 2
+    assert output.read_bytes() == b"previous"
+
+
+def test_default_socket_lives_in_a_private_directory(tmp_path: Path, monkeypatch):
+    monkeypatch.delenv("PYGRACE_SOCKET", raising=False)
+    monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+    monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+
+    path = default_socket_path()
+    assert path.parent == tmp_path / f"pygrace-{os.getuid()}"
+    assert path.parent.stat().st_mode & 0o777 == 0o700
+
+    path.parent.chmod(0o755)
+    with pytest.raises(ValueError, match="only this user"):
+        default_socket_path()
+
+
+def test_request_render_refuses_a_socket_owned_by_another_user(tmp_path: Path, monkeypatch):
+    socket_path = tmp_path / "other.sock"
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(socket_path))
+    server.listen(1)
+    uid = os.getuid()
+    monkeypatch.setattr(os, "getuid", lambda: uid + 1)
+    try:
+        with pytest.raises(ServiceError, match="another user"):
+            request_render(socket_path, ["-hardcopy"], io.BytesIO())
+    finally:
+        server.close()
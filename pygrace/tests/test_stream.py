@@ -0,0 +1,69 @@
+import os
+import time
+
+from pygrace.stream import LiveTable, PipeFollower
+
+
+def test_live_table_creates_sets_from_the_first_rows_and_appends_by_replacing_columns():
+    table = LiveTable("feed")
+    assert table.append([]) == []
+
+    created = table.append([[0.0, 1.0, 10.0], [1.0, 2.0, 20.0, 99.0]], color_offset=1)
+    assert [ds.name for ds in created] == ["feed", "feed:col3"]
+    assert created[0].line_color == "red"
+    assert all(ds.live for ds in created)
+    first_x = created[0].x
+
+    assert table.append([[2.0, 3.0, 30.0], [3.0]]) == []
+    assert list(created[0].x) == [0.0, 1.0, 2.0] and list(first_x) == [0.0, 1.0]
+    assert list(created[1].y) == [10.0, 20.0, 30.0]
+    assert created[0].version == 4
+
+    # Appends fill a buffer that grows by doubling, so the columns are views rather than fresh copies.
+    grown = created[0].x.base
+    table.append([[float(i), 0.0, 0.0] for i in range(4, 500)])
+    assert created[0].x.base is grown and len(created[0].x) == 499
+    table.append([[float(i), 0.0, 0.0] for i in range(500, 5000)])
+    assert list(created[0].x[-2:]) == [4998.0, 4999.0] and list(first_x) == [0.0, 1.0]
+
+    errors = LiveTable("err", "1:2:3")
+    (ds,) = errors.append([[0.0, 1.0, 0.5], [1.0, 2.0]])
+    assert (ds.name, list(ds.x), list(ds.dy)) == ("err", [0.0], [0.5])
+
+
+def test_pipe_follower_queues_rows_across_writers(tmp_path):
+    fifo = tmp_path / "feed"
+    os.mkfifo(fifo)
+    follower = PipeFollower(fifo)
+    follower.start()
+
+    rows = []
+    for writer in range(2):
+        with fifo.open("w") as out:
+            out.write(f"{writer} 1\n{writer} 2\n")
+        deadline = time.perf_counter() + 10
+        while len(rows) < 2 * (writer + 1) and time.perf_counter() < deadline:
+            rows += follower.take()
+            time.sleep(0.01)
+    follower.stop()
+
+    assert rows == [[0.0, 1.0], [0.0, 2.0], [1.0, 1.0], [1.0, 2.0]]
+    assert follower.error is None
+
+
+def test_live_table_with_capacity_feeds_ring_datasets(monkeypatch):
+    import io
+    import sys
+    from pathlib import Path
+
+    from pygrace.data import read_stream_rows
+    from pygrace.ring import RingDataset
+
+    table = LiveTable("feed", capacity=3)
+    (ds,) = table.append([[float(i), float(i)] for i in range(5)])
+    table.append([[5.0, 50.0]])
+    assert isinstance(ds, RingDataset)
+    assert list(ds.x) == [3.0, 4.0, 5.0] and list(ds.y) == [3.0, 4.0, 50.0]
+
+    monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(io.BytesIO(b"".join(b"%d 1\n" % i for i in range(100)))))
+    assert read_stream_rows(Path("-"), keep_last=2) == [[98.0, 1.0], [99.0, 1.0]]
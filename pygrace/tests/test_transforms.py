@@ -0,0 +1,115 @@
+import numpy as np
+import pytest
+
+from pygrace.backend import PlotBackend
+from pygrace.transforms import (
+    OPERATIONS,
+    cached_interpolation_map,
+    derivative,
+    fourier,
+    integral,
+    interpolate,
+    interpolation_map,
+    running_average,
+)
+
+
+def test_chunked_kernels_match_whole_array_results():
+    x = np.linspace(0.0, 10.0, 1001)
+    y = np.sin(x) + 0.01 * np.arange(1001)
+
+    ax, ay = running_average(x, y, window=5, chunk=64)
+    assert len(ax) == 997
+    assert np.allclose(ay, np.convolve(y, np.ones(5) / 5, mode="valid"))
+    assert np.allclose(ax, x[2:-2])
+
+    dx, dy = derivative(x, y, chunk=64)
+    assert np.array_equal(dx, x[1:-1])
+    assert np.allclose(dy, np.gradient(y, x)[1:-1])
+    fx, fy = derivative(x, y, method="forward", chunk=7)
+    assert np.array_equal(fx, x[:-1])
+    assert np.allclose(fy, np.diff(y) / np.diff(x))
+
+    ix, iy = integral(x, np.cos(x), chunk=64)
+    assert np.array_equal(ix, x)
+    assert iy[0] == 0.0
+    assert np.allclose(iy, np.sin(x), atol=1e-4)
+
+    with pytest.raises(ValueError):
+        running_average(x, y, window=0)
+    with pytest.raises(ValueError):
+        derivative(x, y, method="sideways")
+
+
+def test_fourier_and_interpolate():
+    x = np.arange(64) * 0.5
+    freq, magnitude = fourier(x, np.cos(2 * np.pi * 0.25 * x))
+    assert freq[np.argmax(magnitude)] == pytest.approx(0.25)
+    with pytest.raises(ValueError):
+        fourier([1.0, 1.0], [0.0, 1.0])
+
+    # Unsorted input is sorted first; points outside the set are not extrapolated.
+    new_x, new_y = interpolate([2.0, 0.0, 1.0], [20.0, 0.0, 10.0], onto=[0.5, 1.5, 3.0], chunk=2)
+    assert list(new_x) == [0.5, 1.5, 3.0]
+    assert new_y[:2].tolist() == [5.0, 15.0]
+    assert np.isnan(new_y[2])
+    assert len(interpolate([0, 1], [0, 1], points=11)[0]) == 11
+
+
+def test_interpolation_map_matches_np_interp_and_is_cached_per_column_pair():
+    old_x = np.sort(np.random.default_rng(0).uniform(0, 10, 500))
+    old_y = np.cos(old_x)
+    new_x = np.linspace(-1, 11, 2000)
+
+    mapping = interpolation_map(new_x, old_x)
+    expected = np.interp(new_x, old_x, old_y, left=np.nan, right=np.nan)
+    assert np.allclose(mapping.apply(old_y), expected, equal_nan=True)
+    shuffled = np.random.default_rng(1).permutation(500)
+    assert np.allclose(interpolation_map(new_x, old_x[shuffled]).apply(old_y[shuffled]), expected, equal_nan=True)
+
+    cached = cached_interpolation_map(new_x, old_x)
+    assert cached_interpolation_map(new_x, old_x) is cached
+    assert cached_interpolation_map(new_x.copy(), old_x) is not cached
+    with pytest.raises(ValueError):
+        interpolation_map(new_x, [1.0])
+
+    # Non-finite old x values are skipped, not sorted to the end where they would hide the range.
+    gappy = interpolation_map([0.5, 1.5, 3.0], [0.0, 1.0, np.nan, 2.0, np.inf])
+    assert gappy.apply([0.0, 10.0, 99.0, 30.0, 99.0])[:2].tolist() == [5.0, 20.0]
+    assert np.isnan(interpolation_map([1.5], [2.0, np.nan, 1.0]).apply([20.0, 99.0, 10.0])).sum() == 0
+    with pytest.raises(ValueError):
+        interpolation_map(new_x, [1.0, np.nan])
+
+
+def test_backend_operations_add_new_sets_and_reject_stale_results():
+    backend = PlotBackend.from_data([([0, 1, 2, 3], [0, 1, 4, 9]), ([0.5, 1.5], [0, 0])])
+
+    idx = backend.apply_operation(0, "integral")
+    assert idx == 2
+    assert backend.datasets[2].name == "integral(set0)"
+    assert backend.datasets[2].y.tolist() == [0.0, 0.5, 3.0, 9.5]
+    assert backend.visible == [True, True, True]
+    assert backend.datasets[0].y == [0, 1, 4, 9]
+
+    onto = backend.apply_operation(0, "interpolate", onto=1)
+    assert backend.datasets[onto].y.tolist() == [0.5, 2.5]
+
+    stale = backend.evaluate_operation(0, "derivative", method="forward")
+    backend.datasets[0].y = [1, 1, 1, 1]
+    with pytest.raises(ValueError):
+        backend.commit_operation(stale)
+    with pytest.raises(ValueError):
+        backend.apply_operation(0, "smooth")
+    with pytest.raises(ValueError):
+        backend.apply_operation(9, "integral")
+    with pytest.raises(ValueError):
+        backend.apply_operation(0, "integral", window=3)
+
+
+def test_operation_parameters_from_text():
+    assert OPERATIONS["running_average"].coerce("7") == 7
+    assert OPERATIONS["derivative"].coerce("backward") == "backward"
+    with pytest.raises(ValueError):
+        OPERATIONS["running_average"].coerce("seven")
+    with pytest.raises(ValueError):
+        OPERATIONS["fourier"].coerce("loud")